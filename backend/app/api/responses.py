@@ -0,0 +1,50 @@
+"""
+Response shaping for the Skill Bridge API.
+"""
+
+from typing import Any, Dict, Iterable
+
+
+def shape_content(
+    response_data: Dict[str, Any], exclude_fields: Iterable[str] = ()
+) -> Dict[str, Any]:
+    """
+    Build the response body from recommendation data, omitting the fields the
+    caller excluded.
+
+    The internal pipeline data is serialized directly instead of being
+    validated into `CourseRecommendationResponse` again; the tests check that
+    the body still matches the schema.
+
+    Args:
+        response_data: Recommendation data with the response schema fields
+        exclude_fields: Top-level fields to omit, or "course_descriptions" to
+            drop the description of each recommended course
+
+    Returns:
+        Response body
+    """
+    exclude = set(exclude_fields)
+    courses = response_data.get("recommended_courses", [])
+    if "course_descriptions" in exclude:
+        courses = [
+            {k: v for k, v in course.items() if k != "description"}
+            for course in courses
+        ]
+
+    content = {
+        "recommended_courses": courses,
+        "skill_gap": response_data.get("skill_gap", []),
+        "job_skills": response_data.get("job_skills", []),
+        "user_skills": response_data.get("user_skills", []),
+        "recommendations_text": response_data.get("recommendations_text"),
+        "recommendation_mode": response_data.get("recommendation_mode", "llm"),
+        "score": response_data.get("score", 0.0),
+        "matched_skills": response_data.get("matched_skills", []),
+        "missing_skills": response_data.get("missing_skills", []),
+        "matching_details": response_data.get("matching_details", []),
+        "analysis_id": response_data.get("analysis_id"),
+        "truncation": response_data.get("truncation"),
+        "degradations": response_data.get("degradations", []),
+    }
+    return {k: v for k, v in content.items() if k not in exclude}
@@ -2,131 +2,337 @@
 API routes for the Skill Bridge application.
 """
 
+import asyncio
+import hmac
+import json
 import logging
-from fastapi import APIRouter, HTTPException
+import os
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 logger = logging.getLogger(__name__)
 
+from ..core.config import ADMIN_TOKEN, JOB_POLL_SECONDS, REQUEST_DEADLINE_SECONDS
 from ..models.schemas import (
     CourseRecommendationRequest,
     CourseRecommendationResponse,
+    JobArtifactPrewarmRequest,
+    JobStatusResponse,
+    JobSubmitResponse,
+    RethresholdRequest,
 )
+from ..services.analysis_service import AnalysisService
 from ..services.cache_service import CacheService
-from ..services.nlp_service import NLPService
-from ..services.rag_service import RAGService
+from ..services.job_artifact_service import JobArtifactService
+from ..services.job_service import JobService
+from ..services.memory_service import MemoryService
+from ..services.pipeline_service import PipelineService
 from ..services.similarity_service import SimilarityService
+from ..utils.request_context import RequestContext
+
+from .responses import shape_content
 
 # Create router instance
 router = APIRouter()
 
 
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    Guard an admin endpoint.
+
+    Admin endpoints are not served unless ADMIN_TOKEN is set, and then only to
+    requests sending it in the `X-Admin-Token` header.
+
+    Args:
+        x_admin_token: Value of the `X-Admin-Token` header
+
+    Raises:
+        HTTPException: 404 if admin endpoints are disabled, 403 if the token is
+            missing or wrong
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(
+        x_admin_token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")
+    ):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+def _shape_response(
+    response_data: Dict[str, Any], exclude_fields: Iterable[str] = ()
+) -> ORJSONResponse:
+    """
+    Serialize recommendation data, omitting the fields the caller excluded.
+
+    Args:
+        response_data: Recommendation data with the response schema fields
+        exclude_fields: Fields to omit (see `shape_content`)
+
+    Returns:
+        JSON response
+    """
+    return ORJSONResponse(shape_content(response_data, exclude_fields))
+
+
 @router.post("/recommend-courses", response_model=CourseRecommendationResponse)
-async def recommend_courses(request: CourseRecommendationRequest):
+async def recommend_courses(
+    request: CourseRecommendationRequest,
+    x_request_deadline_ms: Optional[int] = Header(
+        None, gt=0, description="Time budget of the request in milliseconds"
+    ),
+):
     """
     Recommend courses based on skill gap between resume and job description.
     Now with disk-based caching for identical requests.
 
     This endpoint performs:
     1. Check cache for existing results
-    2. Named entity extraction to identify skills in both the resume and job description
-    3. Calculation of the skill gap between the two
-    4. Retrieval of relevant course data using vector similarity search
-    5. LLM-based generation of course recommendations tailored to the skill gap
-    6. Processing of LLM outputs to provide structured course recommendations with URLs
-    7. Cache results for future identical requests
-    8. Returns detailed skill matching information with similarity scores
+    2. Load or compute the job description artifacts (shared across resumes)
+    3. Named entity extraction to identify skills in both the resume and job description
+    4. Calculation of the skill gap between the two
+    5. Retrieval of relevant course data using vector similarity search
+    6. LLM-based generation of course recommendations tailored to the skill gap
+    7. Processing of LLM outputs to provide structured course recommendations with URLs
+    8. Cache results for future identical requests
+    9. Returns detailed skill matching information with similarity scores, and
+       an analysis id that can be re-scored at another threshold
+
+    Very long inputs are capped and chunked (see `NLPService.prepare_text`);
+    the `truncation` field then reports how much of each input was processed.
+
+    With a deadline (the `X-Request-Deadline-Ms` header, or
+    REQUEST_DEADLINE_SECONDS), stages that run short of time degrade and the
+    `degradations` field lists what was given up.
+    Long analyses can be submitted to `/jobs` instead, to avoid holding the
+    connection open for the whole pipeline.
     """
+    if x_request_deadline_ms is not None:
+        deadline_seconds = x_request_deadline_ms / 1000
+    else:
+        deadline_seconds = REQUEST_DEADLINE_SECONDS or None
     try:
-        # Check cache first for existing results
-        cached_result = CacheService.get_course_recommendation(
-            request.resume_text, request.job_description_text, request.threshold
+        # The pipeline blocks on its stages, so keep it off the event loop
+        response_data = await run_in_threadpool(
+            PipelineService.run,
+            request.resume_text,
+            request.job_description_text,
+            request.threshold,
+            request.mode,
+            deadline_seconds=deadline_seconds,
+        )
+        return _shape_response(response_data, request.exclude_fields)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error generating course recommendations: {str(e)}"
         )
 
-        if cached_result:
-            # Return cached result directly
-            logger.info("Request: Returning cached course recommendations.")
-            return CourseRecommendationResponse(**cached_result)
 
-        logger.info("Request: No cache hit, processing request...")
+def _job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the status body of a job, shaping its result like the synchronous
+    endpoint would.
 
-        # First get the skill comparison using the NLP service
-        skill_comparison = NLPService.compare_skills_semantic(
-            request.resume_text,
-            request.job_description_text,
-            threshold=request.threshold,
-        )
+    Args:
+        job: Job state from `JobService.get`
 
-        # Extract all job skills from the skill comparison (both matched and missing)
-        # This ensures we have the complete list of job skills with their similarity scores
-        all_job_skills = set(
-            skill_comparison["matched_skills"] + skill_comparison["missing_skills"]
-        )
+    Returns:
+        Status body with the `JobStatusResponse` fields
+    """
+    result = job["result"]
+    if result is not None:
+        result = shape_content(result, job["request"].get("exclude_fields", ()))
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "attempts": job["attempts"],
+        "timings": job["timings"],
+        "error": job["error"],
+        "result": result,
+    }
 
-        # Generate course recommendations using RAG service
-        # Pass ALL job skills as ground_truth_skills, not just missing skills
-        recommendations = RAGService.generate_course_recommendations(
-            request.job_description_text,
-            request.resume_text,
-            ground_truth_skills=all_job_skills,
-        )
 
-        # Implement scoring for each course
-        user_skills_set = set(recommendations["user_skills"])
-        job_skills_set = set(recommendations["job_skills"])
-
-        # Get the original score
-        original_score = skill_comparison["score"]
-
-        # Add score to each recommended course
-        for course in recommendations["recommended_courses"]:
-            # Extract course skills using NLP service
-            course_description = course.get("description", "")
-            course_entities = NLPService.extract_distinct_entities_from_all_models(
-                course_description
-            )
-            course_skills = {
-                e.text
-                for e in course_entities
-                if e.label.upper() in ("SKILL", "PRODUCT", "ORG", "GPE", "LANGUAGE")
-            }
-
-            # Create enhanced skill set by combining user skills with course skills
-            enhanced_skills = user_skills_set.union(course_skills)
-
-            # Calculate new match score with enhanced skills
-            enhanced_score_result = SimilarityService.semantic_matching_score(
-                job_skills_set, enhanced_skills, threshold=request.threshold
-            )
-
-            # Add score to the course object
-            course["potential_score"] = enhanced_score_result["score"]
-            course["score_improvement"] = max(
-                0, enhanced_score_result["score"] - original_score
-            )
-
-        # Prepare response data
-        response_data = {
-            "recommended_courses": recommendations["recommended_courses"],
-            "skill_gap": recommendations["skill_gap"],
-            "job_skills": recommendations["job_skills"],
-            "user_skills": recommendations["user_skills"],
-            "recommendations_text": recommendations["recommendations_text"],
-            "matching_details": skill_comparison["matching_details"],
-        }
-
-        # Cache the result for future requests
-        logger.info("Request: Caching result for future requests...")
-        cache_success = CacheService.set_course_recommendation(
-            request.resume_text,
-            request.job_description_text,
-            request.threshold,
-            response_data,
-        )
-        logger.info(f"Request: Cache storage success: {cache_success}")
+@router.post("/jobs", response_model=JobSubmitResponse, status_code=202)
+async def submit_job(request: CourseRecommendationRequest):
+    """
+    Queue a course recommendation and return its job id right away.
 
-        # Convert the recommendations to the response model
-        return CourseRecommendationResponse(**response_data)
-    except Exception as e:
+    The job runs the same pipeline as `/recommend-courses` on a background
+    worker. An identical request (same cache key) that is still queued or
+    running is not queued twice; its job id is returned instead.
+    """
+    job_id, deduplicated = JobService.submit(request.model_dump())
+    return {"job_id": job_id, "status": "queued", "deduplicated": deduplicated}
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str):
+    """
+    Get the status, current stage, stage timings and, once finished, the
+    result or error of a job.
+    """
+    job = JobService.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return ORJSONResponse(_job_status(job))
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    Stream the progress of a job as server-sent events.
+
+    A `progress` event is sent whenever the status or stage changes, and a
+    final `done` event carries the full status once the job has succeeded or
+    failed.
+    """
+    if JobService.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+
+    async def events():
+        last = None
+        while True:
+            job = JobService.get(job_id)
+            if job is None:
+                return
+            if job["status"] in ("succeeded", "failed"):
+                yield f"event: done\ndata: {json.dumps(_job_status(job))}\n\n"
+                return
+            state = (job["status"], job["stage"], job["attempts"])
+            if state != last:
+                progress = {k: v for k, v in _job_status(job).items() if k != "result"}
+                yield f"event: progress\ndata: {json.dumps(progress)}\n\n"
+                last = state
+            await asyncio.sleep(JOB_POLL_SECONDS)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@router.post(
+    "/recommend-courses/{analysis_id}/threshold",
+    response_model=CourseRecommendationResponse,
+)
+async def rethreshold_recommendations(analysis_id: str, request: RethresholdRequest):
+    """
+    Re-score a previous analysis at a different similarity threshold.
+
+    Uses the similarity data stored for the analysis, so no NER, retrieval or
+    LLM work is repeated; only skill pairs the word-vector cascade decided near
+    the new threshold are embedded. Returns 404 once the analysis has expired;
+    clients should then call /recommend-courses again.
+    """
+    response_data = await run_in_threadpool(
+        AnalysisService.rethreshold, analysis_id, request.threshold
+    )
+    if response_data is None:
         raise HTTPException(
-            status_code=500, detail=f"Error generating course recommendations: {str(e)}"
+            status_code=404, detail=f"Analysis '{analysis_id}' not found or expired"
         )
+    return _shape_response(response_data, request.exclude_fields)
+
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """
+    Report cache size and lookup statistics.
+
+    Exact and near-duplicate hit rates are reported separately.
+    """
+    return CacheService.get_cache_stats()
+
+
+@router.get("/similarity/stats")
+async def similarity_stats():
+    """
+    Report how many skill pairs the word-vector cascade decided on its own,
+    and how often those decisions agreed with the transformer when audited.
+    """
+    return SimilarityService.get_cascade_stats()
+
+
+@router.get("/pipeline/stats")
+async def pipeline_stats():
+    """
+    Report how many entity, skill and embedding computations finished
+    requests made and reused; `max_invocations_per_key` stays at 1 as long as
+    no text goes through the same model twice within a request.
+    """
+    return RequestContext.get_totals()
+
+
+@router.post(
+    "/admin/jd-artifacts/prewarm",
+    status_code=202,
+    dependencies=[Depends(require_admin)],
+)
+async def prewarm_job_artifacts(
+    request: JobArtifactPrewarmRequest, background_tasks: BackgroundTasks
+):
+    """
+    Precompute job description artifacts in the background.
+
+    Later requests against these job descriptions only pay for resume-side work.
+    Requires the admin token (see `require_admin`).
+    """
+    background_tasks.add_task(JobArtifactService.prewarm, request.job_descriptions)
+    return {"accepted": len(request.job_descriptions)}
+
+
+@router.get("/admin/memory", dependencies=[Depends(require_admin)])
+async def memory_report():
+    """
+    Report the memory of the worker process that serves the request: RSS and
+    USS, each loaded model's parameter and vector bytes, and the size of each
+    in-process cache.
+
+    Requires the admin token (see `require_admin`).
+    """
+    return MemoryService.report()
+
+
+@router.post("/admin/memory/tracemalloc/start", dependencies=[Depends(require_admin)])
+async def start_memory_tracing(frames: int = Query(1, ge=1, le=64)):
+    """
+    Start tracing allocations in this worker and take a baseline snapshot.
+
+    Requires the admin token (see `require_admin`).
+    """
+    MemoryService.start_tracing(frames)
+    return {"tracing": True, "pid": os.getpid()}
+
+
+@router.post(
+    "/admin/memory/tracemalloc/snapshot", dependencies=[Depends(require_admin)]
+)
+async def memory_snapshot_diff(top_n: int = Query(20, ge=1, le=200)):
+    """
+    Diff allocations against the previous snapshot of this worker, then make
+    the current allocations the new baseline.
+
+    Requires the admin token (see `require_admin`).
+    """
+    try:
+        return {"pid": os.getpid(), "top": MemoryService.snapshot_diff(top_n)}
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post("/admin/memory/tracemalloc/stop", dependencies=[Depends(require_admin)])
+async def stop_memory_tracing():
+    """
+    Stop tracing allocations in this worker.
+
+    Requires the admin token (see `require_admin`).
+    """
+    MemoryService.stop_tracing()
+    return {"tracing": False, "pid": os.getpid()}
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+"""
+Script to measure cross-request batching of embedding and NER inference on
+the benchmark corpus.
+
+Usage:
+    python -m app.benchmark_batching [--concurrency 1 4 16] [--max_wait_ms 2]
+        [--workers 1 4]
+
+Each corpus text becomes one request: for `embedding` the request encodes the
+text's skills, for `ner` it runs the text's chunks through the default NER
+model. At each concurrency level the requests are issued by that many threads,
+once calling the model directly and once through a `DynamicBatcher` built
+with `--max_items` and `--max_wait_ms` for each `--workers` count, and the
+report gives the throughput, the p50/p95 request latency and the mean batch
+size. Extra workers call the one model object concurrently, so only raise
+INFERENCE_BATCH_WORKERS for a model that is thread-safe and measurably faster.
+"""
+
+import argparse
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from app.benchmark_context import load_corpus
+from app.core.config import (
+    BENCHMARK_CORPUS_PATH,
+    DEFAULT_MODEL,
+    EMBEDDING_BATCH_MAX_ITEMS,
+    EMBEDDING_BATCH_MAX_WAIT_MS,
+    NER_BATCH_MAX_ITEMS,
+    NER_BATCH_MAX_WAIT_MS,
+)
+from app.services.nlp_service import NLPService
+from app.services.similarity_service import SimilarityService
+from app.utils.batcher import DynamicBatcher
+from app.utils.stage_graph import cpu_pool_size
+
+WORKLOADS = ("embedding", "ner")
+
+
+def build_requests(corpus: list) -> dict:
+    """
+    Extract the inputs of every request once.
+
+    Args:
+        corpus: Resume/job description pairs
+
+    Returns:
+        Lists of per-request inputs, by workload
+    """
+    texts = [
+        text
+        for pair in corpus
+        for text in (pair["resume_text"], pair["job_description_text"])
+    ]
+    return {
+        "embedding": [sorted(NLPService.extract_skills(text)) for text in texts],
+        "ner": [NLPService.prepare_text(text)[0] for text in texts],
+    }
+
+
+def model_fn(workload: str) -> Callable[[List[str]], list]:
+    """
+    Get the function running a workload's model on a list of texts.
+
+    Args:
+        workload: One of `WORKLOADS`
+
+    Returns:
+        Function returning one result per text
+    """
+    if workload == "embedding":
+        return lambda texts: SimilarityService.get_model().encode(texts)
+    return lambda texts: NLPService._pipe_entities(
+        texts, DEFAULT_MODEL, batch_size=max(len(texts), 1)
+    )
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return the value below which a fraction of the values fall."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_level(
+    requests: List[List[str]], fn: Callable, concurrency: int, total: int
+) -> dict:
+    """
+    Issue requests from concurrent threads and measure them.
+
+    Args:
+        requests: Inputs of each request; reused in turn up to `total`
+        fn: Handles the inputs of one request
+        concurrency: Number of threads issuing requests
+        total: Number of requests to issue
+
+    Returns:
+        Items per second and the p50/p95 request latency in ms
+    """
+
+    def issue(n: int) -> float:
+        start = time.perf_counter()
+        fn(requests[n % len(requests)])
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(issue, range(total)))
+    seconds = time.perf_counter() - start
+    items = sum(len(requests[n % len(requests)]) for n in range(total))
+    return {
+        "items_per_second": round(items / seconds, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+    }
+
+
+def main():
+    """
+    Main function to run the script.
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare direct and batched inference under concurrent load."
+    )
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        default=BENCHMARK_CORPUS_PATH,
+        help="Path to a JSON lines file of resume/job description pairs",
+    )
+    parser.add_argument(
+        "--workloads",
+        type=str,
+        nargs="+",
+        choices=WORKLOADS,
+        default=list(WORKLOADS),
+        help="Models to measure",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8, 16],
+        help="Numbers of concurrent requests",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=200,
+        help="Requests issued at each concurrency level",
+    )
+    parser.add_argument(
+        "--max_items",
+        type=int,
+        default=None,
+        help="Most items per batch (default: the workload's *_BATCH_MAX_ITEMS)",
+    )
+    parser.add_argument(
+        "--max_wait_ms",
+        type=float,
+        default=None,
+        help="Longest batch wait (default: the workload's *_BATCH_MAX_WAIT_MS)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Worker counts of the batcher (default: INFERENCE_BATCH_WORKERS)",
+    )
+    args = parser.parse_args()
+
+    requests = build_requests(load_corpus(args.corpus))
+    defaults = {
+        "embedding": (EMBEDDING_BATCH_MAX_ITEMS, EMBEDDING_BATCH_MAX_WAIT_MS),
+        "ner": (NER_BATCH_MAX_ITEMS, NER_BATCH_MAX_WAIT_MS),
+    }
+
+    report = {}
+    for workload in args.workloads:
+        # Requests without inputs would only measure the thread pool
+        workload_requests = [inputs for inputs in requests[workload] if inputs]
+        fn = model_fn(workload)
+        max_items = args.max_items or defaults[workload][0]
+        max_wait_ms = (
+            args.max_wait_ms if args.max_wait_ms is not None else defaults[workload][1]
+        )
+
+        # Warm up the model
+        fn(workload_requests[0])
+
+        levels = []
+        for concurrency in args.concurrency:
+            batched = []
+            for workers in args.workers or [None]:
+                batcher = DynamicBatcher(
+                    fn,
+                    max_items,
+                    max_wait_ms,
+                    name=f"benchmark-{workload}",
+                    workers=workers,
+                )
+                batched.append(
+                    {
+                        "workers": batcher.workers,
+                        **run_level(
+                            workload_requests,
+                            batcher.submit_many,
+                            concurrency,
+                            args.requests,
+                        ),
+                        "mean_batch_size": batcher.stats()["mean_batch_size"],
+                    }
+                )
+            levels.append(
+                {
+                    "concurrency": concurrency,
+                    "direct": run_level(
+                        workload_requests, fn, concurrency, args.requests
+                    ),
+                    "batched": batched,
+                }
+            )
+        report[workload] = {
+            "requests": len(workload_requests),
+            "mean_items_per_request": round(
+                statistics.mean(len(inputs) for inputs in workload_requests), 2
+            ),
+            "max_items": max_items,
+            "max_wait_ms": max_wait_ms,
+            "cpu_pool_size": cpu_pool_size(),
+            "levels": levels,
+        }
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""
+Script to compare the word-vector similarity cascade against the
+transformer-only path on the benchmark corpus.
+
+For each uncertain-band width it reports the share of skill pairs decided by
+word vectors alone, the agreement of the match decisions with the
+transformer-only path and the median scoring latency.
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from app.benchmark_context import load_corpus
+from app.core.config import BENCHMARK_CORPUS_PATH
+from app.services.nlp_service import NLPService
+from app.services.similarity_service import SimilarityService
+
+
+def extract_pairs(corpus: list) -> list:
+    """
+    Extract the job and resume skills of every corpus pair once.
+
+    Args:
+        corpus: Resume/job description pairs
+
+    Returns:
+        List of (job_skills, user_skills) tuples
+    """
+    pairs = []
+    for pair in corpus:
+        job_entities = NLPService.extract_distinct_entities_from_all_models(
+            pair["job_description_text"]
+        )
+        user_entities = NLPService.extract_distinct_entities_from_all_models(
+            pair["resume_text"]
+        )
+        pairs.append(
+            (
+                NLPService.filter_skills(job_entities),
+                NLPService.filter_skills(user_entities),
+            )
+        )
+    return pairs
+
+
+def score_pairs(pairs: list, threshold: float) -> tuple:
+    """
+    Score every pair with the current cascade settings.
+
+    Args:
+        pairs: (job_skills, user_skills) tuples
+        threshold: Similarity threshold
+
+    Returns:
+        Tuple of the match decision per (pair, job skill) and the median
+        latency in milliseconds
+    """
+    decisions, latencies = {}, []
+    for n, (job_skills, user_skills) in enumerate(pairs):
+        start = time.perf_counter()
+        result = SimilarityService.semantic_matching_score(
+            job_skills, user_skills, threshold=threshold
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        for detail in result["matching_details"]:
+            decisions[(n, detail.job_skill)] = detail.is_match
+    return decisions, statistics.median(latencies)
+
+
+def main():
+    """
+    Main function to run the script.
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare the word-vector cascade with transformer-only matching."
+    )
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        default=BENCHMARK_CORPUS_PATH,
+        help="Path to a JSON lines file of resume/job description pairs",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.5, help="Similarity threshold"
+    )
+    parser.add_argument(
+        "--margins",
+        type=float,
+        nargs="+",
+        default=[0.0, 0.1, 0.2, 0.3],
+        help="Uncertain-band widths (applied below and above the threshold)",
+    )
+    args = parser.parse_args()
+
+    pairs = extract_pairs(load_corpus(args.corpus))
+
+    # Warm up the models, then measure the transformer-only reference
+    SimilarityService.configure_cascade(False)
+    score_pairs(pairs, args.threshold)
+    reference, reference_latency = score_pairs(pairs, args.threshold)
+
+    report = {
+        "pairs": len(pairs),
+        "job_skills": len(reference),
+        "transformer_only_median_ms": round(reference_latency, 2),
+        "cascade": [],
+    }
+    for margin in args.margins:
+        SimilarityService.configure_cascade(True, margin, margin, audit_rate=0.0)
+        decisions, latency = score_pairs(pairs, args.threshold)
+        agreed = sum(decisions[key] == reference[key] for key in reference)
+        stats = SimilarityService.get_cascade_stats()
+        report["cascade"].append(
+            {
+                "margin": margin,
+                "word_vector_share": stats["word_vector_share"],
+                "decision_agreement": round(agreed / max(1, len(reference)), 4),
+                "median_ms": round(latency, 2),
+            }
+        )
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Script to compare prompt size and LLM latency with and without context assembly.
+"""
+
+import argparse
+import json
+import statistics
+
+from app.core.config import BENCHMARK_CORPUS_PATH, CONTEXT_TOKEN_BUDGET
+from app.services.context_service import ContextService
+from app.services.rag_service import RAGService
+
+
+def load_corpus(file_path: str) -> list:
+    """
+    Load resume/job description pairs from a JSON lines file.
+
+    Args:
+        file_path: Path to the corpus file
+
+    Returns:
+        List of dictionaries with `resume_text` and `job_description_text`
+    """
+    with open(file_path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def run_mode(corpus: list, token_budget: int, with_llm: bool) -> dict:
+    """
+    Build prompts (and optionally call the LLM) for every corpus pair.
+
+    Args:
+        corpus: Resume/job description pairs
+        token_budget: Context token budget (0 for the legacy unbounded prompt)
+        with_llm: Whether to call the LLM and measure time to first token
+
+    Returns:
+        Dictionary of median measurements for this mode
+    """
+    prompt_tokens, ttfts, totals = [], [], []
+    for pair in corpus:
+        prompt, _, _, _ = RAGService.augment_prompt(
+            pair["job_description_text"],
+            pair["resume_text"],
+            token_budget=token_budget,
+        )
+        prompt_tokens.append(ContextService.estimate_tokens(prompt))
+        if with_llm:
+            _, stats = RAGService.chat_with_timing(prompt)
+            ttfts.append(stats["time_to_first_token"])
+            totals.append(stats["total_time"])
+
+    result = {"median_prompt_tokens": statistics.median(prompt_tokens)}
+    if with_llm:
+        result["median_ttft_seconds"] = round(statistics.median(ttfts), 3)
+        result["median_total_seconds"] = round(statistics.median(totals), 3)
+    return result
+
+
+def main():
+    """
+    Main function to run the script.
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare prompt size and LLM latency before/after context assembly."
+    )
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        default=BENCHMARK_CORPUS_PATH,
+        help="Path to a JSON lines file of resume/job description pairs",
+    )
+    parser.add_argument(
+        "--token_budget",
+        type=int,
+        default=CONTEXT_TOKEN_BUDGET,
+        help="Context token budget to compare against the unbounded prompt",
+    )
+    parser.add_argument(
+        "--with_llm",
+        action="store_true",
+        help="Also call the LLM and measure time to first token",
+    )
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    report = {
+        "pairs": len(corpus),
+        "before": run_mode(corpus, 0, args.with_llm),
+        "after": run_mode(corpus, args.token_budget, args.with_llm),
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
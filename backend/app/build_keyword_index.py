@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+Script to build the BM25 keyword index over the course titles and skills.
+
+Usage:
+    python -m app.build_keyword_index [--file_path courses.csv] [--query SKILL ...]
+
+Rebuild it whenever the course index is rebuilt, so both tiers return the same
+course ids.
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from app.core.config import COURSES_DATASET_PATH, KEYWORD_INDEX_PATH, KEYWORD_TOP_K
+from app.services.keyword_index_service import KeywordIndexService
+from app.utils.bm25_index import BM25Index
+from app.utils.embedding_utils import load_courses_data
+
+
+def main():
+    """
+    Main function to run the script.
+    """
+    parser = argparse.ArgumentParser(
+        description="Build the BM25 keyword index over the courses."
+    )
+    parser.add_argument(
+        "--file_path",
+        type=str,
+        default=COURSES_DATASET_PATH,
+        help="Path to the CSV file containing course data",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=KEYWORD_INDEX_PATH,
+        help="Where to write the index",
+    )
+    parser.add_argument(
+        "--query",
+        nargs="+",
+        default=None,
+        help="Skills to look up in the built index, as a check",
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file_path):
+        print(f"Error: File '{args.file_path}' does not exist.")
+        return 1
+
+    index = KeywordIndexService.build(load_courses_data(args.file_path))
+    output = Path(args.output)
+    index.save(output)
+    print(
+        f"Indexed {len(index)} courses, {len(index.term_ids)} terms, "
+        f"{len(index.doc_ids)} postings in {output} "
+        f"({output.stat().st_size / 2**20:.1f} MB)"
+    )
+
+    start = time.perf_counter()
+    index = BM25Index.load(output)
+    print(f"Loaded in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    if args.query:
+        for doc_id, score in index.search(" ".join(args.query), KEYWORD_TOP_K):
+            print(f"{score:6.2f}  {index.documents[doc_id]['Title']}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
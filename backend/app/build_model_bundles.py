@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+"""
+Script to pack the spaCy models (and the sentence embedding model) into bundles
+and to report the cold-start time per model before and after.
+
+Usage:
+    python -m app.build_model_bundles [--models NAME ...] [--skip_embedder]
+
+Each load is timed in a fresh process, so neither source benefits from modules
+or models the other one already loaded. Run it again after retraining a model;
+the server ignores bundles whose source model has changed.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from app.core.config import EMBEDDING_MODEL_NAME, MODEL_BUNDLES_DIR, MODELS_DIR
+from app.utils.loader import ModelLoader
+from app.utils.model_bundle import (
+    build_bundle,
+    embedder_bundle_path,
+    load_bundle,
+    write_embedder_manifest,
+)
+
+# Sources a model can be loaded from, per kind of model
+SPACY_SOURCES = ("directory", "bundle")
+EMBEDDER_SOURCES = ("hub", "bundle")
+
+
+def build_embedder_bundle(bundle_path: Path) -> Path:
+    """
+    Save the sentence embedding model to a local directory, with a manifest
+    recording the model and sentence-transformers version it was saved from.
+
+    Args:
+        bundle_path: Directory to save the model to
+
+    Returns:
+        The directory
+    """
+    from sentence_transformers import SentenceTransformer
+
+    SentenceTransformer(EMBEDDING_MODEL_NAME, device="cpu").save(str(bundle_path))
+    write_embedder_manifest(bundle_path)
+    return bundle_path
+
+
+def time_load(model_name: str, source: str, bundles_dir: str) -> float:
+    """
+    Load a model once and time it.
+
+    Args:
+        model_name: spaCy model name, or the embedding model name
+        source: "directory" or "bundle" for spaCy models, "hub" or "bundle"
+            for the embedding model
+        bundles_dir: Directory of the bundles
+
+    Returns:
+        Load time in milliseconds
+    """
+    if model_name == EMBEDDING_MODEL_NAME:
+        from sentence_transformers import SentenceTransformer
+
+        path = embedder_bundle_path(bundles_dir) if source == "bundle" else model_name
+        start = time.perf_counter()
+        SentenceTransformer(str(path), device="cpu")
+    else:
+        import spacy
+
+        start = time.perf_counter()
+        if source == "bundle":
+            load_bundle(Path(bundles_dir) / model_name)
+        else:
+            spacy.load(Path(MODELS_DIR) / model_name)
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def measure_cold_start(model_name: str, source: str, bundles_dir: str) -> float:
+    """
+    Time loading a model in a fresh process.
+
+    Args:
+        model_name: spaCy model name, or the embedding model name
+        source: Source to load from (see `time_load`)
+        bundles_dir: Directory of the bundles
+
+    Returns:
+        Load time in milliseconds
+    """
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "app.build_model_bundles",
+            "--measure",
+            model_name,
+            "--source",
+            source,
+            "--bundles_dir",
+            bundles_dir,
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])["milliseconds"]
+
+
+def main():
+    """
+    Main function to run the script.
+    """
+    parser = argparse.ArgumentParser(
+        description="Build model bundles and report cold-start times."
+    )
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        default=None,
+        help="spaCy models to bundle (default: every model in MODELS_DIR)",
+    )
+    parser.add_argument(
+        "--bundles_dir",
+        type=str,
+        default=MODEL_BUNDLES_DIR,
+        help="Directory to write the bundles to",
+    )
+    parser.add_argument(
+        "--skip_embedder",
+        action="store_true",
+        help="Do not bundle the sentence embedding model",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=3,
+        help="Cold starts per model and source (the median is reported)",
+    )
+    parser.add_argument(
+        "--skip_report",
+        action="store_true",
+        help="Only build the bundles",
+    )
+    parser.add_argument("--measure", type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--source", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        milliseconds = time_load(args.measure, args.source, args.bundles_dir)
+        print(json.dumps({"milliseconds": milliseconds}))
+        return 0
+
+    bundles_dir = Path(args.bundles_dir)
+    model_names = args.models or ModelLoader.list_available_models()
+    for model_name in model_names:
+        manifest = build_bundle(Path(MODELS_DIR) / model_name, bundles_dir / model_name)
+        print(
+            f"Bundled {model_name} (vectors {manifest['vectors']['shape']}) "
+            f"in {bundles_dir / model_name}"
+        )
+
+    targets = {model_name: SPACY_SOURCES for model_name in model_names}
+    if not args.skip_embedder:
+        bundle_path = build_embedder_bundle(embedder_bundle_path(args.bundles_dir))
+        print(f"Bundled {EMBEDDING_MODEL_NAME} in {bundle_path}")
+        targets[EMBEDDING_MODEL_NAME] = EMBEDDER_SOURCES
+
+    if args.skip_report:
+        return 0
+
+    report = {}
+    for model_name, (before, after) in targets.items():
+        times = {
+            source: statistics.median(
+                measure_cold_start(model_name, source, args.bundles_dir)
+                for _ in range(args.rounds)
+            )
+            for source in (before, after)
+        }
+        report[model_name] = {
+            f"{before}_ms": times[before],
+            f"{after}_ms": times[after],
+            "speedup": round(times[before] / max(times[after], 1e-3), 2),
+        }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+"""
+Script to export the sentence embedding model to ONNX, quantize it to int8 and
+check its parity with the PyTorch backend.
+
+Usage:
+    python -m app.build_onnx_embedder [--skip_quantize] [--parity_only]
+
+Set EMBEDDING_BACKEND=onnx or EMBEDDING_BACKEND=onnx-int8 to serve with the
+exported model.
+"""
+
+import argparse
+import json
+import resource
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import BASE_DIR, EMBEDDING_MODEL_NAME, EMBEDDING_ONNX_DIR
+from app.utils.embedder import (
+    ONNX_INT8_MODEL_FILE,
+    ONNX_MODEL_FILE,
+    ONNX_SETTINGS_FILE,
+    OnnxEmbedder,
+)
+
+PARITY_SKILLS_PATH = str(BASE_DIR / "benchmarks" / "parity_skills.txt")
+
+# Fixed so repeated exports trace the same graph
+ONNX_OPSET = 14
+EXPORT_SAMPLE = "Experienced Python developer with AWS and Docker"
+
+
+def export_model(output_dir: Path, model_name: str = EMBEDDING_MODEL_NAME) -> Path:
+    """
+    Export the transformer of a sentence-transformers model to ONNX.
+
+    Only the transformer is exported; pooling and normalization are done by
+    `OnnxEmbedder`. The tokenizer and pipeline settings are saved alongside.
+
+    Args:
+        output_dir: Directory to write the model, tokenizer and settings to
+        model_name: Name of the sentence-transformers model
+
+    Returns:
+        Path to the exported model
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    class TokenEmbeddings(torch.nn.Module):
+        """Transformer wrapper returning only the token embeddings."""
+
+        def __init__(self, transformer):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.transformer(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                token_type_ids=token_type_ids,
+            ).last_hidden_state
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    model = SentenceTransformer(model_name, device="cpu")
+    wrapper = TokenEmbeddings(model[0].auto_model).eval()
+
+    sample = model.tokenizer([EXPORT_SAMPLE], return_tensors="pt")
+    input_names = ["input_ids", "attention_mask", "token_type_ids"]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+
+    model_path = output_dir / ONNX_MODEL_FILE
+    with torch.no_grad():
+        torch.onnx.export(
+            wrapper,
+            tuple(sample[name] for name in input_names),
+            str(model_path),
+            input_names=input_names,
+            output_names=["token_embeddings"],
+            dynamic_axes=dynamic_axes,
+            opset_version=ONNX_OPSET,
+            do_constant_folding=True,
+        )
+
+    model.tokenizer.save_pretrained(str(output_dir))
+    with open(output_dir / ONNX_SETTINGS_FILE, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "model_name": model_name,
+                "max_seq_length": model.max_seq_length,
+                "dimension": model.get_sentence_embedding_dimension(),
+                "opset": ONNX_OPSET,
+                "torch_version": torch.__version__,
+            },
+            f,
+            indent=2,
+        )
+    return model_path
+
+
+def quantize_model(output_dir: Path) -> Path:
+    """
+    Dynamically quantize the exported model's weights to int8.
+
+    Args:
+        output_dir: Directory containing the exported model
+
+    Returns:
+        Path to the quantized model
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantized_path = output_dir / ONNX_INT8_MODEL_FILE
+    quantize_dynamic(
+        str(output_dir / ONNX_MODEL_FILE),
+        str(quantized_path),
+        weight_type=QuantType.QInt8,
+    )
+    return quantized_path
+
+
+def _rss_mb() -> float:
+    """Return the resident memory of this process in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    except OSError:
+        # ru_maxrss is in KB on Linux; a peak, but the best available here
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _load_measured(loader) -> tuple:
+    """Load a model and return it with the resident memory it added (MB)."""
+    before = _rss_mb()
+    model = loader()
+    return model, round(_rss_mb() - before, 1)
+
+
+def _throughput(model, texts: list, rounds: int) -> float:
+    """Return the encoding throughput in texts per second."""
+    model.encode(texts)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        model.encode(texts)
+    return round(len(texts) * rounds / (time.perf_counter() - start), 1)
+
+
+def parity_report(
+    output_dir: Path, skills: list, threshold: float, rounds: int
+) -> dict:
+    """
+    Compare the ONNX backends against the PyTorch backend on a skill corpus.
+
+    Match decisions are compared on every pair of corpus skills, i.e. whether
+    the pair's similarity reaches the threshold.
+
+    Args:
+        output_dir: Directory containing the exported models
+        skills: Fixed list of skills
+        threshold: Similarity threshold for match decisions
+        rounds: Number of timed passes over the skills for throughput
+
+    Returns:
+        Report with cosine deviation, changed decisions, throughput and memory
+    """
+    candidates = {"onnx": False}
+    if (output_dir / ONNX_INT8_MODEL_FILE).exists():
+        candidates["onnx-int8"] = True
+
+    # ONNX models are loaded first so their memory excludes the torch runtime
+    report = {}
+    embedders = {}
+    for backend, quantized in candidates.items():
+        embedder, memory = _load_measured(
+            lambda: OnnxEmbedder(str(output_dir), quantized=quantized)
+        )
+        embedders[backend] = embedder
+        model_file = ONNX_INT8_MODEL_FILE if quantized else ONNX_MODEL_FILE
+        report[backend] = {
+            "model_mb": round((output_dir / model_file).stat().st_size / 2**20, 1),
+            "load_rss_mb": memory,
+        }
+
+    from sentence_transformers import SentenceTransformer
+
+    reference_model, memory = _load_measured(
+        lambda: SentenceTransformer(EMBEDDING_MODEL_NAME, device="cpu")
+    )
+    report["torch"] = {
+        "load_rss_mb": memory,
+        "throughput": _throughput(reference_model, skills, rounds),
+    }
+    reference = reference_model.encode(skills, normalize_embeddings=True)
+    reference_decisions = reference @ reference.T >= threshold
+    pairs = np.triu_indices(len(skills), k=1)
+
+    for backend, embedder in embedders.items():
+        embeddings = embedder.encode(skills)
+        deviation = 1.0 - np.sum(reference * embeddings, axis=1)
+        decisions = embeddings @ embeddings.T >= threshold
+        changed = int(np.sum(decisions[pairs] != reference_decisions[pairs]))
+        report[backend].update(
+            {
+                "mean_cosine_deviation": float(np.mean(deviation)),
+                "max_cosine_deviation": float(np.max(deviation)),
+                "changed_decisions": changed,
+                "compared_pairs": int(len(pairs[0])),
+                "throughput": _throughput(embedder, skills, rounds),
+            }
+        )
+
+    return report
+
+
+def main():
+    """
+    Main function to run the script.
+    """
+    parser = argparse.ArgumentParser(
+        description="Export, quantize and parity-check the ONNX embedding model."
+    )
+    parser.add_argument(
+        "--output_dir",
+        type=str,
+        default=EMBEDDING_ONNX_DIR,
+        help="Directory to write the ONNX model to",
+    )
+    parser.add_argument(
+        "--skip_quantize",
+        action="store_true",
+        help="Do not build the int8 quantized model",
+    )
+    parser.add_argument(
+        "--parity_only",
+        action="store_true",
+        help="Only run the parity check on previously exported models",
+    )
+    parser.add_argument(
+        "--skills",
+        type=str,
+        default=PARITY_SKILLS_PATH,
+        help="File with one skill per line for the parity check",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.5,
+        help="Similarity threshold for comparing match decisions",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=20,
+        help="Number of timed passes over the skills for throughput",
+    )
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    if not args.parity_only:
+        print(f"Exported to {export_model(output_dir)}")
+        if not args.skip_quantize:
+            print(f"Quantized to {quantize_model(output_dir)}")
+
+    with open(args.skills, encoding="utf-8") as f:
+        skills = [line.strip() for line in f if line.strip()]
+
+    report = parity_report(output_dir, skills, args.threshold, args.rounds)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
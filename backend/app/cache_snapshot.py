@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""
+Script to export the hottest cache entries to a snapshot, or import one.
+
+Usage:
+    python -m app.cache_snapshot export --output cache_snapshot.pkl.gz
+    python -m app.cache_snapshot import --input cache_snapshot.pkl.gz
+
+Set CACHE_SNAPSHOT_PATH to import a snapshot automatically on startup.
+"""
+
+import argparse
+import json
+
+from app.core.config import CACHE_SNAPSHOT_TOP_N
+from app.services.snapshot_service import NAMESPACE_DEPENDENCIES, SnapshotService
+
+
+def main():
+    """
+    Main function to run the script.
+    """
+    parser = argparse.ArgumentParser(
+        description="Export or import a snapshot of the hottest cache entries."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="Write a snapshot")
+    export_parser.add_argument(
+        "--output", type=str, required=True, help="Snapshot file to write"
+    )
+    export_parser.add_argument(
+        "--top",
+        type=int,
+        default=CACHE_SNAPSHOT_TOP_N,
+        help="Number of entries to export, hottest first",
+    )
+    export_parser.add_argument(
+        "--namespaces",
+        type=str,
+        nargs="+",
+        choices=list(NAMESPACE_DEPENDENCIES),
+        default=list(NAMESPACE_DEPENDENCIES),
+        help="Namespaces to export",
+    )
+
+    import_parser = commands.add_parser("import", help="Load a snapshot")
+    import_parser.add_argument(
+        "--input", type=str, required=True, help="Snapshot file to read"
+    )
+    args = parser.parse_args()
+
+    if args.command == "export":
+        summary = SnapshotService.export_snapshot(
+            args.output, top_n=args.top, namespaces=args.namespaces
+        )
+    else:
+        summary = SnapshotService.import_snapshot(args.input)
+
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
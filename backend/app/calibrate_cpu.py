@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+"""
+Script to measure throughput at several worker/thread configurations and store
+the best one for `app.utils.cpu_tuning`.
+
+Each configuration runs one process per worker, all working through the
+benchmark corpus at the same time, which mirrors how the server's workers
+share the cores.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from app.core.config import BENCHMARK_CORPUS_PATH, CPU_TUNING_PATH
+from app.utils.cpu_tuning import (
+    THREAD_ENV_VARS,
+    apply_thread_settings,
+    available_cpus,
+)
+
+
+def candidate_configs(cpus: int) -> list:
+    """
+    List the worker/thread configurations that use all cores.
+
+    Only thread counts dividing the cores are tried, so no configuration
+    leaves cores idle (6 cores give 6x1, 3x2, 2x3 and 1x6).
+
+    Args:
+        cpus: Number of usable cores
+
+    Returns:
+        List of (workers, threads) tuples
+    """
+    return [
+        (cpus // threads, threads)
+        for threads in range(1, cpus + 1)
+        if cpus % threads == 0
+    ]
+
+
+def run_worker(corpus_path: str, rounds: int, threads: int) -> int:
+    """
+    Measure the throughput of a single worker (runs in a child process).
+
+    Models are loaded and warmed up first, then the worker reports that it is
+    ready and waits for the parent's go signal so all workers measure at the
+    same time.
+
+    Args:
+        corpus_path: Path to the benchmark corpus
+        rounds: Number of passes over the corpus to time
+        threads: Intra-op threads for this worker
+
+    Returns:
+        Exit code
+    """
+    apply_thread_settings(threads)
+
+    # Imported only now so NumPy and torch pick up the thread limits
+    from app.services.nlp_service import NLPService
+
+    with open(corpus_path, encoding="utf-8") as f:
+        corpus = [json.loads(line) for line in f if line.strip()]
+
+    def run_pass():
+        for pair in corpus:
+            NLPService.compare_skills_semantic(
+                pair["resume_text"], pair["job_description_text"]
+            )
+
+    run_pass()
+    print("ready", flush=True)
+    sys.stdin.readline()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        run_pass()
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({"pairs": len(corpus) * rounds, "seconds": elapsed}), flush=True)
+    return 0
+
+
+def measure_config(
+    workers: int, threads: int, corpus_path: str, rounds: int
+) -> dict:
+    """
+    Measure the combined throughput of `workers` concurrent worker processes.
+
+    Args:
+        workers: Number of worker processes
+        threads: Intra-op threads per worker
+        corpus_path: Path to the benchmark corpus
+        rounds: Number of passes over the corpus per worker
+
+    Returns:
+        Dictionary with the configuration and its throughput in pairs/second
+    """
+    env = dict(os.environ, **{name: str(threads) for name in THREAD_ENV_VARS})
+    command = [
+        sys.executable,
+        "-m",
+        "app.calibrate_cpu",
+        "--worker",
+        "--threads",
+        str(threads),
+        "--corpus",
+        corpus_path,
+        "--rounds",
+        str(rounds),
+    ]
+    processes = [
+        subprocess.Popen(
+            command,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        for _ in range(workers)
+    ]
+
+    try:
+        for process in processes:
+            if process.stdout.readline().strip() != "ready":
+                raise RuntimeError("Calibration worker failed to start")
+        for process in processes:
+            process.stdin.write("go\n")
+            process.stdin.flush()
+
+        results = [json.loads(process.stdout.readline()) for process in processes]
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+
+    # Workers ran concurrently, so the slowest one bounds the wall time
+    wall_time = max(result["seconds"] for result in results)
+    pairs = sum(result["pairs"] for result in results)
+    return {
+        "workers": workers,
+        "threads": threads,
+        "throughput": round(pairs / wall_time, 3),
+    }
+
+
+def main():
+    """
+    Main function to run the script.
+    """
+    parser = argparse.ArgumentParser(
+        description="Calibrate server workers and threads on the benchmark corpus."
+    )
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        default=BENCHMARK_CORPUS_PATH,
+        help="Path to a JSON lines file of resume/job description pairs",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=5,
+        help="Number of timed passes over the corpus per worker",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=CPU_TUNING_PATH,
+        help="Where to store the best settings",
+    )
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--threads", type=int, default=1, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_worker(args.corpus, args.rounds, args.threads)
+
+    cpus = available_cpus()
+    results = []
+    for workers, threads in candidate_configs(cpus):
+        result = measure_config(workers, threads, args.corpus, args.rounds)
+        print(
+            f"{workers} workers x {threads} threads: "
+            f"{result['throughput']} pairs/s"
+        )
+        results.append(result)
+
+    best = max(results, key=lambda result: result["throughput"])
+    calibration = {
+        "cpus": cpus,
+        "workers": best["workers"],
+        "threads": best["threads"],
+        "throughput": best["throughput"],
+        "results": results,
+        "calibrated_at": datetime.now(timezone.utc).isoformat(),
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(calibration, f, indent=2)
+
+    print(
+        f"Best: {best['workers']} workers x {best['threads']} threads, "
+        f"stored in {args.output}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -15,6 +15,10 @@ API_V1_STR = "/api/v1"
 PROJECT_NAME = "SkillBridge"
 PORT = int(os.environ.get("PORT", 8000))
 
+# Admin endpoints (/admin/*) are only served when ADMIN_TOKEN is set, and only to
+# requests sending it in the X-Admin-Token header
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+
 # Path settings
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 MODELS_DIR = os.environ.get("MODELS_DIR", str(BASE_DIR / "models"))
@@ -23,15 +27,178 @@ ASSETS_DIR = Path(os.environ.get("ASSETS_DIR", str(BASE_DIR / "assets")))
 # Default model
 DEFAULT_MODEL = os.environ.get("DEFAULT_MODEL", "ner_model_20000")
 
+# Model bundles built by `python -m app.build_model_bundles`; models without a
+# current bundle are loaded from MODELS_DIR. Off by default: the shipped models
+# have empty vector tables, so their bundles load no faster (measured cold
+# starts 0.81-1.0x of `spacy.load`); enable only if the build report shows a gain
+MODEL_BUNDLES_ENABLED = (
+    os.environ.get("MODEL_BUNDLES_ENABLED", "false").lower() == "true"
+)
+MODEL_BUNDLES_DIR = os.environ.get("MODEL_BUNDLES_DIR", str(BASE_DIR / "bundles"))
+
 # CORS settings
 ALLOWED_ORIGINS = os.environ.get("ALLOWED_ORIGINS", "*").split(",")
 
+# Responses larger than this many bytes are gzip-compressed
+GZIP_MINIMUM_SIZE = int(os.environ.get("GZIP_MINIMUM_SIZE", 1000))
+
 # RAG service settings
 PINECONE_API_KEY = os.environ.get("PINECONE_API_KEY", "")
 PINECONE_INDEX_NAME = os.environ.get("PINECONE_INDEX_NAME", "course-index-prod")
+# Index host to query directly (skips the lookup by name; set for fake servers)
+PINECONE_HOST = os.environ.get("PINECONE_HOST", "")
 COHERE_API_KEY = os.environ.get("COHERE_API_KEY", "")
 
 # Dataset settings
 COURSES_DATASET_PATH = os.environ.get(
     "COURSES_DATASET_PATH", str(ASSETS_DIR / "online_courses.csv")
 )
+# Parquet cache of the prepared catalogue (see `python -m app.ingest_courses`)
+CATALOG_CACHE_DIR = os.environ.get("CATALOG_CACHE_DIR", str(BASE_DIR / "catalog"))
+CATALOG_CHUNK_ROWS = int(os.environ.get("CATALOG_CHUNK_ROWS", 5000))
+
+# Context assembly settings
+RETRIEVAL_TOP_K = int(os.environ.get("RETRIEVAL_TOP_K", 50))
+CONTEXT_TOKEN_BUDGET = int(os.environ.get("CONTEXT_TOKEN_BUDGET", 1500))
+CONTEXT_MAX_COURSE_CHARS = int(os.environ.get("CONTEXT_MAX_COURSE_CHARS", 400))
+CONTEXT_COVERAGE_THRESHOLD = float(os.environ.get("CONTEXT_COVERAGE_THRESHOLD", 0.5))
+
+# Keyword retrieval tier: a local BM25 index over course titles and skills
+# (`python -m app.build_keyword_index`), fused with the dense results
+KEYWORD_INDEX_ENABLED = (
+    os.environ.get("KEYWORD_INDEX_ENABLED", "true").lower() == "true"
+)
+KEYWORD_INDEX_PATH = os.environ.get(
+    "KEYWORD_INDEX_PATH", str(BASE_DIR / "indexes" / "courses_bm25.npz")
+)
+KEYWORD_TOP_K = int(os.environ.get("KEYWORD_TOP_K", 10))
+RRF_K = int(os.environ.get("RRF_K", 60))
+
+# Benchmark settings
+BENCHMARK_CORPUS_PATH = os.environ.get(
+    "BENCHMARK_CORPUS_PATH", str(BASE_DIR / "benchmarks" / "corpus.jsonl")
+)
+
+# Recommendation settings
+RECOMMENDATION_COUNT = int(os.environ.get("RECOMMENDATION_COUNT", 5))
+LLM_TIMEOUT_SECONDS = float(os.environ.get("LLM_TIMEOUT_SECONDS", 20))
+
+# LLM client settings
+LLM_MODEL = os.environ.get("LLM_MODEL", "command-r-plus")
+COHERE_BASE_URL = os.environ.get("COHERE_BASE_URL", "")
+LLM_MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", 10))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", 2))
+LLM_RETRY_BACKOFF_SECONDS = float(os.environ.get("LLM_RETRY_BACKOFF_SECONDS", 0.5))
+LLM_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("LLM_CIRCUIT_FAILURE_THRESHOLD", 5))
+LLM_CIRCUIT_RESET_SECONDS = float(os.environ.get("LLM_CIRCUIT_RESET_SECONDS", 30))
+
+# Cache settings (CACHE_BACKEND is "disk" or "redis")
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "disk").lower()
+CACHE_DIR = os.environ.get("CACHE_DIR", str(BASE_DIR / "cache"))
+CACHE_SIZE_LIMIT = int(os.environ.get("CACHE_SIZE_LIMIT", 500_000_000))
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+REDIS_MAX_CONNECTIONS = int(os.environ.get("REDIS_MAX_CONNECTIONS", 20))
+CACHE_KEY_PREFIX = os.environ.get("CACHE_KEY_PREFIX", "skillbridge:")
+NEAR_DUP_CACHE_ENABLED = (
+    os.environ.get("NEAR_DUP_CACHE_ENABLED", "true").lower() == "true"
+)
+NEAR_DUP_MAX_DISTANCE = int(os.environ.get("NEAR_DUP_MAX_DISTANCE", 6))
+
+# Job description artifact settings
+JD_ARTIFACT_TTL_HOURS = int(os.environ.get("JD_ARTIFACT_TTL_HOURS", 72))
+JD_ARTIFACT_MEMORY_SIZE = int(os.environ.get("JD_ARTIFACT_MEMORY_SIZE", 128))
+# Most job descriptions accepted by one prewarm request
+JD_PREWARM_MAX_ITEMS = int(os.environ.get("JD_PREWARM_MAX_ITEMS", 50))
+
+# Analysis settings (stored similarity data for threshold re-scoring)
+ANALYSIS_TTL_HOURS = float(os.environ.get("ANALYSIS_TTL_HOURS", 2))
+
+# Pipeline settings (threads running CPU-bound stages; 0 means one per core)
+PIPELINE_CPU_WORKERS = int(os.environ.get("PIPELINE_CPU_WORKERS", 0))
+
+# Job settings (asynchronous recommendations queued in a local SQLite database)
+JOB_DB_PATH = os.environ.get("JOB_DB_PATH", str(BASE_DIR / "jobs" / "jobs.db"))
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", 3))
+JOB_RETRY_BACKOFF_SECONDS = float(os.environ.get("JOB_RETRY_BACKOFF_SECONDS", 5))
+JOB_LEASE_SECONDS = float(os.environ.get("JOB_LEASE_SECONDS", 300))
+JOB_POLL_SECONDS = float(os.environ.get("JOB_POLL_SECONDS", 0.5))
+JOB_RETENTION_HOURS = float(os.environ.get("JOB_RETENTION_HOURS", 24))
+
+# Memory accounting settings (trace allocations from startup when > 0 frames)
+MEMORY_TRACEMALLOC_FRAMES = int(os.environ.get("MEMORY_TRACEMALLOC_FRAMES", 0))
+
+# Input size settings
+MAX_REQUEST_CHARS = int(os.environ.get("MAX_REQUEST_CHARS", 500_000))
+MAX_PROCESSED_CHARS = int(os.environ.get("MAX_PROCESSED_CHARS", 60_000))
+NER_CHUNK_CHARS = int(os.environ.get("NER_CHUNK_CHARS", 3_000))
+MAX_NER_CHUNKS = int(os.environ.get("MAX_NER_CHUNKS", 30))
+NER_BATCH_SIZE = int(os.environ.get("NER_BATCH_SIZE", 8))
+MAX_SKILLS_PER_TEXT = int(os.environ.get("MAX_SKILLS_PER_TEXT", 150))
+
+# Request deadline settings: the default budget of `/recommend-courses` (0 means
+# no deadline; the X-Request-Deadline-Ms header overrides it), and the time a
+# stage must have left to run at full quality instead of degrading
+REQUEST_DEADLINE_SECONDS = float(os.environ.get("REQUEST_DEADLINE_SECONDS", 0))
+DEADLINE_SCORING_MIN_SECONDS = float(
+    os.environ.get("DEADLINE_SCORING_MIN_SECONDS", 0.5)
+)
+DEADLINE_LLM_MIN_SECONDS = float(os.environ.get("DEADLINE_LLM_MIN_SECONDS", 3))
+DEADLINE_NER_MIN_SECONDS = float(os.environ.get("DEADLINE_NER_MIN_SECONDS", 1))
+
+# CPU tuning settings (0 means size from the available cores)
+CPU_TUNING_ENABLED = os.environ.get("CPU_TUNING_ENABLED", "true").lower() == "true"
+CPU_TUNING_PATH = os.environ.get(
+    "CPU_TUNING_PATH", str(BASE_DIR / "benchmarks" / "cpu_tuning.json")
+)
+CPU_THREADS = int(os.environ.get("CPU_THREADS", 0))
+SERVER_WORKERS = int(os.environ.get("SERVER_WORKERS", 0))
+
+# Cross-request batching of embedding and NER inference: items of concurrent
+# requests are collected for up to *_MAX_WAIT_MS or *_MAX_ITEMS items, then run as
+# one batch (see `python -m app.benchmark_batching`)
+INFERENCE_BATCHING_ENABLED = (
+    os.environ.get("INFERENCE_BATCHING_ENABLED", "true").lower() == "true"
+)
+EMBEDDING_BATCH_MAX_ITEMS = int(os.environ.get("EMBEDDING_BATCH_MAX_ITEMS", 128))
+EMBEDDING_BATCH_MAX_WAIT_MS = float(os.environ.get("EMBEDDING_BATCH_MAX_WAIT_MS", 2))
+NER_BATCH_MAX_ITEMS = int(os.environ.get("NER_BATCH_MAX_ITEMS", 32))
+NER_BATCH_MAX_WAIT_MS = float(os.environ.get("NER_BATCH_MAX_WAIT_MS", 2))
+# Worker threads running the batches of each batcher concurrently. Every worker
+# calls the same spaCy pipeline / SentenceTransformer object, which are not
+# guaranteed to be thread-safe, so keep 1 unless the models are known to be
+INFERENCE_BATCH_WORKERS = int(os.environ.get("INFERENCE_BATCH_WORKERS", 1))
+
+# Embedding settings (EMBEDDING_BACKEND is "torch", "onnx" or "onnx-int8")
+EMBEDDING_MODEL_NAME = os.environ.get("EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2")
+EMBEDDING_BACKEND = os.environ.get("EMBEDDING_BACKEND", "torch").lower()
+EMBEDDING_ONNX_DIR = os.environ.get(
+    "EMBEDDING_ONNX_DIR", str(BASE_DIR / "onnx" / EMBEDDING_MODEL_NAME)
+)
+
+# Skill vocabulary settings (canonical skills from the courses dataset + aliases)
+SKILL_VOCABULARY_ENABLED = (
+    os.environ.get("SKILL_VOCABULARY_ENABLED", "true").lower() == "true"
+)
+SKILL_VOCABULARY_MIN_COURSES = int(os.environ.get("SKILL_VOCABULARY_MIN_COURSES", 2))
+# Build the vocabulary and its embeddings at startup instead of in the first
+# request (the app reports not ready until they are built)
+SKILL_VOCABULARY_WARM_UP = (
+    os.environ.get("SKILL_VOCABULARY_WARM_UP", "true").lower() == "true"
+)
+
+# Similarity cascade settings: pairs whose averaged word-vector similarity is
+# within [threshold - lower margin, threshold + upper margin) go to the
+# transformer; the others are decided by the word vectors alone. Re-thresholding
+# a stored analysis re-scores the word-vector pairs near the new threshold
+SIMILARITY_CASCADE_ENABLED = (
+    os.environ.get("SIMILARITY_CASCADE_ENABLED", "false").lower() == "true"
+)
+WORD_VECTOR_MODEL = os.environ.get("WORD_VECTOR_MODEL", "ner_model_20000")
+CASCADE_LOWER_MARGIN = float(os.environ.get("CASCADE_LOWER_MARGIN", 0.25))
+CASCADE_UPPER_MARGIN = float(os.environ.get("CASCADE_UPPER_MARGIN", 0.25))
+CASCADE_AUDIT_RATE = float(os.environ.get("CASCADE_AUDIT_RATE", 0.05))
+
+# Cache snapshot settings (imported at startup when the file exists)
+CACHE_SNAPSHOT_PATH = os.environ.get("CACHE_SNAPSHOT_PATH", "")
+CACHE_SNAPSHOT_TOP_N = int(os.environ.get("CACHE_SNAPSHOT_TOP_N", 5000))
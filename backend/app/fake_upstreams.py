@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+"""
+Script to run local stand-ins for the Pinecone and Cohere APIs.
+
+Point `PINECONE_HOST` and `COHERE_BASE_URL` at this server to exercise the
+whole recommendation pipeline without network calls, quota or cost. Latency
+and error injection make it possible to load test against slow or failing
+upstreams.
+
+Pinecone queries return courses from the courses dataset (or a synthetic
+catalog when the dataset is missing), picked deterministically from the query
+vector. Cohere chats stream a recommendation that references the courses
+listed in the prompt, in the JSON format when JSON mode is requested.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import uuid
+from typing import List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.core.config import COURSES_DATASET_PATH, RECOMMENDATION_COUNT
+from app.services.skill_vocabulary_service import SKILL_ALIASES
+
+COURSE_ID_PATTERN = re.compile(r"\[(C\d+)\]")
+
+
+def load_catalog(file_path: str = COURSES_DATASET_PATH) -> List[dict]:
+    """
+    Load the course metadata served by the fake Pinecone index.
+
+    Args:
+        file_path: Path to the courses CSV file
+
+    Returns:
+        Pinecone-style metadata dictionaries (Title, url, course_desc, Skills)
+    """
+    if os.path.exists(file_path):
+        from app.utils.embedding_utils import load_courses_data
+
+        df = load_courses_data(file_path)
+        return df[["Title", "url", "course_desc", "Skills"]].to_dict("records")
+
+    skills = list(SKILL_ALIASES)
+    return [
+        {
+            "Title": f"{skill} for Professionals",
+            "url": f"https://courses.example.com/{n}",
+            "course_desc": (
+                f"A hands-on course covering {skill}, "
+                f"{skills[(n + 1) % len(skills)]} and "
+                f"{skills[(n + 2) % len(skills)]}."
+            ),
+            "Skills": f"{skill}, {skills[(n + 1) % len(skills)]}",
+        }
+        for n, skill in enumerate(skills)
+    ]
+
+
+class FaultInjector:
+    """Latency and error injection for one fake upstream."""
+
+    def __init__(self, latency_ms: float, jitter: float, error_rate: float):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.error_rate = error_rate
+
+    def delay(self, base_ms: Optional[float] = None) -> float:
+        """Return a delay in seconds around `base_ms` (default: the latency)."""
+        base_ms = self.latency_ms if base_ms is None else base_ms
+        spread = random.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(0.0, base_ms * spread) / 1000
+
+    def should_fail(self) -> bool:
+        """Return whether this call should fail."""
+        return random.random() < self.error_rate
+
+
+def create_app(
+    catalog: List[dict],
+    pinecone: FaultInjector,
+    cohere: FaultInjector,
+    token_ms: float,
+) -> FastAPI:
+    """
+    Create the fake upstream application.
+
+    Args:
+        catalog: Course metadata served by the fake index
+        pinecone: Fault injection for Pinecone queries
+        cohere: Fault injection for Cohere chats (latency is the time to the
+            first token)
+        token_ms: Delay between streamed Cohere chunks
+
+    Returns:
+        FastAPI application serving both APIs
+    """
+    app = FastAPI(title="Fake upstreams")
+    stats = {"pinecone_queries": 0, "cohere_chats": 0, "errors": 0}
+
+    @app.post("/query")
+    async def pinecone_query(request: Request):
+        body = await request.json()
+        stats["pinecone_queries"] += 1
+        await asyncio.sleep(pinecone.delay())
+        if pinecone.should_fail():
+            stats["errors"] += 1
+            return JSONResponse({"error": "injected failure"}, status_code=503)
+
+        # Same vector, same courses, so repeated inputs see repeated results
+        vector = body.get("vector") or []
+        seed = hashlib.sha256(
+            json.dumps([round(v, 4) for v in vector[:16]]).encode()
+        ).digest()
+        rng = random.Random(seed)
+        top_k = min(int(body.get("topK", 10)), len(catalog))
+        picked = rng.sample(range(len(catalog)), top_k)
+        matches = [
+            {
+                "id": str(i),
+                "score": round(0.9 - rank * 0.3 / max(1, top_k), 4),
+                "values": [],
+                "metadata": catalog[i] if body.get("includeMetadata") else None,
+            }
+            for rank, i in enumerate(picked)
+        ]
+        return {"matches": matches, "namespace": "", "usage": {"readUnits": 5}}
+
+    @app.post("/v1/chat")
+    async def cohere_chat(request: Request):
+        body = await request.json()
+        stats["cohere_chats"] += 1
+        await asyncio.sleep(cohere.delay())
+        if cohere.should_fail():
+            stats["errors"] += 1
+            return JSONResponse({"message": "injected failure"}, status_code=503)
+
+        ids = list(dict.fromkeys(COURSE_ID_PATTERN.findall(body.get("message", ""))))
+        ids = ids[:RECOMMENDATION_COUNT]
+        if body.get("response_format", {}).get("type") == "json_object":
+            text = json.dumps(
+                {
+                    "recommendations": [
+                        {"id": course_id, "reason": "Covers missing skills."}
+                        for course_id in ids
+                    ]
+                }
+            )
+        else:
+            text = "\n".join(
+                f"{n}. Course {course_id}: Covers missing skills."
+                for n, course_id in enumerate(ids, 1)
+            )
+
+        generation_id = uuid.uuid4().hex
+
+        async def events():
+            yield json.dumps(
+                {
+                    "is_finished": False,
+                    "event_type": "stream-start",
+                    "generation_id": generation_id,
+                }
+            ) + "\n"
+            for start in range(0, len(text), 16):
+                await asyncio.sleep(cohere.delay(token_ms))
+                yield json.dumps(
+                    {
+                        "is_finished": False,
+                        "event_type": "text-generation",
+                        "text": text[start : start + 16],
+                    }
+                ) + "\n"
+            yield json.dumps(
+                {
+                    "is_finished": True,
+                    "event_type": "stream-end",
+                    "finish_reason": "COMPLETE",
+                    "response": {
+                        "text": text,
+                        "generation_id": generation_id,
+                        "finish_reason": "COMPLETE",
+                    },
+                }
+            ) + "\n"
+
+        return StreamingResponse(events(), media_type="application/stream+json")
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+
+def main():
+    """
+    Main function to run the script.
+    """
+    parser = argparse.ArgumentParser(
+        description="Run local stand-ins for the Pinecone and Cohere APIs."
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8100, help="Port to listen on")
+    parser.add_argument(
+        "--pinecone_latency_ms", type=float, default=30, help="Query latency"
+    )
+    parser.add_argument(
+        "--pinecone_error_rate", type=float, default=0.0, help="Share of failed queries"
+    )
+    parser.add_argument(
+        "--cohere_ttft_ms", type=float, default=800, help="Time to the first token"
+    )
+    parser.add_argument(
+        "--cohere_token_ms", type=float, default=20, help="Delay between chunks"
+    )
+    parser.add_argument(
+        "--cohere_error_rate", type=float, default=0.0, help="Share of failed chats"
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.2,
+        help="Relative spread of the injected latencies (0.2 = +/-20%%)",
+    )
+    args = parser.parse_args()
+
+    app = create_app(
+        load_catalog(),
+        FaultInjector(args.pinecone_latency_ms, args.jitter, args.pinecone_error_rate),
+        FaultInjector(args.cohere_ttft_ms, args.jitter, args.cohere_error_rate),
+        args.cohere_token_ms,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+"""
+Script to ingest the courses CSV into the Parquet catalogue cache and report
+parse time and peak memory.
+
+Usage:
+    python -m app.ingest_courses [--file_path courses.csv] [--repeat 20]
+
+The report compares three ways of loading the catalogue, each in a fresh
+process so the peak RSS of one does not hide the other's:
+
+- `eager`: the whole CSV read into one DataFrame, then prepared (the previous
+  `load_courses_data`)
+- `stream`: the chunked ingestion writing the cache
+- `cache`: reading the cache
+
+`--repeat` measures a larger catalogue, made by repeating the CSV's rows with
+distinct urls.
+"""
+
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from app.core.config import CATALOG_CHUNK_ROWS, COURSES_DATASET_PATH
+from app.utils.course_catalog import (
+    SOURCE_COLUMNS,
+    catalog_cache_path,
+    ingest_courses,
+    load_catalog,
+)
+from app.utils.memory_utils import MB, process_memory
+
+METHODS = ("eager", "stream", "cache")
+
+
+def load_eager(csv_path: str) -> pd.DataFrame:
+    """
+    Load the catalogue the way `load_courses_data` did before ingestion.
+
+    Args:
+        csv_path: Path to the courses CSV file
+
+    Returns:
+        The prepared catalogue
+    """
+    df = pd.read_csv(
+        csv_path,
+        encoding="utf-8",
+        quotechar='"',
+        escapechar="\\",
+        on_bad_lines="skip",
+    ).fillna("")
+    df["course_desc"] = (
+        df["Title"].astype(str)
+        + "; "
+        + df["Category"].astype(str)
+        + "; "
+        + df["Sub-Category"].astype(str)
+        + "; "
+        + df["Short Intro"].astype(str)
+        + "; "
+        + df["Skills"].astype(str)
+    )
+    df = df[["Title", "url", "course_desc", "Skills"]]
+    return df.drop_duplicates(subset=["url"])
+
+
+def write_repeated_csv(csv_path: str, repeat: int, output_path: Path) -> int:
+    """
+    Write a larger catalogue by repeating the rows of a CSV.
+
+    Args:
+        csv_path: Path to the courses CSV file
+        repeat: Number of copies of each row; copies get distinct urls
+        output_path: CSV file to write
+
+    Returns:
+        Number of rows written
+    """
+    rows = 0
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SOURCE_COLUMNS, escapechar="\\")
+        writer.writeheader()
+        for copy in range(repeat):
+            for chunk in pd.read_csv(
+                csv_path,
+                usecols=SOURCE_COLUMNS,
+                dtype=str,
+                encoding="utf-8",
+                quotechar='"',
+                escapechar="\\",
+                on_bad_lines="skip",
+                chunksize=CATALOG_CHUNK_ROWS,
+            ):
+                chunk = chunk.fillna("")
+                if copy:
+                    chunk["url"] = chunk["url"] + f"#copy{copy}"
+                writer.writerows(chunk.to_dict("records"))
+                rows += len(chunk)
+    return rows
+
+
+def run_method(method: str, csv_path: str, chunk_rows: int) -> dict:
+    """
+    Load the catalogue once with a method and measure it.
+
+    Args:
+        method: One of `METHODS`
+        csv_path: Path to the courses CSV file
+        chunk_rows: Rows per chunk for `stream`
+
+    Returns:
+        Courses loaded, seconds and peak RSS in MB
+    """
+    rss_before = process_memory()["rss"] or 0
+    start = time.perf_counter()
+    if method == "eager":
+        courses = len(load_eager(csv_path))
+    elif method == "stream":
+        courses = ingest_courses(csv_path, chunk_rows=chunk_rows)["courses"]
+    else:
+        courses = len(load_catalog(csv_path))
+    seconds = time.perf_counter() - start
+    peak_rss = process_memory()["peak_rss"] or 0
+    return {
+        "courses": courses,
+        "seconds": round(seconds, 3),
+        "peak_rss_mb": round(peak_rss / MB, 1),
+        "peak_rss_over_baseline_mb": round((peak_rss - rss_before) / MB, 1),
+    }
+
+
+def measure_method(method: str, csv_path: str, chunk_rows: int) -> dict:
+    """
+    Run `run_method` in a fresh process.
+
+    Args:
+        method: One of `METHODS`
+        csv_path: Path to the courses CSV file
+        chunk_rows: Rows per chunk for `stream`
+
+    Returns:
+        The measurements of `run_method`
+    """
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "app.ingest_courses",
+            "--file_path",
+            csv_path,
+            "--chunk_rows",
+            str(chunk_rows),
+            "--measure",
+            method,
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    """
+    Main function to run the script.
+    """
+    parser = argparse.ArgumentParser(
+        description="Ingest the courses CSV into the catalogue cache."
+    )
+    parser.add_argument(
+        "--file_path",
+        type=str,
+        default=COURSES_DATASET_PATH,
+        help="Path to the CSV file containing course data",
+    )
+    parser.add_argument(
+        "--chunk_rows",
+        type=int,
+        default=CATALOG_CHUNK_ROWS,
+        help="Rows read per chunk",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=0,
+        help="Also report on a catalogue of this many copies of the CSV",
+    )
+    parser.add_argument(
+        "--skip_report",
+        action="store_true",
+        help="Only ingest the CSV",
+    )
+    parser.add_argument("--measure", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(run_method(args.measure, args.file_path, args.chunk_rows)))
+        return 0
+
+    if not os.path.exists(args.file_path):
+        print(f"Error: File '{args.file_path}' does not exist.")
+        return 1
+
+    stats = ingest_courses(args.file_path, chunk_rows=args.chunk_rows)
+    print(
+        f"Ingested {stats['courses']} courses from {stats['rows']} rows "
+        f"into {catalog_cache_path(args.file_path)}"
+    )
+    if args.skip_report:
+        return 0
+
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        catalogues = {"dataset": args.file_path}
+        if args.repeat > 1:
+            repeated_path = Path(tmp_dir) / f"courses_x{args.repeat}.csv"
+            rows = write_repeated_csv(args.file_path, args.repeat, repeated_path)
+            print(f"Wrote {rows} rows to {repeated_path}")
+            catalogues[f"x{args.repeat}"] = str(repeated_path)
+
+        for name, csv_path in catalogues.items():
+            report[name] = {
+                "csv_mb": round(os.path.getsize(csv_path) / MB, 1),
+                **{
+                    method: measure_method(method, csv_path, args.chunk_rows)
+                    for method in METHODS
+                },
+            }
+        # The repeated catalogue's cache lives in CATALOG_CACHE_DIR
+        for name, csv_path in catalogues.items():
+            if csv_path != args.file_path:
+                catalog_cache_path(csv_path).unlink(missing_ok=True)
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,514 @@
+#!/usr/bin/env python
+"""
+Script to load test the API end to end against fake Pinecone and Cohere servers.
+
+Starts `app.fake_upstreams` and the API server (`app.serve`) on local ports,
+then sends `/recommend-courses` requests at a fixed arrival rate, whether or
+not earlier requests have finished (open-loop load). Latency is measured from
+each request's scheduled send time, so a saturated server shows up as growing
+latency instead of a lower send rate.
+
+Requests replay the benchmark corpus. A share of them (the hit ratio) repeats
+an earlier input; the others are fresh variants that combine a random job
+description with a random subset of a resume's lines.
+
+The report (JSON) has the throughput, latency percentiles, error rate and the
+CPU and memory use of every server process. Pass a previous report as
+`--baseline` to print the change of each headline number between builds.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.core.config import API_V1_STR, BENCHMARK_CORPUS_PATH
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Report numbers compared with --baseline (True: higher is better)
+HEADLINE_METRICS = {
+    "throughput_rps": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "error_rate": False,
+}
+
+
+class RequestMix:
+    """Generates request bodies with a target share of repeated inputs."""
+
+    def __init__(self, corpus: List[dict], hit_ratio: float, seed: int):
+        self.corpus = corpus
+        self.hit_ratio = hit_ratio
+        self.rng = random.Random(seed)
+        self.sent: List[dict] = []
+
+    def fresh(self) -> dict:
+        """Build an input that has not been sent before (with high probability)."""
+        resume = self.rng.choice(self.corpus)["resume_text"]
+        lines = resume.splitlines()
+        kept = [line for line in lines if self.rng.random() < 0.75] or lines
+        return {
+            "resume_text": "\n".join(kept),
+            "job_description_text": self.rng.choice(self.corpus)[
+                "job_description_text"
+            ],
+        }
+
+    def next(self) -> dict:
+        """Return the next request body."""
+        if self.sent and self.rng.random() < self.hit_ratio:
+            return self.rng.choice(self.sent)
+        body = self.fresh()
+        self.sent.append(body)
+        return body
+
+
+class ProcessSampler:
+    """Samples the CPU time and resident memory of a process tree from /proc."""
+
+    def __init__(self, root_pid: int, interval: float = 1.0):
+        self.root_pid = root_pid
+        self.interval = interval
+        self.samples: Dict[int, List[tuple]] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _tree(self) -> List[int]:
+        """List the root process and all of its descendants."""
+        children: Dict[int, List[int]] = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+        pids, stack = [], [self.root_pid]
+        while stack:
+            pid = stack.pop()
+            pids.append(pid)
+            stack.extend(children.get(pid, []))
+        return pids
+
+    @staticmethod
+    def _read(pid: int) -> Optional[tuple]:
+        """Read the (CPU seconds, RSS bytes) of a process."""
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{pid}/statm") as f:
+                rss_pages = int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            return None
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+        return cpu_seconds, rss_pages * PAGE_SIZE
+
+    def sample(self) -> None:
+        """Record one sample of every process in the tree."""
+        now = time.monotonic()
+        for pid in self._tree():
+            reading = self._read(pid)
+            if reading is not None:
+                self.samples.setdefault(pid, []).append((now, *reading))
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+    def report(self) -> List[dict]:
+        """
+        Summarize the samples per process.
+
+        Returns:
+            One entry per process with its mean CPU use (percent of one core)
+            and mean and peak RSS in MB
+        """
+        processes = []
+        for pid, samples in sorted(self.samples.items()):
+            if len(samples) < 2:
+                continue
+            (t0, cpu0, _), (t1, cpu1, _) = samples[0], samples[-1]
+            rss = [s[2] / 2**20 for s in samples]
+            processes.append(
+                {
+                    "pid": pid,
+                    "role": "master" if pid == self.root_pid else "worker",
+                    "cpu_percent": round(100 * (cpu1 - cpu0) / max(t1 - t0, 1e-9), 1),
+                    "rss_mean_mb": round(statistics.mean(rss), 1),
+                    "rss_peak_mb": round(max(rss), 1),
+                }
+            )
+        return processes
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """
+    Get a percentile of a list of values (nearest rank).
+
+    Args:
+        values: The values
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile, or None for an empty list
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+async def run_load(
+    url: str,
+    mix: RequestMix,
+    rps: float,
+    duration: float,
+    poisson: bool,
+    timeout: float,
+    request_fields: dict,
+) -> List[dict]:
+    """
+    Send requests at a fixed arrival rate for a duration.
+
+    Args:
+        url: Full URL of the recommendation endpoint
+        mix: Source of request bodies
+        rps: Target arrival rate (requests per second)
+        duration: Seconds to send for
+        poisson: Whether arrivals are exponentially spaced instead of evenly
+        timeout: Per-request timeout in seconds
+        request_fields: Extra fields of every request (threshold, mode, ...)
+
+    Returns:
+        One result per request with its latency, status and error
+    """
+    results: List[dict] = []
+    rng = random.Random(0)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+
+        async def send(body: dict, scheduled: float) -> None:
+            result = {"status": None, "error": None}
+            try:
+                response = await client.post(url, json={**body, **request_fields})
+                result["status"] = response.status_code
+                if response.status_code >= 400:
+                    result["error"] = f"HTTP {response.status_code}"
+            except httpx.HTTPError as e:
+                result["error"] = type(e).__name__
+            result["latency_ms"] = (time.perf_counter() - scheduled) * 1000
+            results.append(result)
+
+        tasks = []
+        start = time.perf_counter()
+        offset = 0.0
+        while offset < duration:
+            scheduled = start + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(mix.next(), scheduled)))
+            offset += rng.expovariate(rps) if poisson else 1 / rps
+        await asyncio.gather(*tasks)
+
+    return results
+
+
+def summarize(results: List[dict], duration: float) -> dict:
+    """
+    Compute the headline numbers of a run.
+
+    Args:
+        results: Per-request results from `run_load`
+        duration: Length of the send window in seconds
+
+    Returns:
+        Throughput, latency percentiles and error statistics
+    """
+    ok = [r["latency_ms"] for r in results if r["error"] is None]
+    errors: Dict[str, int] = {}
+    for r in results:
+        if r["error"] is not None:
+            errors[r["error"]] = errors.get(r["error"], 0) + 1
+    span = max(duration, max((r["latency_ms"] for r in results), default=0) / 1000)
+    return {
+        "requests": len(results),
+        "succeeded": len(ok),
+        "throughput_rps": round(len(ok) / span, 2) if results else 0.0,
+        "p50_ms": percentile(ok, 50),
+        "p95_ms": percentile(ok, 95),
+        "p99_ms": percentile(ok, 99),
+        "max_ms": max(ok, default=None),
+        "error_rate": round(1 - len(ok) / len(results), 4) if results else 0.0,
+        "errors": errors,
+    }
+
+
+def compare(report: dict, baseline: dict) -> dict:
+    """
+    Compare the headline numbers of a report with a baseline report.
+
+    Args:
+        report: Report of this run
+        baseline: Report of an earlier run
+
+    Returns:
+        For each headline metric, both values, the relative change and
+        whether the change is an improvement
+    """
+    comparison = {}
+    for metric, higher_is_better in HEADLINE_METRICS.items():
+        new, old = report["results"].get(metric), baseline["results"].get(metric)
+        if new is None or old is None:
+            continue
+        change = (new - old) / old if old else None
+        comparison[metric] = {
+            "baseline": old,
+            "current": new,
+            "change": round(change, 4) if change is not None else None,
+            "improved": (new > old) == higher_is_better if new != old else None,
+        }
+    return comparison
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float) -> None:
+    """
+    Wait for a server to answer a health check.
+
+    Args:
+        url: Health check URL
+        process: The server process
+        timeout: Seconds to wait
+
+    Raises:
+        RuntimeError: If the server exits or does not become ready in time
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(url, timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"{url} not ready after {timeout}s")
+
+
+def main():
+    """
+    Main function to run the script.
+    """
+    parser = argparse.ArgumentParser(
+        description="Load test the API against fake Pinecone and Cohere servers."
+    )
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        default=BENCHMARK_CORPUS_PATH,
+        help="Path to a JSON lines file of resume/job description pairs",
+    )
+    parser.add_argument("--rps", type=float, default=2.0, help="Target arrival rate")
+    parser.add_argument(
+        "--duration", type=float, default=60, help="Seconds of measured load"
+    )
+    parser.add_argument(
+        "--warmup", type=float, default=10, help="Seconds of unmeasured load first"
+    )
+    parser.add_argument(
+        "--hit_ratio",
+        type=float,
+        default=0.3,
+        help="Share of requests repeating an earlier input",
+    )
+    parser.add_argument(
+        "--poisson", action="store_true", help="Use exponentially spaced arrivals"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.5, help="Similarity threshold"
+    )
+    parser.add_argument(
+        "--mode",
+        type=str,
+        default="auto",
+        choices=["auto", "llm", "deterministic"],
+        help="Recommendation mode",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=0, help="API worker processes (0: auto)"
+    )
+    parser.add_argument("--port", type=int, default=8200, help="API server port")
+    parser.add_argument(
+        "--upstream_port", type=int, default=8100, help="Fake upstream server port"
+    )
+    parser.add_argument(
+        "--pinecone_latency_ms", type=float, default=30, help="Fake query latency"
+    )
+    parser.add_argument(
+        "--pinecone_error_rate", type=float, default=0.0, help="Share of failed queries"
+    )
+    parser.add_argument(
+        "--cohere_ttft_ms", type=float, default=800, help="Fake time to first token"
+    )
+    parser.add_argument(
+        "--cohere_token_ms", type=float, default=20, help="Fake delay between chunks"
+    )
+    parser.add_argument(
+        "--cohere_error_rate", type=float, default=0.0, help="Share of failed chats"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=120, help="Per-request timeout in seconds"
+    )
+    parser.add_argument(
+        "--startup_timeout",
+        type=float,
+        default=300,
+        help="Seconds to wait for the API server to become ready",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--output", type=str, help="Path to write the JSON report")
+    parser.add_argument("--baseline", type=str, help="Report of an earlier run")
+    args = parser.parse_args()
+
+    # Read directly: app.benchmark_context would load the models in this process
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = [json.loads(line) for line in f if line.strip()]
+    upstream = f"http://127.0.0.1:{args.upstream_port}"
+    api = f"http://127.0.0.1:{args.port}"
+
+    with tempfile.TemporaryDirectory(prefix="skillbridge-loadtest-") as workdir:
+        # A fresh cache per run, so the hit ratio is the only source of hits
+        env = {
+            **os.environ,
+            "PINECONE_API_KEY": "loadtest",
+            "PINECONE_HOST": upstream,
+            "COHERE_API_KEY": "loadtest",
+            "COHERE_BASE_URL": upstream,
+            "CACHE_BACKEND": "disk",
+            "CACHE_DIR": os.path.join(workdir, "cache"),
+            "CACHE_SNAPSHOT_PATH": "",
+            "JOB_DB_PATH": os.path.join(workdir, "jobs.db"),
+        }
+        upstream_process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "app.fake_upstreams",
+                f"--port={args.upstream_port}",
+                f"--pinecone_latency_ms={args.pinecone_latency_ms}",
+                f"--pinecone_error_rate={args.pinecone_error_rate}",
+                f"--cohere_ttft_ms={args.cohere_ttft_ms}",
+                f"--cohere_token_ms={args.cohere_token_ms}",
+                f"--cohere_error_rate={args.cohere_error_rate}",
+            ],
+            env=env,
+        )
+        api_process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "app.serve",
+                "--host=127.0.0.1",
+                f"--port={args.port}",
+                f"--workers={args.workers}",
+            ],
+            env=env,
+        )
+        try:
+            wait_until_ready(f"{upstream}/stats", upstream_process, 60)
+            wait_until_ready(f"{api}/readyz", api_process, args.startup_timeout)
+
+            url = f"{api}{API_V1_STR}/recommend-courses"
+            fields = {"threshold": args.threshold, "mode": args.mode}
+            mix = RequestMix(corpus, args.hit_ratio, args.seed)
+            if args.warmup > 0:
+                print(f"Warming up for {args.warmup}s at {args.rps} rps...")
+                asyncio.run(
+                    run_load(
+                        url,
+                        mix,
+                        args.rps,
+                        args.warmup,
+                        args.poisson,
+                        args.timeout,
+                        fields,
+                    )
+                )
+
+            print(f"Measuring for {args.duration}s at {args.rps} rps...")
+            sampler = ProcessSampler(api_process.pid)
+            sampler.start()
+            results = asyncio.run(
+                run_load(
+                    url,
+                    mix,
+                    args.rps,
+                    args.duration,
+                    args.poisson,
+                    args.timeout,
+                    fields,
+                )
+            )
+            sampler.stop()
+            upstream_stats = httpx.get(f"{upstream}/stats", timeout=5).json()
+        finally:
+            for process in (api_process, upstream_process):
+                process.terminate()
+                try:
+                    process.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("output", "baseline")
+        },
+        "results": summarize(results, args.duration),
+        "processes": sampler.report(),
+        "upstream": upstream_stats,
+    }
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["comparison"] = compare(report, json.load(f))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    return 0 if report["results"]["succeeded"] else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -2,17 +2,65 @@
 Main entrypoint for the API.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+
+from .core.config import (
+    ALLOWED_ORIGINS,
+    API_V1_STR,
+    CACHE_SNAPSHOT_PATH,
+    CPU_TUNING_ENABLED,
+    GZIP_MINIMUM_SIZE,
+    JOB_WORKERS,
+    MEMORY_TRACEMALLOC_FRAMES,
+    PORT,
+    PROJECT_NAME,
+    SKILL_VOCABULARY_WARM_UP,
+)
+from .utils.cpu_tuning import tune_process
+
+# Size the thread pools before the routes import NumPy, torch and spaCy
+if CPU_TUNING_ENABLED:
+    tune_process()
+
+from .api.routes import router  # noqa: E402
+from .services.job_service import JobService  # noqa: E402
+from .services.memory_service import MemoryService  # noqa: E402
+from .services.skill_vocabulary_service import SkillVocabularyService  # noqa: E402
+from .services.snapshot_service import SnapshotService  # noqa: E402
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm the cache from a snapshot of the previous deploy, if one is set, build
+    the skill vocabulary, and run the job workers while the app is up.
+    """
+    if MEMORY_TRACEMALLOC_FRAMES > 0:
+        MemoryService.start_tracing(MEMORY_TRACEMALLOC_FRAMES)
+    MemoryService.log_report()
+    if CACHE_SNAPSHOT_PATH:
+        SnapshotService.import_in_background(CACHE_SNAPSHOT_PATH)
+    if SKILL_VOCABULARY_WARM_UP:
+        # After the snapshot import, which may bring the embeddings along
+        SkillVocabularyService.warm_up_in_background(SnapshotService.wait_ready)
+    if JOB_WORKERS > 0:
+        JobService.start(JOB_WORKERS)
+    yield
+    JobService.stop()
 
-from .api.routes import router
-from .core.config import ALLOWED_ORIGINS, API_V1_STR, PORT, PROJECT_NAME
 
 # Create FastAPI application
 app = FastAPI(
     title=PROJECT_NAME,
     description="API for custom-trained spaCy NER models",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -24,6 +72,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
 # Include API routes
 app.include_router(router, prefix=API_V1_STR)
 
@@ -59,6 +110,8 @@ async def readiness_check():
 
     Currently checks:
     - Application is running
+    - The cache snapshot import (if any) has finished
+    - The skill vocabulary warm-up (if any) has finished
 
     Future enhancements could include:
     - Database connections are established
@@ -72,6 +125,15 @@ async def readiness_check():
     # - Cache availability
     # - etc.
 
+    if not SnapshotService.is_ready():
+        return ORJSONResponse(
+            status_code=503, content={"status": "importing cache snapshot"}
+        )
+    if not SkillVocabularyService.is_ready():
+        return ORJSONResponse(
+            status_code=503, content={"status": "building skill vocabulary"}
+        )
+
     # For now, we just return success, but this can be expanded
     # to include relevant health checks as the application grows
     return {"status": "ready"}
@@ -0,0 +1,24 @@
+"""
+Compact internal records for the Skill Bridge pipeline.
+
+These are used between services; pydantic schemas are only used at the API
+boundary.
+"""
+
+from typing import NamedTuple, Optional
+
+
+class EntityRecord(NamedTuple):
+    """A named entity found in a text."""
+
+    text: str
+    label: str
+
+
+class MatchRecord(NamedTuple):
+    """Best resume match for a single job skill."""
+
+    job_skill: str
+    best_match: Optional[str]
+    similarity: float
+    is_match: bool
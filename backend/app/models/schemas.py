@@ -2,16 +2,11 @@
 Schemas for the Skill Bridge application.
 """
 
-from typing import List, Optional
+from typing import Annotated, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
-
-class Entity(BaseModel):
-    """Schema for a named entity."""
-
-    text: str = Field(..., description="The entity text")
-    label: str = Field(..., description="The entity label")
+from ..core.config import JD_PREWARM_MAX_ITEMS, MAX_REQUEST_CHARS
 
 
 class MatchDetail(BaseModel):
@@ -29,6 +24,15 @@ class MatchDetail(BaseModel):
 
 # Course recommendation schemas
 
+# Response fields a caller may ask to omit
+ExcludableField = Literal[
+    "recommendations_text",
+    "course_descriptions",
+    "matching_details",
+    "job_skills",
+    "user_skills",
+]
+
 
 class CourseRecommendation(BaseModel):
     """Schema for a course recommendation."""
@@ -36,24 +40,61 @@ class CourseRecommendation(BaseModel):
     course_name: str = Field(..., description="The name of the recommended course")
     url: str = Field(..., description="URL to access the course")
     description: str = Field("", description="Brief description of the course")
-    potential_score: float = Field(
-        0.0, description="Potential job match score if this course is completed"
+    potential_score: Optional[float] = Field(
+        0.0,
+        description=(
+            "Potential job match score if this course is completed (null when "
+            "course scoring was skipped to meet the request deadline)"
+        ),
     )
-    score_improvement: float = Field(
+    score_improvement: Optional[float] = Field(
         0.0, description="Score improvement over current skills"
     )
 
 
+class InputTruncation(BaseModel):
+    """Schema describing how much of a long input text was processed."""
+
+    chars: int = Field(..., description="Characters in the submitted text")
+    processed_chars: int = Field(..., description="Characters actually processed")
+    chunks: int = Field(..., description="Number of chunks processed")
+    truncated: bool = Field(
+        ..., description="Whether part of the text was dropped by the size caps"
+    )
+    skill_limit_reached: bool = Field(
+        False, description="Whether the number of extracted skills was capped"
+    )
+
+
 class CourseRecommendationRequest(BaseModel):
     """Request schema for generating course recommendations based on skill gap."""
 
-    resume_text: str = Field(..., description="The resume text to analyze")
+    resume_text: str = Field(
+        ..., max_length=MAX_REQUEST_CHARS, description="The resume text to analyze"
+    )
     job_description_text: str = Field(
-        ..., description="The job description text to analyze"
+        ...,
+        max_length=MAX_REQUEST_CHARS,
+        description="The job description text to analyze",
     )
     threshold: float = Field(
         0.5, description="Similarity threshold for considering skills as a match"
     )
+    mode: Literal["auto", "llm", "deterministic"] = Field(
+        "auto",
+        description=(
+            "How to select courses: 'llm' asks the LLM, 'deterministic' picks the "
+            "courses covering most of the skill gap without an LLM, 'auto' uses the "
+            "LLM and falls back to deterministic selection if it is unavailable"
+        ),
+    )
+    exclude_fields: List[ExcludableField] = Field(
+        default_factory=list,
+        description=(
+            "Response fields to omit; 'course_descriptions' drops the description "
+            "of each recommended course"
+        ),
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -61,6 +102,7 @@ class CourseRecommendationRequest(BaseModel):
                 "resume_text": "PROFESSIONAL SUMMARY\nExperienced software engineer with 7 years of experience developing web applications using React, TypeScript, and Node.js. Strong background in cloud architecture with AWS. Proven ability to design scalable solutions and mentor junior developers.\n\nSKILLS\nProgramming Languages: JavaScript, TypeScript, Python\nFrontend: React, Redux, HTML5, CSS3, SASS\nBackend: Node.js, Express, NestJS\nDatabases: MongoDB, PostgreSQL, MySQL\nCloud: AWS (EC2, S3, Lambda), Docker, Kubernetes\nTools: Git, JIRA, CI/CD pipelines\n\nEXPERIENCE\nSenior Software Engineer at TechCorp\nLed development of a customer-facing portal using React and TypeScript\nImplemented serverless architecture using AWS Lambda and API Gateway\nReduced page load time by 40% through code optimization\n",
                 "job_description_text": "We are looking for a Software Engineer with 5+ years of experience in React, Node.js, and TypeScript. The ideal candidate should have strong problem-solving skills and experience with AWS, Docker, and CI/CD pipelines. Knowledge of Python and machine learning frameworks like TensorFlow or PyTorch is a plus. Must be located in San Francisco or willing to relocate.",
                 "threshold": 0.5,
+                "mode": "auto",
             }
         }
     }
@@ -88,7 +130,102 @@ class CourseRecommendationResponse(BaseModel):
     recommendations_text: Optional[str] = Field(
         None, description="Full text of the recommendations generated by the LLM"
     )
+    recommendation_mode: str = Field(
+        "llm",
+        description="How the courses were selected ('llm' or 'deterministic')",
+    )
+    score: float = Field(0.0, description="Job match score of the resume")
+    matched_skills: List[str] = Field(
+        default_factory=list,
+        description="Job skills matched by the resume at the threshold",
+    )
+    missing_skills: List[str] = Field(
+        default_factory=list,
+        description="Job skills not matched by the resume at the threshold",
+    )
     matching_details: List[MatchDetail] = Field(
         default_factory=list,
         description="Detailed matching information for each job skill",
     )
+    analysis_id: Optional[str] = Field(
+        None,
+        description="Short-lived id for re-scoring this analysis at another threshold",
+    )
+    truncation: Optional[Dict[str, InputTruncation]] = Field(
+        None,
+        description=(
+            "Present when an input hit a size cap, keyed by 'resume' or "
+            "'job_description'"
+        ),
+    )
+    degradations: List[str] = Field(
+        default_factory=list,
+        description=(
+            "Degradations applied to meet the request deadline, in order: "
+            "'skip_course_scoring', 'retrieval_only', 'fewer_ner_models'"
+        ),
+    )
+
+
+class RethresholdRequest(BaseModel):
+    """Request schema for re-scoring a stored analysis at another threshold."""
+
+    threshold: float = Field(
+        ..., description="Similarity threshold for considering skills as a match"
+    )
+    exclude_fields: List[ExcludableField] = Field(
+        default_factory=list, description="Response fields to omit"
+    )
+
+
+# Job schemas
+
+
+class JobSubmitResponse(BaseModel):
+    """Response schema for a submitted recommendation job."""
+
+    job_id: str = Field(..., description="Id to poll the job with")
+    status: str = Field(..., description="Current status of the job")
+    deduplicated: bool = Field(
+        False,
+        description="Whether an identical queued or running job was reused",
+    )
+
+
+class JobStatusResponse(BaseModel):
+    """Response schema for the state of a recommendation job."""
+
+    job_id: str = Field(..., description="The job id")
+    status: Literal["queued", "running", "succeeded", "failed"] = Field(
+        ..., description="Current status of the job"
+    )
+    stage: Optional[str] = Field(
+        None, description="Pipeline stage the job is running, while running"
+    )
+    attempts: int = Field(0, description="Number of times the job was started")
+    timings: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Milliseconds spent in each finished stage, plus 'total'",
+    )
+    error: Optional[str] = Field(
+        None, description="Error of the last failed attempt, if any"
+    )
+    result: Optional[CourseRecommendationResponse] = Field(
+        None, description="The recommendations, once the job succeeded"
+    )
+
+
+# Admin schemas
+
+
+class JobArtifactPrewarmRequest(BaseModel):
+    """Request schema for precomputing job description artifacts."""
+
+    job_descriptions: List[Annotated[str, Field(max_length=MAX_REQUEST_CHARS)]] = (
+        Field(
+            ...,
+            min_length=1,
+            max_length=JD_PREWARM_MAX_ITEMS,
+            description="Job description texts to precompute",
+        )
+    )
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+Script to run the API server with workers and threads sized to the CPU quota.
+"""
+
+import argparse
+
+import uvicorn
+
+from app.core.config import PORT
+from app.utils.cpu_tuning import resolve_settings, set_thread_env
+
+
+def main():
+    """
+    Main function to run the script.
+    """
+    parser = argparse.ArgumentParser(
+        description="Run the API server sized to the available cores."
+    )
+    parser.add_argument("--host", type=str, default="0.0.0.0", help="Bind address")
+    parser.add_argument("--port", type=int, default=PORT, help="Port to listen on")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Number of worker processes (default: calibrated or derived from cores)",
+    )
+    args = parser.parse_args()
+
+    settings = resolve_settings()
+    workers = args.workers or settings["workers"]
+
+    # Workers inherit the thread limits through the environment and apply
+    # them to torch themselves (see `app.main`), so torch is not loaded here
+    set_thread_env(settings["threads"])
+    print(
+        f"Serving with {workers} workers x {settings['threads']} threads "
+        f"on {settings['cpus']} cores ({settings['source']})"
+    )
+
+    uvicorn.run("app.main:app", host=args.host, port=args.port, workers=workers)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
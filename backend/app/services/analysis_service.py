@@ -0,0 +1,222 @@
+"""
+Service for storing analyses so they can be re-scored at another threshold.
+
+The job x resume similarity matrix and the per-course best similarities do not
+depend on the threshold. Keeping them under a short-lived analysis id lets a
+threshold change be answered without NER, retrieval or the LLM. The only model
+work left is for resume pairs the word-vector cascade decided: those near the
+new threshold are re-scored with the transformer (see
+`SimilarityService.rescore_pairs`).
+"""
+
+import uuid
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..core.config import ANALYSIS_TTL_HOURS
+from ..utils.request_context import RequestContext
+from .cache_service import CacheService
+from .similarity_service import SimilarityService
+
+
+class AnalysisService:
+    """Service for storing analyses so they can be re-scored at another threshold."""
+
+    @staticmethod
+    def _key(analysis_id: str) -> str:
+        """Create the cache key of an analysis."""
+        return f"analysis:{analysis_id}"
+
+    @staticmethod
+    def course_best_similarities(
+        skill_comparison: Dict[str, Any],
+        course_skills: List[str],
+        known_embeddings: Optional[Dict[str, np.ndarray]] = None,
+        request_context: Optional[RequestContext] = None,
+    ) -> np.ndarray:
+        """
+        Compute the best similarity per job skill over the skills a course adds.
+
+        The enhanced skill set is the user skills plus the course skills, so
+        only the course skills the user lacks need to be compared against the
+        job skills; `potential_vector` combines them with the user's.
+
+        Args:
+            skill_comparison: Result of `SimilarityService.semantic_matching_score`
+            course_skills: Skills extracted from the course
+            known_embeddings: Precomputed embeddings by skill text
+            request_context: Request context memoizing the encoded skills, so skills
+                shared by several courses are encoded once
+
+        Returns:
+            Best similarity per job skill, in `job_skills_order` (zeros if the
+            course adds no skill)
+        """
+        job_skills = skill_comparison["job_skills_order"]
+        new_skills = [
+            s for s in course_skills if s not in skill_comparison["user_skills_order"]
+        ]
+        if not job_skills or not new_skills:
+            return np.zeros(len(job_skills), dtype=np.float32)
+
+        # No threshold, so no cascade: the vectors are compared with any
+        # threshold without re-scoring
+        matrix = SimilarityService.similarity_matrix(
+            job_skills, new_skills, known_embeddings, request_context=request_context
+        )
+        return np.maximum(matrix.max(axis=1), 0.0)
+
+    @staticmethod
+    def potential_vector(
+        similarity_matrix: np.ndarray, course_vector: np.ndarray
+    ) -> np.ndarray:
+        """
+        Compute the best similarity per job skill once a course is completed.
+
+        Args:
+            similarity_matrix: Job x user similarity matrix
+            course_vector: Result of `course_best_similarities`
+
+        Returns:
+            Best similarity per job skill with the user and course skills
+        """
+        if similarity_matrix.size == 0:
+            return np.asarray(course_vector)
+        return np.maximum(similarity_matrix.max(axis=1), course_vector)
+
+    @staticmethod
+    def score_vector(best_similarities: np.ndarray, threshold: float) -> float:
+        """
+        Compute the match score for a vector of best similarities.
+
+        Args:
+            best_similarities: Best similarity per job skill
+            threshold: Cosine similarity threshold to consider a match
+
+        Returns:
+            Match score as a percentage
+        """
+        if len(best_similarities) == 0:
+            return 0.0
+        match_ratio = float(np.count_nonzero(best_similarities >= threshold)) / len(
+            best_similarities
+        )
+        return round(match_ratio * 100, 2)
+
+    @staticmethod
+    def build(
+        skill_comparison: Dict[str, Any],
+        course_vectors: List[np.ndarray],
+        response_data: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Collect the threshold-independent data of an analysis.
+
+        Args:
+            skill_comparison: Result of `SimilarityService.semantic_matching_score`
+            course_vectors: Result of `course_best_similarities` for each
+                recommended course
+            response_data: Response data of the analysis, without its id
+
+        Returns:
+            Analysis data to pass to `store`
+        """
+        return {
+            "job_skills": skill_comparison["job_skills_order"],
+            "user_skills": skill_comparison["user_skills_order"],
+            "similarity_matrix": skill_comparison["similarity_matrix"],
+            "word_vector_pairs": skill_comparison["word_vector_pairs"],
+            "course_best_similarities": course_vectors,
+            "response_data": response_data,
+        }
+
+    @classmethod
+    def store(cls, analysis: Dict[str, Any]) -> Optional[str]:
+        """
+        Store an analysis under a new id.
+
+        Args:
+            analysis: Result of `build`
+
+        Returns:
+            The analysis id, or None if it could not be stored
+        """
+        analysis_id = uuid.uuid4().hex
+        stored = CacheService.set_value(
+            cls._key(analysis_id), analysis, expire_hours=ANALYSIS_TTL_HOURS
+        )
+        return analysis_id if stored else None
+
+    @classmethod
+    def rethreshold(cls, analysis_id: str, threshold: float) -> Optional[Dict]:
+        """
+        Re-score a stored analysis at a different threshold.
+
+        Args:
+            analysis_id: Id returned by `store`
+            threshold: The new similarity threshold
+
+        Returns:
+            Response data with recomputed score, matched/missing skills,
+            matching details and course potential scores, or None if the
+            analysis is unknown or expired
+        """
+        analysis = CacheService.get_value(cls._key(analysis_id))
+        if analysis is None:
+            return None
+
+        # Word-vector decisions near the new threshold get transformer
+        # similarities, kept for the next re-scoring
+        word_vector_pairs = analysis.get("word_vector_pairs")
+        if word_vector_pairs is not None and word_vector_pairs.any():
+            rescored = SimilarityService.rescore_pairs(
+                analysis["job_skills"],
+                analysis["user_skills"],
+                analysis["similarity_matrix"],
+                word_vector_pairs,
+                threshold,
+            )
+            if rescored:
+                CacheService.set_value(
+                    cls._key(analysis_id), analysis, expire_hours=ANALYSIS_TTL_HOURS
+                )
+
+        best_similarities, best_matches = SimilarityService.best_matches(
+            analysis["similarity_matrix"], analysis["user_skills"]
+        )
+        comparison = SimilarityService.score_from_similarities(
+            analysis["job_skills"], best_similarities, best_matches, threshold
+        )
+
+        courses = analysis["response_data"]["recommended_courses"]
+        # No vectors are stored when course scoring was skipped for the deadline
+        if analysis["course_best_similarities"]:
+            courses = []
+            for course, vector in zip(
+                analysis["response_data"]["recommended_courses"],
+                analysis["course_best_similarities"],
+            ):
+                potential_score = cls.score_vector(
+                    cls.potential_vector(analysis["similarity_matrix"], vector),
+                    threshold,
+                )
+                courses.append(
+                    {
+                        **course,
+                        "potential_score": potential_score,
+                        "score_improvement": max(
+                            0, potential_score - comparison["score"]
+                        ),
+                    }
+                )
+
+        return {
+            **analysis["response_data"],
+            "recommended_courses": courses,
+            "score": comparison["score"],
+            "matched_skills": comparison["matched_skills"],
+            "missing_skills": comparison["missing_skills"],
+            "matching_details": [m._asdict() for m in comparison["matching_details"]],
+            "analysis_id": analysis_id,
+        }
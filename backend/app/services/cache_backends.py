@@ -0,0 +1,343 @@
+"""
+Storage backends for `CacheService`.
+
+The disk backend keeps the cache in a local diskcache directory, shared by the
+worker processes of one replica. The Redis backend keeps it on a Redis server
+(or anything speaking the Redis protocol), shared by every replica.
+"""
+
+import pickle
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import diskcache as dc
+
+# SQLite's default page size, used by diskcache
+SQLITE_PAGE_SIZE = 4096
+
+
+class CacheBackend(ABC):
+    """Interface a cache storage backend has to implement."""
+
+    name = "abstract"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under a key, or None."""
+
+    @abstractmethod
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Return the values of several keys (None for missing ones), in order."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, expire_seconds: Optional[int]) -> None:
+        """Store a value that expires after `expire_seconds` (None: never)."""
+
+    @abstractmethod
+    def get_buckets(self, keys: List[str]) -> List[List[tuple]]:
+        """Return the entries of several buckets (empty for missing ones)."""
+
+    @abstractmethod
+    def add_to_bucket(
+        self, key: str, entry: tuple, max_size: int, expire_seconds: int
+    ) -> None:
+        """
+        Add an entry to a bucket, keeping only its `max_size` newest entries.
+
+        Adding an entry that is already in the bucket makes it the newest.
+        """
+
+    @abstractmethod
+    def incr(self, key: str) -> None:
+        """Increment a counter that never expires."""
+
+    @abstractmethod
+    def get_counters(self, keys: List[str]) -> List[int]:
+        """Return the values of several counters (0 for missing ones)."""
+
+    @abstractmethod
+    def record_access(self, key: str, hit: bool, expire_seconds: int) -> None:
+        """
+        Record that a key was written (`hit=False`) or read (`hit=True`).
+
+        Keeps the hit count and last access time of each key for ranking
+        entries by how hot they are.
+        """
+
+    @abstractmethod
+    def get_access(self, keys: List[str]) -> List[Tuple[int, float]]:
+        """Return the (hit count, last access time) of several keys."""
+
+    @abstractmethod
+    def ttl(self, key: str) -> Optional[int]:
+        """Return the seconds until a key expires, or None if it never does."""
+
+    @abstractmethod
+    def iter_keys(self, prefix: str = "") -> Iterator[str]:
+        """Iterate over the stored keys starting with a prefix."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Delete everything stored by this backend."""
+
+    @abstractmethod
+    def describe(self) -> Dict[str, Any]:
+        """Return backend-specific size statistics."""
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """Return what the backend holds in this process's memory, in bytes."""
+        return {}
+
+
+class DiskCacheBackend(CacheBackend):
+    """
+    Backend storing entries in a local diskcache directory.
+
+    Access records are buffered in memory and written in one transaction per
+    `access_flush_items` keys or `access_flush_seconds`, so reads do not each
+    pay for a write.
+    """
+
+    name = "disk"
+
+    access_flush_items = 256
+    access_flush_seconds = 5.0
+
+    def __init__(self, directory: str, size_limit: int):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self._cache = dc.Cache(
+            directory,
+            size_limit=size_limit,
+            eviction_policy="least-recently-used",
+        )
+        # Key -> (hits, last access time, expire seconds) not yet written
+        self._pending_access: Dict[str, Tuple[int, float, int]] = {}
+        self._access_lock = threading.Lock()
+        self._last_access_flush = time.monotonic()
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._cache.get(key)
+
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        return [self._cache.get(key) for key in keys]
+
+    def set(self, key: str, value: Any, expire_seconds: Optional[int]) -> None:
+        self._cache.set(key, value, expire=expire_seconds)
+
+    def get_buckets(self, keys: List[str]) -> List[List[tuple]]:
+        return [self._cache.get(key, []) for key in keys]
+
+    def add_to_bucket(
+        self, key: str, entry: tuple, max_size: int, expire_seconds: int
+    ) -> None:
+        with self._cache.transact():
+            bucket = [e for e in self._cache.get(key, []) if e != entry]
+            bucket.append(entry)
+            self._cache.set(key, bucket[-max_size:], expire=expire_seconds)
+
+    def incr(self, key: str) -> None:
+        self._cache.incr(key)
+
+    def get_counters(self, keys: List[str]) -> List[int]:
+        return [int(self._cache.get(key, 0)) for key in keys]
+
+    def record_access(self, key: str, hit: bool, expire_seconds: int) -> None:
+        with self._access_lock:
+            hits = self._pending_access.get(key, (0, 0.0, 0))[0] + int(hit)
+            self._pending_access[key] = (hits, time.time(), expire_seconds)
+            if (
+                len(self._pending_access) < self.access_flush_items
+                and time.monotonic() - self._last_access_flush
+                < self.access_flush_seconds
+            ):
+                return
+        self.flush_access()
+
+    def flush_access(self) -> None:
+        """Write the buffered access records."""
+        with self._access_lock:
+            pending, self._pending_access = self._pending_access, {}
+            self._last_access_flush = time.monotonic()
+        if not pending:
+            return
+        with self._cache.transact():
+            for key, (hits, last_access, expire_seconds) in pending.items():
+                access_key = f"access:{key}"
+                count, _ = self._cache.get(access_key, (0, 0.0))
+                self._cache.set(
+                    access_key, (count + hits, last_access), expire=expire_seconds
+                )
+
+    def get_access(self, keys: List[str]) -> List[Tuple[int, float]]:
+        self.flush_access()
+        return [self._cache.get(f"access:{key}", (0, 0.0)) for key in keys]
+
+    def ttl(self, key: str) -> Optional[int]:
+        _, expire_time = self._cache.get(key, expire_time=True)
+        return None if expire_time is None else int(expire_time - time.time())
+
+    def iter_keys(self, prefix: str = "") -> Iterator[str]:
+        return (key for key in self._cache if str(key).startswith(prefix))
+
+    def clear(self) -> None:
+        with self._access_lock:
+            self._pending_access.clear()
+        self._cache.clear()
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "cache_size": len(self._cache),
+            "disk_usage_bytes": self._cache.volume(),
+        }
+
+    def memory_usage(self) -> Dict[str, Any]:
+        # SQLite keeps a page cache per connection, and diskcache opens one
+        # connection per thread, so the worst case grows with the thread count
+        return {
+            "sqlite_page_cache_max_bytes_per_connection": (
+                self._cache.sqlite_cache_size * SQLITE_PAGE_SIZE
+            ),
+            "sqlite_mmap_max_bytes": self._cache.sqlite_mmap_size,
+        }
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend storing entries on a Redis server, shared by all replicas.
+
+    Values are pickled and stored with server-side TTLs. Buckets are sorted
+    sets ordered by insertion, and multi-key reads take a single round trip.
+
+    Entries live under `{key_prefix}data:` and counters and access records
+    under `{key_prefix}meta:`, so listing, counting and clearing the cache
+    only ever touch this app's keys.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        url: str = "",
+        max_connections: int = 20,
+        key_prefix: str = "",
+        client: Optional[Any] = None,
+    ):
+        """
+        Connect to Redis.
+
+        Args:
+            url: Redis URL, e.g. redis://localhost:6379/0
+            max_connections: Size of the connection pool
+            key_prefix: Prefix for every key, to share a server between apps
+            client: A ready client to use instead (e.g. fakeredis.FakeRedis())
+        """
+        if client is None:
+            import redis
+
+            pool = redis.ConnectionPool.from_url(url, max_connections=max_connections)
+            client = redis.Redis(connection_pool=pool)
+        self._client = client
+        self._prefix = f"{key_prefix}data:"
+        self._meta_prefix = f"{key_prefix}meta:"
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}{key}"
+
+    def _meta_key(self, key: str) -> str:
+        return f"{self._meta_prefix}{key}"
+
+    def _scan(self, match: str) -> Iterator[bytes]:
+        return self._client.scan_iter(match=match, count=1000)
+
+    @staticmethod
+    def _load(data: Optional[bytes]) -> Optional[Any]:
+        return pickle.loads(data) if data is not None else None
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._load(self._client.get(self._key(key)))
+
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        if not keys:
+            return []
+        values = self._client.mget([self._key(k) for k in keys])
+        return [self._load(data) for data in values]
+
+    def set(self, key: str, value: Any, expire_seconds: Optional[int]) -> None:
+        self._client.set(
+            self._key(key),
+            pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+            ex=None if expire_seconds is None else max(1, expire_seconds),
+        )
+
+    def get_buckets(self, keys: List[str]) -> List[List[tuple]]:
+        pipe = self._client.pipeline(transaction=False)
+        for key in keys:
+            pipe.zrange(self._key(key), 0, -1)
+        return [[pickle.loads(m) for m in members] for members in pipe.execute()]
+
+    def add_to_bucket(
+        self, key: str, entry: tuple, max_size: int, expire_seconds: int
+    ) -> None:
+        key = self._key(key)
+        # Scores are insertion times, so trimming drops the oldest entries.
+        # A fixed pickle protocol keeps equal entries byte-identical.
+        pipe = self._client.pipeline(transaction=True)
+        pipe.zadd(key, {pickle.dumps(entry, protocol=4): time.time()})
+        pipe.zremrangebyrank(key, 0, -max_size - 1)
+        pipe.expire(key, max(1, expire_seconds))
+        pipe.execute()
+
+    def incr(self, key: str) -> None:
+        self._client.incr(self._meta_key(key))
+
+    def get_counters(self, keys: List[str]) -> List[int]:
+        if not keys:
+            return []
+        values = self._client.mget([self._meta_key(k) for k in keys])
+        return [int(v or 0) for v in values]
+
+    def record_access(self, key: str, hit: bool, expire_seconds: int) -> None:
+        access_key = self._meta_key(f"access:{key}")
+        pipe = self._client.pipeline(transaction=False)
+        pipe.hincrby(access_key, "count", int(hit))
+        pipe.hset(access_key, "time", time.time())
+        pipe.expire(access_key, max(1, expire_seconds))
+        pipe.execute()
+
+    def get_access(self, keys: List[str]) -> List[Tuple[int, float]]:
+        pipe = self._client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hmget(self._meta_key(f"access:{key}"), "count", "time")
+        return [
+            (int(count or 0), float(last or 0.0)) for count, last in pipe.execute()
+        ]
+
+    def ttl(self, key: str) -> Optional[int]:
+        seconds = self._client.ttl(self._key(key))
+        return seconds if seconds >= 0 else None
+
+    def iter_keys(self, prefix: str = "") -> Iterator[str]:
+        start = len(self._prefix)
+        for key in self._scan(f"{self._prefix}{prefix}*"):
+            yield (key.decode() if isinstance(key, bytes) else key)[start:]
+
+    def clear(self) -> None:
+        # Never FLUSHDB: the database may be shared with other apps
+        for namespace in (self._prefix, self._meta_prefix):
+            keys = list(self._scan(f"{namespace}*"))
+            for start in range(0, len(keys), 1000):
+                self._client.delete(*keys[start : start + 1000])
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            # Scans this app's entries; DBSIZE would count the whole database
+            "cache_size": sum(1 for _ in self._scan(f"{self._prefix}*")),
+            "server_memory_usage_bytes": self._client.info("memory").get(
+                "used_memory"
+            ),
+        }
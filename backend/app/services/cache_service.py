@@ -1,50 +1,102 @@
 """
-Disk-based caching service for the Skill Bridge application.
+Caching service for the Skill Bridge application.
 
 This service provides caching functionality to store course recommendation results
-on disk to avoid recomputing expensive operations for identical inputs.
+on disk (or on a shared Redis server) to avoid recomputing expensive operations
+for identical inputs.
 """
 
 import hashlib
 import json
-from pathlib import Path
-from typing import Dict, Any, Optional
-import diskcache as dc
+import threading
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 
+from ..core.config import (
+    CACHE_BACKEND,
+    CACHE_DIR,
+    CACHE_KEY_PREFIX,
+    CACHE_SIZE_LIMIT,
+    NEAR_DUP_CACHE_ENABLED,
+    NEAR_DUP_MAX_DISTANCE,
+    REDIS_MAX_CONNECTIONS,
+    REDIS_URL,
+)
+from ..utils.text_utils import (
+    canonicalize_text,
+    hamming_distance,
+    signature_bands,
+    simhash,
+)
+from .cache_backends import CacheBackend, DiskCacheBackend, RedisCacheBackend
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 class CacheService:
     """
-    Disk-based caching service for course recommendations.
+    Caching service for course recommendations.
 
     Uses diskcache to store results on disk, preserving RAM for ML models
-    while providing fast retrieval for repeated requests.
+    while providing fast retrieval for repeated requests. With
+    CACHE_BACKEND=redis the cache lives on a Redis server instead, so every
+    replica shares it.
     """
 
-    _cache_instance: Optional[dc.Cache] = None
+    _backend: Optional[CacheBackend] = None
+    _backend_lock = threading.Lock()
+
+    # Lookup outcomes, counted in the backend so all workers/replicas add up
+    _lookup_outcomes = ("exact_hits", "near_duplicate_hits", "misses")
+
+    # Access records (hit count, last access) rank entries for snapshots.
+    # Short-lived namespaces are not worth tracking.
+    _access_expire_seconds = 30 * 24 * 3600
+    _untracked_prefixes = ("analysis:", "stats:", "access:", "snapshot:")
+
+    # Maximum number of entries kept per near-duplicate bucket
+    _max_bucket_size = 32
+
+    # Result fields describing the request's own resume, left out of
+    # near-duplicate hits
+    _per_user_fields = ("analysis", "analysis_id", "user_skills", "truncation")
 
     @classmethod
-    def _get_cache(cls) -> dc.Cache:
-        """Get or create the cache instance."""
-        if cls._cache_instance is None:
-            # Create cache directory relative to the app root
-            cache_dir = Path(__file__).parent.parent.parent / "cache"
-            cache_dir.mkdir(exist_ok=True)
+    def _get_cache(cls) -> CacheBackend:
+        """Get or create the configured cache backend."""
+        if cls._backend is None:
+            with cls._backend_lock:
+                if cls._backend is None:
+                    if CACHE_BACKEND == "redis":
+                        cls._backend = RedisCacheBackend(
+                            REDIS_URL,
+                            max_connections=REDIS_MAX_CONNECTIONS,
+                            key_prefix=CACHE_KEY_PREFIX,
+                        )
+                    else:
+                        # Defaults to a 500MB LRU cache in the app root
+                        cls._backend = DiskCacheBackend(CACHE_DIR, CACHE_SIZE_LIMIT)
+        return cls._backend
 
-            # Initialize cache with 500MB size limit
-            cls._cache_instance = dc.Cache(
-                str(cache_dir),
-                size_limit=500_000_000,  # 500MB
-                eviction_policy="least-recently-used",
-            )
-        return cls._cache_instance
+    @classmethod
+    def set_backend(cls, backend: Optional[CacheBackend]) -> None:
+        """
+        Replace the cache backend (e.g. with a Redis backend on a fake client).
+
+        Args:
+            backend: The backend to use, or None to restore the configured one
+        """
+        with cls._backend_lock:
+            cls._backend = backend
 
     @classmethod
     def _create_cache_key(
-        cls, resume_text: str, job_description_text: str, threshold: float
+        cls,
+        resume_text: str,
+        job_description_text: str,
+        threshold: float,
+        mode: str = "auto",
     ) -> str:
         """
         Create a unique cache key from the input parameters.
@@ -53,6 +105,7 @@ class CacheService:
             resume_text: The resume text content
             job_description_text: The job description text content
             threshold: The similarity threshold value
+            mode: The recommendation mode
 
         Returns:
             MD5 hash of the combined inputs as cache key
@@ -63,22 +116,190 @@ class CacheService:
 
         # Combine all inputs with separators
         combined_input = f"{normalized_resume}|{normalized_job_desc}|{threshold}"
+        if mode != "auto":
+            combined_input += f"|{mode}"
 
         # Create MD5 hash for the cache key
         cache_key = hashlib.md5(combined_input.encode("utf-8")).hexdigest()
         return cache_key
 
+    @classmethod
+    def _record_lookup(cls, cache: CacheBackend, outcome: str) -> None:
+        """Increment the counter for a lookup outcome."""
+        try:
+            cache.incr(f"stats:{outcome}")
+        except Exception as e:
+            logger.warning(f"Cache stats error: {e}")
+
+    @classmethod
+    def _record_access(cls, cache: CacheBackend, key: str, hit: bool) -> None:
+        """Record a read or write of a key for hotness ranking."""
+        if key.startswith(cls._untracked_prefixes):
+            return
+        try:
+            cache.record_access(key, hit, cls._access_expire_seconds)
+        except Exception as e:
+            logger.warning(f"Cache access tracking error: {e}")
+
+    @classmethod
+    def _create_signatures(
+        cls, resume_text: str, job_description_text: str
+    ) -> Tuple[int, int]:
+        """
+        Create SimHash signatures of the canonicalized resume and job description.
+
+        Args:
+            resume_text: The resume text content
+            job_description_text: The job description text content
+
+        Returns:
+            Tuple of the resume and job description signatures
+        """
+        return (
+            simhash(canonicalize_text(resume_text)),
+            simhash(canonicalize_text(job_description_text)),
+        )
+
+    @classmethod
+    def _near_duplicate_buckets(
+        cls, resume_signature: int, threshold: float, mode: str
+    ) -> List[str]:
+        """
+        Get the LSH bucket keys a resume signature falls into.
+
+        Uses one band more than the maximum distance, so any two signatures
+        within that distance share at least one bucket.
+
+        Args:
+            resume_signature: SimHash signature of the resume
+            threshold: The similarity threshold value
+            mode: The recommendation mode
+
+        Returns:
+            List of bucket cache keys
+        """
+        bands = signature_bands(resume_signature, NEAR_DUP_MAX_DISTANCE + 1)
+        return [
+            f"near-dup:{threshold}:{mode}:{i}:{band}" for i, band in enumerate(bands)
+        ]
+
+    @classmethod
+    def _find_near_duplicate(
+        cls,
+        cache: CacheBackend,
+        resume_text: str,
+        job_description_text: str,
+        threshold: float,
+        mode: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find a cached result for a near-identical resume and job description.
+
+        Args:
+            cache: The cache backend
+            resume_text: The resume text content
+            job_description_text: The job description text content
+            threshold: The similarity threshold value
+            mode: The recommendation mode
+
+        Returns:
+            Cached recommendation data of the closest live candidate within
+            NEAR_DUP_MAX_DISTANCE on both texts, without the fields specific to
+            the request that produced it (see `_strip_per_user_fields`), or None
+        """
+        resume_sig, job_sig = cls._create_signatures(resume_text, job_description_text)
+
+        distances: Dict[str, int] = {}
+        buckets = cache.get_buckets(
+            cls._near_duplicate_buckets(resume_sig, threshold, mode)
+        )
+        for bucket in buckets:
+            for cache_key, entry_resume_sig, entry_job_sig in bucket:
+                resume_distance = hamming_distance(resume_sig, entry_resume_sig)
+                job_distance = hamming_distance(job_sig, entry_job_sig)
+                if max(resume_distance, job_distance) > NEAR_DUP_MAX_DISTANCE:
+                    continue
+                distance = resume_distance + job_distance
+                if distance < distances.get(cache_key, distance + 1):
+                    distances[cache_key] = distance
+
+        # Bucket entries can outlive their result, so try the next closest
+        for cache_key in sorted(distances, key=distances.get):
+            result = cache.get(cache_key)
+            if result is not None:
+                cls._record_access(cache, cache_key, hit=True)
+                return cls._strip_per_user_fields(result)
+        return None
+
+    @classmethod
+    def _strip_per_user_fields(cls, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Remove what a near-duplicate hit must not hand to another user.
+
+        Args:
+            result: Cached recommendation data of another request
+
+        Returns:
+            Copy without the other request's resume skills, input truncation
+            and analysis, and without the resume skill of each match
+        """
+        result = {k: v for k, v in result.items() if k not in cls._per_user_fields}
+        result["matching_details"] = [
+            {**detail, "best_match": None}
+            for detail in result.get("matching_details", [])
+        ]
+        return result
+
+    @classmethod
+    def _index_near_duplicate(
+        cls,
+        cache: CacheBackend,
+        cache_key: str,
+        resume_text: str,
+        job_description_text: str,
+        threshold: float,
+        mode: str,
+        expire_seconds: int,
+    ) -> None:
+        """
+        Register a cached result in the near-duplicate buckets.
+
+        Args:
+            cache: The cache backend
+            cache_key: Exact cache key of the stored result
+            resume_text: The resume text content
+            job_description_text: The job description text content
+            threshold: The similarity threshold value
+            mode: The recommendation mode
+            expire_seconds: Seconds until the bucket entries expire
+        """
+        resume_sig, job_sig = cls._create_signatures(resume_text, job_description_text)
+        entry = (cache_key, resume_sig, job_sig)
+
+        for bucket_key in cls._near_duplicate_buckets(resume_sig, threshold, mode):
+            cache.add_to_bucket(
+                bucket_key, entry, cls._max_bucket_size, expire_seconds
+            )
+
     @classmethod
     def get_course_recommendation(
-        cls, resume_text: str, job_description_text: str, threshold: float
+        cls,
+        resume_text: str,
+        job_description_text: str,
+        threshold: float,
+        mode: str = "auto",
     ) -> Optional[Dict[str, Any]]:
         """
         Retrieve cached course recommendation if it exists.
 
+        Looks up the exact input first, then (if enabled) a result cached for
+        a near-identical resume and job description.
+
         Args:
             resume_text: The resume text content
             job_description_text: The job description text content
             threshold: The similarity threshold value
+            mode: The recommendation mode
 
         Returns:
             Cached recommendation data or None if not found
@@ -86,12 +307,25 @@ class CacheService:
         try:
             cache = cls._get_cache()
             cache_key = cls._create_cache_key(
-                resume_text, job_description_text, threshold
+                resume_text, job_description_text, threshold, mode
             )
 
             result = cache.get(cache_key)
+            if result is not None:
+                cls._record_lookup(cache, "exact_hits")
+                cls._record_access(cache, cache_key, hit=True)
+                return result
+
+            if NEAR_DUP_CACHE_ENABLED:
+                result = cls._find_near_duplicate(
+                    cache, resume_text, job_description_text, threshold, mode
+                )
+                if result is not None:
+                    cls._record_lookup(cache, "near_duplicate_hits")
+                    return result
 
-            return result
+            cls._record_lookup(cache, "misses")
+            return None
         except Exception as e:
             # Log error but don't fail the request
             logger.error(f"Cache retrieval error: {e}")
@@ -105,6 +339,7 @@ class CacheService:
         threshold: float,
         recommendation_data: Dict[str, Any],
         expire_hours: int = 24,
+        mode: str = "auto",
     ) -> bool:
         """
         Cache course recommendation data.
@@ -115,6 +350,7 @@ class CacheService:
             threshold: The similarity threshold value
             recommendation_data: The recommendation data to cache
             expire_hours: Hours until cache expires (default: 24)
+            mode: The recommendation mode
 
         Returns:
             True if successfully cached, False otherwise
@@ -122,18 +358,73 @@ class CacheService:
         try:
             cache = cls._get_cache()
             cache_key = cls._create_cache_key(
-                resume_text, job_description_text, threshold
+                resume_text, job_description_text, threshold, mode
             )
 
             # Cache for specified hours (convert to seconds)
             expire_seconds = expire_hours * 3600
-            cache.set(cache_key, recommendation_data, expire=expire_seconds)
+            cache.set(cache_key, recommendation_data, expire_seconds)
+            cls._record_access(cache, cache_key, hit=False)
+
+            if NEAR_DUP_CACHE_ENABLED:
+                cls._index_near_duplicate(
+                    cache,
+                    cache_key,
+                    resume_text,
+                    job_description_text,
+                    threshold,
+                    mode,
+                    expire_seconds,
+                )
             return True
         except Exception as e:
             # Log error but don't fail the request
             logger.error(f"Cache storage error: {e}")
             return False
 
+    @classmethod
+    def get_value(cls, key: str) -> Optional[Any]:
+        """
+        Retrieve an arbitrary cached value.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached value or None if not found
+        """
+        try:
+            cache = cls._get_cache()
+            value = cache.get(key)
+            if value is not None:
+                cls._record_access(cache, key, hit=True)
+            return value
+        except Exception as e:
+            logger.error(f"Cache retrieval error: {e}")
+            return None
+
+    @classmethod
+    def set_value(cls, key: str, value: Any, expire_hours: float = 24) -> bool:
+        """
+        Cache an arbitrary value.
+
+        Args:
+            key: The cache key
+            value: The value to cache
+            expire_hours: Hours until cache expires (default: 24)
+
+        Returns:
+            True if successfully cached, False otherwise
+        """
+        try:
+            cache = cls._get_cache()
+            cache.set(key, value, int(expire_hours * 3600))
+            cls._record_access(cache, key, hit=False)
+            return True
+        except Exception as e:
+            logger.error(f"Cache storage error: {e}")
+            return False
+
     @classmethod
     def clear_cache(cls) -> bool:
         """
@@ -160,11 +451,18 @@ class CacheService:
         """
         try:
             cache = cls._get_cache()
+            counts = cache.get_counters([f"stats:{o}" for o in cls._lookup_outcomes])
+            lookups = dict(zip(cls._lookup_outcomes, counts))
+            total = sum(lookups.values())
             return {
-                "cache_size": len(cache),
-                "disk_usage_bytes": cache.volume(),
-                "cache_hits": getattr(cache, "stats", {}).get("hits", 0),
-                "cache_misses": getattr(cache, "stats", {}).get("misses", 0),
+                **cache.describe(),
+                "cache_hits": lookups["exact_hits"] + lookups["near_duplicate_hits"],
+                "cache_misses": lookups["misses"],
+                "exact_hit_rate": lookups["exact_hits"] / total if total else 0.0,
+                "near_duplicate_hit_rate": (
+                    lookups["near_duplicate_hits"] / total if total else 0.0
+                ),
+                "lookups": lookups,
             }
         except Exception as e:
             logger.error(f"Cache stats error: {e}")
@@ -0,0 +1,254 @@
+"""
+Service for assembling a compact LLM context from retrieved courses.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from ..core.config import (
+    CONTEXT_COVERAGE_THRESHOLD,
+    CONTEXT_MAX_COURSE_CHARS,
+    CONTEXT_TOKEN_BUDGET,
+)
+from ..utils.request_context import RequestContext
+from ..utils.text_utils import split_skill_list
+from .similarity_service import SimilarityService
+
+# Rough average for English text with the tokenizers used by hosted LLMs
+CHARS_PER_TOKEN = 4
+
+
+class ContextService:
+    """Service for assembling a compact LLM context from retrieved courses."""
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """
+        Estimate the number of LLM tokens in a text.
+
+        Args:
+            text: The text to measure
+
+        Returns:
+            Approximate token count
+        """
+        if not text:
+            return 0
+        return max(1, len(text) // CHARS_PER_TOKEN)
+
+    @staticmethod
+    def _normalize_title(title: str) -> str:
+        """Reduce a course title to a comparable key."""
+        return re.sub(r"[^a-z0-9]+", " ", title.lower()).strip()
+
+    @staticmethod
+    def split_course_skills(skills: str) -> List[str]:
+        """
+        Split the raw `Skills` metadata of a course into individual skills.
+
+        Args:
+            skills: Comma/semicolon separated skill string
+
+        Returns:
+            List of non-empty skill strings
+        """
+        return split_skill_list(skills)
+
+    @classmethod
+    def candidates_from_matches(cls, matches: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Convert Pinecone matches into candidate course dictionaries.
+
+        Args:
+            matches: Matches returned by a metadata-only index query
+
+        Returns:
+            List of candidate courses in retrieval order
+        """
+        candidates = []
+        for match in matches:
+            metadata = match["metadata"] or {}
+            candidates.append(
+                {
+                    "id": match["id"],
+                    "retrieval_score": float(match["score"] or 0.0),
+                    "Title": metadata.get("Title", ""),
+                    "url": metadata.get("url", ""),
+                    "course_desc": metadata.get("course_desc", ""),
+                    "Skills": metadata.get("Skills", ""),
+                }
+            )
+        return candidates
+
+    @classmethod
+    def dedupe_courses(cls, courses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drop near-identical courses, keeping the first (best retrieved) occurrence.
+
+        Two courses are considered the same if they share a URL or a normalized
+        title (the catalogue lists many re-runs of a course under one title).
+
+        Args:
+            courses: Candidate courses in retrieval order
+
+        Returns:
+            Deduplicated list of candidate courses
+        """
+        seen_urls: Set[str] = set()
+        seen_titles: Set[str] = set()
+        distinct = []
+
+        for course in courses:
+            url = course.get("url", "").strip().lower()
+            title = cls._normalize_title(course.get("Title", ""))
+            if (url and url in seen_urls) or (title and title in seen_titles):
+                continue
+            if url:
+                seen_urls.add(url)
+            if title:
+                seen_titles.add(title)
+            distinct.append(course)
+
+        return distinct
+
+    @classmethod
+    def rank_by_gap_coverage(
+        cls,
+        courses: List[Dict[str, Any]],
+        skill_gap: Set[str],
+        threshold: float = CONTEXT_COVERAGE_THRESHOLD,
+        request_context: Optional[RequestContext] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rerank courses by how well their skills cover the current skill gap.
+
+        Each course is annotated with:
+        - `gap_coverage`: per gap skill (sorted order), the best similarity
+          between that skill and any of the course's skills
+        - `coverage_score`: mean of `gap_coverage`
+        - `covered_skills`: gap skills whose similarity reaches `threshold`
+
+        Args:
+            courses: Candidate courses
+            skill_gap: Job skills missing from the resume
+            threshold: Similarity at which a gap skill counts as covered
+            request_context: Request context memoizing the encoded skills
+
+        Returns:
+            Courses sorted by coverage score, then retrieval score
+        """
+        if not courses or not skill_gap:
+            return courses
+
+        gap_list = sorted(skill_gap)
+        course_skills = [
+            cls.split_course_skills(c.get("Skills", "")) or [c.get("Title", "")]
+            for c in courses
+        ]
+        unique_skills = sorted({s for skills in course_skills for s in skills})
+        column = {skill: i for i, skill in enumerate(unique_skills)}
+
+        # Take vocabulary skills from the precomputed matrix and encode the
+        # rest of the gap and course skills in a single batch
+        all_skills = gap_list + unique_skills
+        encoded = SimilarityService.embed_skills(all_skills, None, request_context)
+        embeddings = np.array([encoded[s] for s in all_skills])
+        similarity = cosine_similarity(
+            embeddings[: len(gap_list)], embeddings[len(gap_list) :]
+        )
+
+        for course, skills in zip(courses, course_skills):
+            columns = [column[s] for s in skills]
+            coverage = np.clip(similarity[:, columns].max(axis=1), 0.0, 1.0)
+            course["gap_coverage"] = coverage.tolist()
+            course["coverage_score"] = float(coverage.mean())
+            course["covered_skills"] = [
+                gap_list[i] for i, sim in enumerate(coverage) if sim >= threshold
+            ]
+
+        return sorted(
+            courses,
+            key=lambda c: (c["coverage_score"], c.get("retrieval_score", 0.0)),
+            reverse=True,
+        )
+
+    @classmethod
+    def pack_to_budget(
+        cls,
+        courses: List[Dict[str, Any]],
+        token_budget: int = CONTEXT_TOKEN_BUDGET,
+        max_course_chars: int = CONTEXT_MAX_COURSE_CHARS,
+    ) -> List[Dict[str, Any]]:
+        """
+        Pack the best courses into a token budget.
+
+        Course descriptions are truncated to `max_course_chars` and courses are
+        taken in rank order while they fit. A budget of 0 or less disables
+        packing and keeps every course with its full description.
+
+        Args:
+            courses: Ranked candidate courses
+            token_budget: Maximum number of tokens for the course context
+            max_course_chars: Maximum characters kept per course description
+
+        Returns:
+            Courses that fit the budget, each with a `context_text` entry
+        """
+        if token_budget <= 0:
+            for course in courses:
+                course["context_text"] = course.get("course_desc", "")
+            return courses
+
+        packed = []
+        used_tokens = 0
+        for course in courses:
+            text = course.get("course_desc", "")
+            if len(text) > max_course_chars:
+                text = text[:max_course_chars].rsplit(" ", 1)[0] + "..."
+            cost = cls.estimate_tokens(text)
+            if used_tokens + cost > token_budget:
+                continue
+            course["context_text"] = text
+            packed.append(course)
+            used_tokens += cost
+
+        return packed
+
+    @classmethod
+    def assemble(
+        cls,
+        matches: List[Any],
+        skill_gap: Set[str],
+        token_budget: Optional[int] = None,
+        request_context: Optional[RequestContext] = None,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Run the full context assembly stage over raw index matches.
+
+        Args:
+            matches: Matches returned by a metadata-only index query
+            skill_gap: Job skills missing from the resume
+            token_budget: Token budget for the course context (config default
+                if None, unbounded if 0 or less)
+            request_context: Request context memoizing the encoded skills
+
+        Returns:
+            Tuple containing:
+            - Deduplicated candidate courses, best gap coverage first
+            - The candidates packed into the context, each with a
+              `context_text` entry
+        """
+        if token_budget is None:
+            token_budget = CONTEXT_TOKEN_BUDGET
+
+        candidates = cls.dedupe_courses(cls.candidates_from_matches(matches))
+        ranked = cls.rank_by_gap_coverage(
+            candidates, skill_gap, request_context=request_context
+        )
+        if token_budget <= 0:
+            # Unbounded mode keeps retrieval order, matching the legacy prompt
+            return ranked, cls.pack_to_budget(candidates, token_budget)
+        return ranked, cls.pack_to_budget(ranked, token_budget)
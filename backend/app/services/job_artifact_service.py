@@ -0,0 +1,195 @@
+"""
+Service for caching the job-description side of the recommendation pipeline.
+
+The same job postings are analysed against many resumes. Everything derived
+from the job description alone (entities, skills, skill embeddings, the query
+vector and the retrieved courses) is computed once and stored under a hash of
+the normalized job description.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+from ..core.config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL_NAME,
+    JD_ARTIFACT_MEMORY_SIZE,
+    JD_ARTIFACT_TTL_HOURS,
+    PINECONE_INDEX_NAME,
+    RETRIEVAL_TOP_K,
+)
+from ..utils.request_context import RequestContext
+from ..utils.stage_graph import StageGraph
+from .cache_service import CacheService
+from .nlp_service import NLPService
+from .rag_service import RAGService
+from .similarity_service import SimilarityService
+from .skill_vocabulary_service import SkillVocabularyService
+
+logger = logging.getLogger(__name__)
+
+
+class JobArtifactService:
+    """Service for caching the job-description side of the recommendation pipeline."""
+
+    # Version of the artifact layout, bumped when fields are added
+    _layout_version = 2
+
+    # Small in-process LRU in front of the disk cache
+    _memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def artifact_key(job_description: str) -> str:
+        """
+        Create the cache key for a job description's artifacts.
+
+        Whitespace is normalized but case is kept, since NER is case-sensitive.
+        The artifact layout, the retrieval settings, the embedding model and
+        backend, and the skill vocabulary are part of the key, so stale
+        artifacts, matches, embeddings or skills are not reused after any of
+        them changes.
+
+        Args:
+            job_description: Text of the job description
+
+        Returns:
+            Cache key for the artifacts
+        """
+        normalized = " ".join(job_description.split())
+        digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        return (
+            f"jd-artifacts:v{JobArtifactService._layout_version}:"
+            f"{PINECONE_INDEX_NAME}:{RETRIEVAL_TOP_K}:"
+            f"{EMBEDDING_MODEL_NAME}:{EMBEDDING_BACKEND}:"
+            f"{SkillVocabularyService.version()}:{digest}"
+        )
+
+    @classmethod
+    def compute_artifacts(cls, job_description: str) -> Dict[str, Any]:
+        """
+        Compute all job-description artifacts.
+
+        Args:
+            job_description: Text of the job description
+
+        Returns:
+            Dictionary containing:
+            - job_entities: List of `EntityRecord` tuples
+            - job_skills: Sorted list of skills
+            - skill_embeddings: Embedding of each skill, by skill text
+            - query_vector: Embedding of the whole job description
+            - course_matches: Top retrieved courses (metadata only)
+            - truncation: Truncation report of the job description (see
+              `NLPService.prepare_text`)
+        """
+        # Keeps the truncation report of the extraction
+        request_context = RequestContext()
+
+        def embed_skills(job_entities):
+            job_skills = sorted(NLPService.filter_skills(job_entities))
+            if not job_skills:
+                return job_skills, {}
+            embeddings = SimilarityService.get_embeddings(job_skills)
+            return job_skills, dict(zip(job_skills, embeddings))
+
+        # NER and skill embedding overlap the query embedding and retrieval
+        graph = StageGraph()
+        graph.add(
+            "job_entities",
+            lambda: NLPService.extract_distinct_entities_from_all_models(
+                job_description, request_context
+            ),
+        )
+        graph.add("job_skills", embed_skills, deps=("job_entities",))
+        graph.add(
+            "query_vector",
+            lambda: RAGService.encode_query(job_description),
+        )
+        graph.add(
+            "course_matches",
+            RAGService.query_courses,
+            deps=("query_vector",),
+            kind="io",
+        )
+        results = graph.run()
+        job_skills, skill_embeddings = results["job_skills"]
+
+        return {
+            "job_entities": results["job_entities"],
+            "job_skills": job_skills,
+            "skill_embeddings": skill_embeddings,
+            "query_vector": results["query_vector"],
+            "course_matches": results["course_matches"],
+            "truncation": NLPService.prepare_text(job_description, request_context)[1],
+        }
+
+    @classmethod
+    def _remember(cls, key: str, artifacts: Dict[str, Any]) -> None:
+        """Store artifacts in the in-process LRU."""
+        with cls._lock:
+            cls._memory[key] = artifacts
+            cls._memory.move_to_end(key)
+            while len(cls._memory) > JD_ARTIFACT_MEMORY_SIZE:
+                cls._memory.popitem(last=False)
+
+    @classmethod
+    def get_artifacts(cls, job_description: str) -> Dict[str, Any]:
+        """
+        Get the artifacts of a job description, computing them on a miss.
+
+        Args:
+            job_description: Text of the job description
+
+        Returns:
+            Job description artifacts (see `compute_artifacts`)
+        """
+        key = cls.artifact_key(job_description)
+
+        with cls._lock:
+            artifacts = cls._memory.get(key)
+            if artifacts is not None:
+                cls._memory.move_to_end(key)
+                return artifacts
+
+        artifacts = CacheService.get_value(key)
+        if artifacts is None:
+            logger.info("JD artifacts: Miss, computing...")
+            artifacts = cls.compute_artifacts(job_description)
+            CacheService.set_value(key, artifacts, expire_hours=JD_ARTIFACT_TTL_HOURS)
+
+        cls._remember(key, artifacts)
+        return artifacts
+
+    @classmethod
+    def prewarm(cls, job_descriptions: List[str]) -> int:
+        """
+        Precompute and store the artifacts of several job descriptions.
+
+        Args:
+            job_descriptions: Job description texts
+
+        Returns:
+            Number of job descriptions whose artifacts were computed
+        """
+        computed = 0
+        for job_description in job_descriptions:
+            key = cls.artifact_key(job_description)
+            if CacheService.get_value(key) is not None:
+                continue
+            try:
+                artifacts = cls.compute_artifacts(job_description)
+            except Exception as e:
+                logger.error(f"JD artifacts: Prewarm failed: {e}")
+                continue
+            CacheService.set_value(key, artifacts, expire_hours=JD_ARTIFACT_TTL_HOURS)
+            computed += 1
+
+        logger.info(
+            f"JD artifacts: Prewarmed {computed} of {len(job_descriptions)} "
+            "job descriptions"
+        )
+        return computed
@@ -0,0 +1,356 @@
+"""
+Service for running course recommendations as asynchronous jobs.
+
+Jobs are stored in a local SQLite database, so queued and running jobs survive
+a restart. A pool of worker threads claims queued jobs, runs the pipeline and
+records the progress, timing and result of each stage. A heartbeat thread
+renews the lease of each running job, so only jobs whose worker died are
+claimed again.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import (
+    JOB_DB_PATH,
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_POLL_SECONDS,
+    JOB_RETENTION_HOURS,
+    JOB_RETRY_BACKOFF_SECONDS,
+    JOB_WORKERS,
+)
+from .cache_service import CacheService
+from .llm_service import LLMService, LLMUnavailableError
+from .pipeline_service import PipelineService
+from .rag_service import RAGService
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    dedupe_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stage TEXT,
+    request TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    timings TEXT NOT NULL DEFAULT '{}',
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    next_attempt_at REAL NOT NULL,
+    lease_expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (dedupe_key, status);
+"""
+
+# Statuses of jobs that have not finished yet
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class JobService:
+    """Service for running course recommendations as asynchronous jobs."""
+
+    _local = threading.local()
+    _workers: List[threading.Thread] = []
+    _stop = threading.Event()
+
+    @classmethod
+    def _connect(cls) -> sqlite3.Connection:
+        """Get this thread's connection to the job database."""
+        conn = getattr(cls._local, "conn", None)
+        if conn is None:
+            Path(JOB_DB_PATH).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(JOB_DB_PATH, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            cls._local.conn = conn
+        return conn
+
+    @classmethod
+    def submit(cls, request: Dict[str, Any]) -> Tuple[str, bool]:
+        """
+        Queue a recommendation job.
+
+        A request with the same cache key as a queued or running job is not
+        queued again; the existing job is returned instead.
+
+        Args:
+            request: `CourseRecommendationRequest` fields
+
+        Returns:
+            Tuple of the job id and whether an existing job was reused
+        """
+        dedupe_key = CacheService._create_cache_key(
+            request["resume_text"],
+            request["job_description_text"],
+            request["threshold"],
+            request["mode"],
+        )
+        conn = cls._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE dedupe_key = ? AND status IN (?, ?)"
+                " ORDER BY created_at LIMIT 1",
+                (dedupe_key, *ACTIVE_STATUSES),
+            ).fetchone()
+            if row is not None:
+                conn.execute("COMMIT")
+                return row["id"], True
+
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, dedupe_key, status, request, created_at,"
+                " next_attempt_at) VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, dedupe_key, json.dumps(request), now, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        logger.info(f"Jobs: Queued job {job_id}")
+        return job_id, False
+
+    @classmethod
+    def get(cls, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the state of a job.
+
+        Args:
+            job_id: The job id
+
+        Returns:
+            Job state (status, stage, attempts, timings, error, request and
+            result), or None if the job does not exist
+        """
+        row = cls._connect().execute(
+            "SELECT * FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row["id"],
+            "status": row["status"],
+            "stage": row["stage"],
+            "attempts": row["attempts"],
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+            "timings": json.loads(row["timings"]),
+            "request": json.loads(row["request"]),
+            "result": json.loads(row["result"]) if row["result"] else None,
+        }
+
+    @classmethod
+    def _claim(cls) -> Optional[sqlite3.Row]:
+        """
+        Claim the oldest job that is due, including running jobs whose worker
+        stopped renewing their lease (e.g. after a crash).
+        """
+        conn = cls._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE (status = 'queued' AND next_attempt_at <= ?)"
+                " OR (status = 'running' AND lease_expires_at < ?)"
+                " ORDER BY next_attempt_at LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1,"
+                    " started_at = COALESCE(started_at, ?), lease_expires_at = ?"
+                    " WHERE id = ?",
+                    (now, now + JOB_LEASE_SECONDS, row["id"]),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return row
+
+    @classmethod
+    def _update(cls, job_id: str, **fields: Any) -> None:
+        """Update columns of a job."""
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        cls._connect().execute(
+            f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id)
+        )
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Return whether a pipeline error is an upstream failure worth retrying."""
+        return (
+            isinstance(error, LLMUnavailableError)
+            or LLMService._is_retryable(error)
+            or RAGService.is_upstream_error(error)
+        )
+
+    @classmethod
+    def _heartbeat(cls, job_id: str, done: threading.Event) -> None:
+        """Renew a job's lease until it is done, so slow stages are not re-claimed."""
+        while not done.wait(JOB_LEASE_SECONDS / 3):
+            try:
+                cls._update(job_id, lease_expires_at=time.time() + JOB_LEASE_SECONDS)
+            except Exception as e:
+                logger.warning(f"Jobs: Could not renew the lease of job {job_id}: {e}")
+
+    @classmethod
+    def _run(cls, job: sqlite3.Row) -> None:
+        """Run the pipeline for a claimed job and record its outcome."""
+        job_id = job["id"]
+        attempt = job["attempts"] + 1
+        request = json.loads(job["request"])
+        # Filled by the pipeline as stages finish
+        timings: Dict[str, float] = {}
+
+        def on_stage(stage: str) -> None:
+            # Publish the timings of the stages finished so far with the stage
+            cls._update(job_id, stage=stage, timings=json.dumps(dict(timings)))
+
+        heartbeat_done = threading.Event()
+        heartbeat = threading.Thread(
+            target=cls._heartbeat,
+            args=(job_id, heartbeat_done),
+            name=f"job-heartbeat-{job_id[:8]}",
+            daemon=True,
+        )
+        heartbeat.start()
+        try:
+            try:
+                result = PipelineService.run(
+                    request["resume_text"],
+                    request["job_description_text"],
+                    request["threshold"],
+                    request["mode"],
+                    on_stage=on_stage,
+                    timings=timings,
+                )
+            finally:
+                # Stop renewing before the outcome clears the lease
+                heartbeat_done.set()
+                heartbeat.join()
+        except Exception as e:
+            if cls._is_retryable(e) and attempt < JOB_MAX_ATTEMPTS:
+                delay = JOB_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+                logger.warning(f"Jobs: Job {job_id} failed ({e}), retry in {delay}s")
+                cls._update(
+                    job_id,
+                    status="queued",
+                    error=str(e),
+                    timings=json.dumps(timings),
+                    next_attempt_at=time.time() + delay,
+                    lease_expires_at=None,
+                )
+            else:
+                logger.error(f"Jobs: Job {job_id} failed: {e}")
+                cls._update(
+                    job_id,
+                    status="failed",
+                    error=str(e),
+                    timings=json.dumps(timings),
+                    finished_at=time.time(),
+                    lease_expires_at=None,
+                )
+            return
+
+        finished_at = time.time()
+        timings["total"] = round((finished_at - job["created_at"]) * 1000, 2)
+        cls._update(
+            job_id,
+            status="succeeded",
+            stage=None,
+            error=None,
+            result=json.dumps(result),
+            timings=json.dumps(timings),
+            finished_at=finished_at,
+            lease_expires_at=None,
+        )
+        logger.info(f"Jobs: Job {job_id} succeeded in {timings['total']}ms")
+
+    @classmethod
+    def cleanup(cls) -> int:
+        """
+        Delete finished jobs older than JOB_RETENTION_HOURS.
+
+        Returns:
+            Number of deleted jobs
+        """
+        cutoff = time.time() - JOB_RETENTION_HOURS * 3600
+        cursor = cls._connect().execute(
+            "DELETE FROM jobs WHERE status IN ('succeeded', 'failed')"
+            " AND finished_at < ?",
+            (cutoff,),
+        )
+        return cursor.rowcount
+
+    @classmethod
+    def _work(cls) -> None:
+        """Claim and run jobs until the service is stopped."""
+        last_cleanup = time.monotonic()
+        while not cls._stop.is_set():
+            try:
+                job = cls._claim()
+                if job is None:
+                    if time.monotonic() - last_cleanup > 3600:
+                        cls.cleanup()
+                        last_cleanup = time.monotonic()
+                    cls._stop.wait(JOB_POLL_SECONDS)
+                    continue
+                cls._run(job)
+            except Exception as e:
+                logger.error(f"Jobs: Worker error: {e}")
+                cls._stop.wait(JOB_POLL_SECONDS)
+
+    @classmethod
+    def start(cls, workers: int = JOB_WORKERS) -> None:
+        """
+        Start the worker threads.
+
+        Args:
+            workers: Number of jobs run concurrently
+        """
+        if cls._workers:
+            return
+        cls._stop.clear()
+        deleted = cls.cleanup()
+        if deleted:
+            logger.info(f"Jobs: Deleted {deleted} expired jobs")
+        for n in range(workers):
+            thread = threading.Thread(
+                target=cls._work, name=f"job-worker-{n}", daemon=True
+            )
+            thread.start()
+            cls._workers.append(thread)
+        logger.info(f"Jobs: Started {workers} workers")
+
+    @classmethod
+    def stop(cls, timeout: float = 5.0) -> None:
+        """
+        Stop the worker threads.
+
+        Running jobs are left for the next start to claim once their lease
+        expires.
+
+        Args:
+            timeout: Seconds to wait for each worker to finish its current job
+        """
+        cls._stop.set()
+        for thread in cls._workers:
+            thread.join(timeout)
+        cls._workers = []
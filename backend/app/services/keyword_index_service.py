@@ -0,0 +1,150 @@
+"""
+Service for keyword (BM25) retrieval of courses by skill name.
+
+Dense retrieval embeds the whole job description, so a course named after one
+exact missing skill (e.g. "PyTorch", "Terraform") can fall outside its top
+results. The keyword tier queries the missing skills against a local BM25
+index over the course titles and skills, and its hits are fused with the dense
+hits by reciprocal rank fusion. The index is built ahead of time with
+`python -m app.build_keyword_index`.
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from ..core.config import (
+    KEYWORD_INDEX_ENABLED,
+    KEYWORD_INDEX_PATH,
+    KEYWORD_TOP_K,
+    RRF_K,
+)
+from ..utils.bm25_index import BM25Index
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordIndexService:
+    """Service for keyword (BM25) retrieval of courses by skill name."""
+
+    _index: Optional[BM25Index] = None
+    _loaded = False
+    _lock = threading.Lock()
+
+    @staticmethod
+    def build(courses_df: pd.DataFrame) -> BM25Index:
+        """
+        Index the title and skills of every course.
+
+        Documents get the same ids and metadata as the dense index records
+        (see `app.utils.embedding_utils.embed_courses`), so a course found by
+        both tiers is recognized as one.
+
+        Args:
+            courses_df: Courses from `load_courses_data`
+
+        Returns:
+            The index
+        """
+        texts = []
+        documents = []
+        for i, row in courses_df.iterrows():
+            texts.append(f"{row['Title']} {row['Skills']}")
+            documents.append(
+                {
+                    "id": f"course_{i}",
+                    "Title": row["Title"],
+                    "url": row["url"],
+                    "course_desc": row["course_desc"],
+                    "Skills": row["Skills"],
+                }
+            )
+        return BM25Index.build(texts, documents)
+
+    @classmethod
+    def get_index(cls) -> Optional[BM25Index]:
+        """
+        Get the keyword index, loading it on first use.
+
+        Returns:
+            The index, or None if the tier is disabled or was not built
+        """
+        if not cls._loaded:
+            with cls._lock:
+                if not cls._loaded:
+                    cls._index = cls._load()
+                    cls._loaded = True
+        return cls._index
+
+    @staticmethod
+    def _load() -> Optional[BM25Index]:
+        """Load the serialized index, or return None if it is not available."""
+        if not KEYWORD_INDEX_ENABLED:
+            return None
+        path = Path(KEYWORD_INDEX_PATH)
+        if not path.exists():
+            logger.warning(
+                f"Keyword index not found at {path}; build it with "
+                "`python -m app.build_keyword_index`"
+            )
+            return None
+        index = BM25Index.load(path)
+        logger.info(f"Loaded keyword index: {len(index)} courses")
+        return index
+
+    @classmethod
+    def query_skills(
+        cls, skills: Iterable[str], top_k: int = KEYWORD_TOP_K
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve the courses whose titles and skills best match some skills.
+
+        Args:
+            skills: Skills to look for (e.g. the skill gap)
+            top_k: Maximum number of courses
+
+        Returns:
+            Match dictionaries shaped like `RAGService.query_courses` results,
+            scored by BM25
+        """
+        index = cls.get_index()
+        query = " ".join(sorted(skills))
+        if index is None or not query:
+            return []
+
+        return [
+            {
+                "id": index.documents[doc_id]["id"],
+                "score": score,
+                "metadata": index.documents[doc_id],
+            }
+            for doc_id, score in index.search(query, top_k)
+        ]
+
+    @staticmethod
+    def fuse(
+        *rankings: List[Dict[str, Any]], k: int = RRF_K
+    ) -> List[Dict[str, Any]]:
+        """
+        Merge ranked match lists by reciprocal rank fusion.
+
+        Each match scores `sum(1 / (k + rank))` over the lists it appears in,
+        so scores on different scales (cosine, BM25) need no calibration.
+
+        Args:
+            *rankings: Match lists, each best first
+            k: Damping constant; larger values flatten the rank differences
+
+        Returns:
+            Distinct matches by fused score, best first; `score` holds the
+            fused score
+        """
+        fused: Dict[str, Dict[str, Any]] = {}
+        for ranking in rankings:
+            for rank, match in enumerate(ranking, start=1):
+                entry = fused.setdefault(match["id"], {**match, "score": 0.0})
+                entry["score"] += 1.0 / (k + rank)
+        return sorted(fused.values(), key=lambda match: -match["score"])
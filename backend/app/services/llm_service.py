@@ -0,0 +1,295 @@
+"""
+Service for calling the LLM through a long-lived, fault-tolerant client.
+"""
+
+import logging
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, Optional, Tuple
+
+import cohere
+import httpx
+
+from ..core.config import (
+    COHERE_API_KEY,
+    COHERE_BASE_URL,
+    LLM_CIRCUIT_FAILURE_THRESHOLD,
+    LLM_CIRCUIT_RESET_SECONDS,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_RETRIES,
+    LLM_MODEL,
+    LLM_RETRY_BACKOFF_SECONDS,
+    LLM_TIMEOUT_SECONDS,
+)
+from .context_service import ContextService
+
+logger = logging.getLogger(__name__)
+
+
+class LLMUnavailableError(Exception):
+    """Raised when the LLM cannot answer (circuit open, deadline, retries)."""
+
+
+class LLMProvider(ABC):
+    """Minimal interface an LLM backend has to implement."""
+
+    @abstractmethod
+    def stream_chat(
+        self, prompt: str, timeout: float, json_mode: bool = False
+    ) -> Iterator[str]:
+        """
+        Stream the completion of a single-turn chat.
+
+        Args:
+            prompt: The prompt to send
+            timeout: Seconds allowed for the underlying network calls
+            json_mode: Whether to constrain the output to a JSON object
+
+        Returns:
+            Iterator over generated text chunks
+        """
+
+
+class CohereProvider(LLMProvider):
+    """Cohere chat provider backed by a pooled, keep-alive HTTP client."""
+
+    def __init__(
+        self,
+        api_key: str = COHERE_API_KEY,
+        model: str = LLM_MODEL,
+        base_url: Optional[str] = COHERE_BASE_URL or None,
+        max_connections: int = LLM_MAX_CONNECTIONS,
+    ):
+        self.model = model
+        self._http = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=LLM_TIMEOUT_SECONDS,
+        )
+        client_kwargs = {"api_key": api_key or "unset", "httpx_client": self._http}
+        if base_url:
+            client_kwargs["base_url"] = base_url
+        self._client = cohere.Client(**client_kwargs)
+
+    def stream_chat(
+        self, prompt: str, timeout: float, json_mode: bool = False
+    ) -> Iterator[str]:
+        # Retries are handled by LLMService, so disable the SDK's own
+        kwargs = {}
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        # The timeout is also the read timeout of the stream, so a stalled
+        # stream fails once the remaining time is up
+        events = self._client.chat_stream(
+            model=self.model,
+            message=prompt,
+            request_options={"timeout_in_seconds": timeout, "max_retries": 0},
+            **kwargs,
+        )
+        for event in events:
+            if event.event_type == "text-generation":
+                yield event.text
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    fail fast. After `reset_seconds` a single trial call is let through
+    (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Return whether a call may proceed."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_seconds:
+                return False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit if the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def record_ignored(self) -> None:
+        """End a call whose outcome says nothing about the upstream's health."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class LLMService:
+    """Service for calling the LLM through a long-lived, fault-tolerant client."""
+
+    _provider: Optional[LLMProvider] = None
+    _breaker = CircuitBreaker(LLM_CIRCUIT_FAILURE_THRESHOLD, LLM_CIRCUIT_RESET_SECONDS)
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_provider(cls) -> LLMProvider:
+        """
+        Get or initialize the LLM provider.
+
+        Returns:
+            The shared provider instance
+        """
+        if cls._provider is None:
+            with cls._lock:
+                if cls._provider is None:
+                    cls._provider = CohereProvider()
+        return cls._provider
+
+    @classmethod
+    def set_provider(cls, provider: Optional[LLMProvider]) -> None:
+        """
+        Replace the LLM provider (e.g. with a fake for tests and load tests).
+
+        Args:
+            provider: The provider to use, or None to restore the default
+        """
+        with cls._lock:
+            cls._provider = provider
+            cls._breaker = CircuitBreaker(
+                LLM_CIRCUIT_FAILURE_THRESHOLD, LLM_CIRCUIT_RESET_SECONDS
+            )
+
+    @classmethod
+    def is_configured(cls) -> bool:
+        """Return whether an LLM provider can be used at all."""
+        return cls._provider is not None or bool(COHERE_API_KEY or COHERE_BASE_URL)
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, str]:
+        """Return the state of the circuit breaker."""
+        return {"circuit_state": cls._breaker.state}
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Return whether an error is transient and worth retrying."""
+        status_code = getattr(error, "status_code", None)
+        if status_code is not None:
+            return status_code == 429 or status_code >= 500
+        return isinstance(error, (httpx.TransportError, TimeoutError))
+
+    @classmethod
+    def _stream_once(
+        cls, provider: LLMProvider, prompt: str, deadline: float, json_mode: bool
+    ) -> Tuple[str, float]:
+        """Run a single streamed call, aborting it once the deadline passes."""
+        start = time.monotonic()
+        if start >= deadline:
+            raise TimeoutError("LLM deadline passed before the call")
+        first_token_at = None
+        chunks = []
+        stream = provider.stream_chat(
+            prompt, timeout=deadline - start, json_mode=json_mode
+        )
+        for chunk in stream:
+            now = time.monotonic()
+            if now > deadline:
+                raise TimeoutError("LLM response exceeded its deadline")
+            if first_token_at is None:
+                first_token_at = now
+            chunks.append(chunk)
+        return "".join(chunks), (first_token_at or time.monotonic()) - start
+
+    @classmethod
+    def generate(
+        cls, prompt: str, timeout: float = LLM_TIMEOUT_SECONDS, json_mode: bool = False
+    ) -> Tuple[str, Dict[str, float]]:
+        """
+        Generate a completion within a deadline, retrying transient failures.
+
+        Retries use exponential backoff with full jitter and never extend past
+        the deadline. A call that fails on upstream errors (network errors,
+        timeouts, 429 or 5xx) counts as one failure of the circuit breaker,
+        however many attempts it made; client errors are not counted. While
+        the circuit is open, calls fail immediately.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            timeout: Total seconds allowed, including retries
+            json_mode: Whether to constrain the output to a JSON object
+
+        Returns:
+            Tuple of the generated text and a dictionary with the prompt size,
+            time to first token, total time (seconds) and number of attempts
+
+        Raises:
+            LLMUnavailableError: If the circuit is open, the deadline passes or
+                retries are exhausted
+        """
+        if timeout <= 0:
+            raise LLMUnavailableError("No time left for the LLM call")
+        if not cls._breaker.allow():
+            raise LLMUnavailableError("LLM circuit breaker is open")
+
+        provider = cls.get_provider()
+        start = time.monotonic()
+        deadline = start + timeout
+        last_error: Optional[Exception] = None
+
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            try:
+                text, ttft = cls._stream_once(provider, prompt, deadline, json_mode)
+                cls._breaker.record_success()
+                return text, {
+                    "prompt_chars": float(len(prompt)),
+                    "prompt_tokens": float(ContextService.estimate_tokens(prompt)),
+                    "time_to_first_token": ttft,
+                    "total_time": time.monotonic() - start,
+                    "attempts": float(attempt + 1),
+                }
+            except Exception as e:
+                last_error = e
+                logger.warning(f"LLM: Attempt {attempt + 1} failed: {e}")
+                if not cls._is_retryable(e) or attempt == LLM_MAX_RETRIES:
+                    break
+
+            backoff = random.uniform(0, LLM_RETRY_BACKOFF_SECONDS * 2**attempt)
+            if time.monotonic() + backoff >= deadline:
+                break
+            time.sleep(backoff)
+
+        if cls._is_retryable(last_error):
+            cls._breaker.record_failure()
+        else:
+            cls._breaker.record_ignored()
+        raise LLMUnavailableError(f"LLM unavailable: {last_error}") from last_error
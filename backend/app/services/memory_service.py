@@ -0,0 +1,215 @@
+"""
+Service for accounting the memory held by models, caches and the process.
+
+Each worker process reports only its own memory; call the endpoint several
+times (or read the startup logs) to see every worker.
+"""
+
+import logging
+import os
+import threading
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from ..utils.loader import ModelLoader
+from ..utils.memory_utils import MB, deep_sizeof, process_memory, thinc_param_bytes
+from .cache_service import CacheService
+from .job_artifact_service import JobArtifactService
+from .similarity_service import SimilarityService
+from .skill_vocabulary_service import SkillVocabularyService
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryService:
+    """Service for accounting the memory held by models, caches and the process."""
+
+    _snapshot: Optional[tracemalloc.Snapshot] = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def spacy_models() -> Dict[str, Dict[str, int]]:
+        """
+        Measure the loaded spaCy models.
+
+        Returns:
+            Per model: parameter bytes per pipe and in total, vector table
+            bytes and the number of strings in the vocabulary
+        """
+        models = {}
+        for name, nlp in list(ModelLoader._models.items()):
+            pipes = {
+                pipe_name: thinc_param_bytes(pipe.model)
+                for pipe_name, pipe in nlp.pipeline
+                if hasattr(pipe, "model")
+            }
+            models[name] = {
+                "param_bytes": sum(pipes.values()),
+                "pipe_param_bytes": pipes,
+                "vector_bytes": int(nlp.vocab.vectors.data.nbytes),
+                "vocab_strings": len(nlp.vocab.strings),
+            }
+        return models
+
+    @staticmethod
+    def embedding_model() -> Optional[Dict[str, Any]]:
+        """
+        Measure the shared sentence embedding model.
+
+        Returns:
+            Backend and parameter bytes (for ONNX Runtime, the size of the
+            model file, which the session holds in memory), or None if the
+            model is not loaded yet
+        """
+        model = SimilarityService._model
+        if model is None:
+            return None
+        if hasattr(model, "parameters"):
+            param_bytes = sum(p.numel() * p.element_size() for p in model.parameters())
+            return {"backend": "torch", "param_bytes": int(param_bytes)}
+        return {
+            "backend": "onnx",
+            "param_bytes": os.path.getsize(model.model_path),
+        }
+
+    @staticmethod
+    def caches() -> Dict[str, Dict[str, Any]]:
+        """
+        Measure the in-process caches.
+
+        Returns:
+            Entries and estimated bytes of each cache, plus what the shared
+            cache backend keeps in this process
+        """
+        with JobArtifactService._lock:
+            artifacts = list(JobArtifactService._memory.values())
+        vocabulary = SkillVocabularyService._canonical or {}
+        embeddings = SkillVocabularyService._embeddings
+        embedding_bytes = int(embeddings.nbytes) if embeddings is not None else 0
+        return {
+            "jd_artifacts": {
+                "entries": len(artifacts),
+                "bytes": deep_sizeof(artifacts),
+            },
+            "skill_vocabulary": {
+                "entries": len(vocabulary),
+                "bytes": deep_sizeof(vocabulary),
+                "embedding_bytes": embedding_bytes,
+            },
+            "cache_backend": CacheService._get_cache().memory_usage(),
+        }
+
+    @classmethod
+    def report(cls) -> Dict[str, Any]:
+        """
+        Report the memory of this worker process, broken down by component.
+
+        Returns:
+            Process memory, spaCy models, embedding model and caches
+        """
+        return {
+            "pid": os.getpid(),
+            "process": process_memory(),
+            "spacy_models": cls.spacy_models(),
+            "embedding_model": cls.embedding_model(),
+            "caches": cls.caches(),
+            "tracemalloc": tracemalloc.is_tracing(),
+        }
+
+    @classmethod
+    def log_report(cls) -> None:
+        """Log a one-line summary per component."""
+        report = cls.report()
+        process = report["process"]
+        logger.info(
+            f"Memory: pid {report['pid']} RSS "
+            f"{(process['rss'] or 0) / MB:.0f} MB, USS "
+            f"{(process['uss'] or 0) / MB:.0f} MB"
+        )
+        for name, model in report["spacy_models"].items():
+            logger.info(
+                f"Memory: spaCy model {name} params {model['param_bytes'] / MB:.1f} MB,"
+                f" vectors {model['vector_bytes'] / MB:.1f} MB"
+            )
+        embedding = report["embedding_model"]
+        if embedding is not None:
+            logger.info(
+                f"Memory: Embedding model ({embedding['backend']}) params "
+                f"{embedding['param_bytes'] / MB:.1f} MB"
+            )
+        for name, cache in report["caches"].items():
+            if "bytes" in cache:
+                logger.info(
+                    f"Memory: Cache {name} {cache['entries']} entries, "
+                    f"{cache['bytes'] / MB:.1f} MB"
+                )
+
+    @staticmethod
+    def _take_snapshot() -> tracemalloc.Snapshot:
+        """Take an allocation snapshot without tracemalloc's own allocations."""
+        return tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ]
+        )
+
+    @classmethod
+    def start_tracing(cls, frames: int = 1) -> None:
+        """
+        Start tracing allocations and take the baseline snapshot.
+
+        Tracing slows allocations down noticeably; leave it off in normal
+        operation.
+
+        Args:
+            frames: Stack frames kept per allocation (more is slower)
+        """
+        with cls._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+            cls._snapshot = cls._take_snapshot()
+        logger.info(f"Memory: Tracing allocations ({frames} frames)")
+
+    @classmethod
+    def snapshot_diff(cls, top_n: int = 20) -> List[Dict[str, Any]]:
+        """
+        Compare allocations with the previous snapshot, then make the current
+        allocations the new baseline.
+
+        Memory that keeps growing between snapshots taken after the same
+        requests points at a leak.
+
+        Args:
+            top_n: Number of source lines to report
+
+        Returns:
+            The source lines whose allocations changed most, with their
+            current size and the change in size and count
+
+        Raises:
+            RuntimeError: If tracing has not been started
+        """
+        with cls._lock:
+            if not tracemalloc.is_tracing() or cls._snapshot is None:
+                raise RuntimeError("Allocation tracing is not started")
+            snapshot = cls._take_snapshot()
+            stats = snapshot.compare_to(cls._snapshot, "lineno")
+            cls._snapshot = snapshot
+
+        return [
+            {
+                "location": str(stat.traceback),
+                "size_bytes": stat.size,
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff,
+            }
+            for stat in stats[:top_n]
+        ]
+
+    @classmethod
+    def stop_tracing(cls) -> None:
+        """Stop tracing allocations and drop the baseline snapshot."""
+        with cls._lock:
+            tracemalloc.stop()
+            cls._snapshot = None
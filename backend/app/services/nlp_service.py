@@ -2,46 +2,192 @@
 Service for natural language processing tasks.
 """
 
-from typing import List, Optional
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
-from ..models.schemas import Entity
+from ..core.config import (
+    DEADLINE_NER_MIN_SECONDS,
+    DEFAULT_MODEL,
+    INFERENCE_BATCHING_ENABLED,
+    MAX_NER_CHUNKS,
+    MAX_PROCESSED_CHARS,
+    MAX_SKILLS_PER_TEXT,
+    NER_BATCH_MAX_ITEMS,
+    NER_BATCH_MAX_WAIT_MS,
+    NER_BATCH_SIZE,
+    NER_CHUNK_CHARS,
+)
+from ..models.records import EntityRecord
+from ..utils.batcher import DynamicBatcher
 from ..utils.loader import ModelLoader
+from ..utils.request_context import RequestContext
+from ..utils.text_utils import split_into_chunks
 from .similarity_service import SimilarityService
+from .skill_vocabulary_service import SkillVocabularyService
+
+# Entity labels that are treated as skills
+SKILL_LABELS = frozenset({"SKILL", "PRODUCT", "ORG", "GPE", "LANGUAGE"})
 
 
 class NLPService:
     """Service for natural language processing tasks."""
 
+    # One batcher per NER model (see `get_ner_batcher`)
+    _ner_batchers: Dict[str, DynamicBatcher] = {}
+    _ner_batchers_lock = threading.Lock()
+
     @staticmethod
-    def extract_entities(text: str, model_name: Optional[str] = None) -> List[Entity]:
+    def prepare_text(
+        text: str, request_context: Optional[RequestContext] = None
+    ) -> Tuple[List[str], Dict[str, Any]]:
         """
-        Extract named entities from text using spaCy.
+        Bound the cost of processing a text.
+
+        The text is capped at MAX_PROCESSED_CHARS, split into chunks of at most
+        NER_CHUNK_CHARS on paragraph/section boundaries, and at most
+        MAX_NER_CHUNKS chunks are kept, so the work per text grows linearly
+        with its size up to a fixed ceiling.
 
         Args:
-            text: The input text to analyze
+            text: The input text
+            request_context: Request context; a text is then prepared once per
+                request, and the report of its extraction can be looked up
+
+        Returns:
+            Tuple of the chunks to process and a truncation report with the
+            original and processed character counts, the number of chunks and
+            whether anything was dropped
+        """
+        if request_context is not None:
+            return request_context.memoize(
+                "prepared", text, lambda: NLPService.prepare_text(text)
+            )
+
+        processed = text
+        if len(processed) > MAX_PROCESSED_CHARS:
+            # Cut at a word boundary, unless the capped text has none
+            words = processed[:MAX_PROCESSED_CHARS].rsplit(None, 1)
+            processed = words[0] if words else processed[:MAX_PROCESSED_CHARS]
+
+        chunks = []
+        chunk_limit_reached = False
+        for chunk in split_into_chunks(processed, NER_CHUNK_CHARS):
+            if len(chunks) >= MAX_NER_CHUNKS:
+                chunk_limit_reached = True
+                break
+            chunks.append(chunk)
+
+        report = {
+            "chars": len(text),
+            "processed_chars": sum(len(chunk) for chunk in chunks),
+            "chunks": len(chunks),
+            "truncated": len(processed) < len(text) or chunk_limit_reached,
+        }
+        return chunks, report
+
+    @staticmethod
+    def extract_entities_from_chunks(
+        chunks: List[str], model_name: Optional[str] = None
+    ) -> List[EntityRecord]:
+        """
+        Extract distinct named entities from text chunks with one model.
+
+        The chunks are batched with the chunks of concurrent requests (see
+        `get_ner_batcher`), or streamed through `nlp.pipe` directly when
+        batching is disabled.
+
+        Args:
+            chunks: Text chunks (see `prepare_text`)
             model_name: The name of the model to use
 
         Returns:
-            List of extracted entities
+            List of distinct extracted entities in first-seen order
         """
-        # Get the model
+        model_name = model_name or DEFAULT_MODEL
+        if INFERENCE_BATCHING_ENABLED:
+            chunk_entities = NLPService.get_ner_batcher(model_name).submit_many(chunks)
+        else:
+            chunk_entities = NLPService._pipe_entities(chunks, model_name)
+
+        # Keep distinct entities in first-seen order
+        entities: Dict[EntityRecord, None] = {}
+        for records in chunk_entities:
+            for record in records:
+                entities.setdefault(record)
+        return list(entities)
+
+    @staticmethod
+    def _pipe_entities(
+        texts: List[str], model_name: str, batch_size: int = NER_BATCH_SIZE
+    ) -> List[List[EntityRecord]]:
+        """Run texts through a model and return the entities of each text."""
         nlp = ModelLoader.get_model(model_name)
+        if len(texts) == 1:
+            docs = [nlp(texts[0])]
+        else:
+            docs = nlp.pipe(texts, batch_size=batch_size)
+        return [
+            [EntityRecord(ent.text, ent.label_) for ent in doc.ents] for doc in docs
+        ]
 
-        # Process the text
-        doc = nlp(text)
+    @classmethod
+    def get_ner_batcher(cls, model_name: str) -> DynamicBatcher:
+        """
+        Get the batcher in front of a NER model.
 
-        # Extract entities
-        entities = [Entity(text=ent.text, label=ent.label_) for ent in doc.ents]
+        Args:
+            model_name: The name of the model
 
-        return entities
+        Returns:
+            Batcher running the chunks of concurrent requests through one
+            `nlp.pipe` call
+        """
+        batcher = cls._ner_batchers.get(model_name)
+        if batcher is None:
+            with cls._ner_batchers_lock:
+                batcher = cls._ner_batchers.get(model_name)
+                if batcher is None:
+                    batcher = DynamicBatcher(
+                        lambda texts: cls._pipe_entities(
+                            texts, model_name, batch_size=len(texts)
+                        ),
+                        NER_BATCH_MAX_ITEMS,
+                        NER_BATCH_MAX_WAIT_MS,
+                        name=f"ner-batcher-{model_name}",
+                    )
+                    cls._ner_batchers[model_name] = batcher
+        return batcher
 
     @staticmethod
-    def extract_distinct_entities_from_all_models(text: str) -> List[Entity]:
+    def extract_entities(
+        text: str, model_name: Optional[str] = None
+    ) -> List[EntityRecord]:
+        """
+        Extract named entities from text using spaCy.
+
+        Args:
+            text: The input text to analyze
+            model_name: The name of the model to use
+
+        Returns:
+            List of extracted entities
+        """
+        chunks, _ = NLPService.prepare_text(text)
+        return NLPService.extract_entities_from_chunks(chunks, model_name)
+
+    @staticmethod
+    def extract_distinct_entities_from_all_models(
+        text: str, request_context: Optional[RequestContext] = None
+    ) -> List[EntityRecord]:
         """
         Extract named entities from text using all available models and return a distinct set.
 
         Args:
             text: The input text to analyze
+            request_context: Request context; the entities of a text are then
+                extracted once per request, and only with the default model
+                when the request is short of time (a memoized text is never
+                a reason to degrade)
 
         Returns:
             List of distinct extracted entities from all models
@@ -49,26 +195,112 @@ class NLPService:
         # Get all available models
         models = ModelLoader.list_available_models()
 
+        if request_context is not None:
+            # Only degrade when NER will actually run
+            if (
+                len(models) > 1
+                and not request_context.is_memoized("entities", text)
+                and request_context.should_degrade(
+                    "fewer_ner_models", DEADLINE_NER_MIN_SECONDS
+                )
+            ):
+                models = [DEFAULT_MODEL]
+            return request_context.memoize(
+                "entities",
+                text,
+                lambda: NLPService._extract_distinct_entities(
+                    text, models, request_context
+                ),
+            )
+
+        return NLPService._extract_distinct_entities(text, models)
+
+    @staticmethod
+    def _extract_distinct_entities(
+        text: str,
+        models: List[str],
+        request_context: Optional[RequestContext] = None,
+    ) -> List[EntityRecord]:
+        """Extract the distinct entities found by some models in a text."""
+        # Bound and chunk the text once for all models
+        chunks, _ = NLPService.prepare_text(text, request_context)
+
         # Track all found entities
         all_entities = []
 
-        # Process text with each model
-        for model_name in models:
-            entities = NLPService.extract_entities(text, model_name)
-            all_entities.extend(entities)
+        if request_context is not None:
+            for model_name in models:
+                request_context.record_invocation(f"ner:{model_name}", [text])
 
-        # Create a set to store unique entities (text and label combination)
-        unique_entities = set()
-        distinct_entities = []
+        if INFERENCE_BATCHING_ENABLED:
+            # Queue the chunks on every model's batcher, so the models run
+            # concurrently, then collect in model order
+            pending = [
+                NLPService.get_ner_batcher(model_name).enqueue_many(chunks)
+                for model_name in models
+            ]
+            for futures in pending:
+                for future in futures:
+                    all_entities.extend(future.result())
+        else:
+            # Process text with each model
+            for model_name in models:
+                entities = NLPService.extract_entities_from_chunks(chunks, model_name)
+                all_entities.extend(entities)
 
-        # Filter to get distinct entities only
-        for entity in all_entities:
-            entity_tuple = (entity.text, entity.label)
-            if entity_tuple not in unique_entities:
-                unique_entities.add(entity_tuple)
-                distinct_entities.append(entity)
+        # Keep distinct (text, label) records in first-seen order
+        return list(dict.fromkeys(all_entities))
 
-        return distinct_entities
+    @staticmethod
+    def filter_skills(
+        entities: Iterable[EntityRecord], limit: Optional[int] = MAX_SKILLS_PER_TEXT
+    ) -> FrozenSet[str]:
+        """
+        Reduce entities to the set of skill texts.
+
+        Skills are normalized to their canonical form, so aliases such as
+        "JS" and "JavaScript" collapse into one skill.
+
+        Args:
+            entities: Extracted entities
+            limit: Maximum number of skills to keep (first found first), or
+                None to keep all
+
+        Returns:
+            Texts of the entities whose label denotes a skill
+        """
+        skills = dict.fromkeys(
+            SkillVocabularyService.canonicalize(e.text)
+            for e in entities
+            if e.label.upper() in SKILL_LABELS
+        )
+        return frozenset(list(skills)[:limit])
+
+    @staticmethod
+    def extract_skills(
+        text: str, request_context: Optional[RequestContext] = None
+    ) -> FrozenSet[str]:
+        """
+        Extract the skills of a text with all models.
+
+        Args:
+            text: The input text to analyze
+            request_context: Request context; the skills of a text are then extracted
+                once per request
+
+        Returns:
+            Canonical skill texts (see `filter_skills`)
+        """
+
+        def compute() -> FrozenSet[str]:
+            entities = NLPService.extract_distinct_entities_from_all_models(
+                text, request_context
+            )
+            return NLPService.filter_skills(entities)
+
+        if request_context is None:
+            return compute()
+        return request_context.memoize("skills", text, compute)
 
     @staticmethod
     def list_models() -> List[str]:
@@ -82,7 +314,11 @@ class NLPService:
 
     @staticmethod
     def compare_skills_semantic(
-        resume_text: str, job_description_text: str, threshold: float = 0.5
+        resume_text: str,
+        job_description_text: str,
+        threshold: float = 0.5,
+        job_artifacts: Optional[Dict[str, Any]] = None,
+        request_context: Optional[RequestContext] = None,
     ) -> dict:
         """
         Compare skills between resume and job description using semantic similarity.
@@ -91,37 +327,34 @@ class NLPService:
             resume_text: The resume text to analyze
             job_description_text: The job description text to analyze
             threshold: Similarity threshold for considering skills as a match
+            job_artifacts: Precomputed job description artifacts (see
+                `JobArtifactService`); their skills and skill embeddings are
+                reused instead of being recomputed
+            request_context: Request context memoizing the extracted skills and
+                embeddings
 
         Returns:
             Dictionary containing score, matched skills, missing skills, and matching details
         """
         # Extract skills from both texts using all models
-        resume_entities = NLPService.extract_distinct_entities_from_all_models(
-            resume_text
-        )
-        job_entities = NLPService.extract_distinct_entities_from_all_models(
-            job_description_text
-        )
-
-        # Filter for skills only
-        resume_skills = [
-            e.text
-            for e in resume_entities
-            if e.label.upper() in ("SKILL", "PRODUCT", "ORG", "GPE", "LANGUAGE")
-        ]
-        job_skills = [
-            e.text
-            for e in job_entities
-            if e.label.upper() in ("SKILL", "PRODUCT", "ORG", "GPE", "LANGUAGE")
-        ]
+        resume_skills = NLPService.extract_skills(resume_text, request_context)
 
-        # Convert to sets to remove duplicates
-        resume_skills_set = set(resume_skills)
-        job_skills_set = set(job_skills)
+        if job_artifacts is not None:
+            job_skills = frozenset(job_artifacts["job_skills"])
+            known_embeddings = job_artifacts["skill_embeddings"]
+        else:
+            job_skills = NLPService.extract_skills(
+                job_description_text, request_context
+            )
+            known_embeddings = None
 
         # Use similarity service to compute match score
         result = SimilarityService.semantic_matching_score(
-            job_skills_set, resume_skills_set, threshold=threshold
+            job_skills,
+            resume_skills,
+            threshold=threshold,
+            known_embeddings=known_embeddings,
+            request_context=request_context,
         )
 
         return result
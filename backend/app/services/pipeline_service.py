@@ -0,0 +1,361 @@
+"""
+Service running the full course recommendation pipeline for one request.
+
+Shared by the synchronous `/recommend-courses` endpoint and the job workers.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from ..core.config import DEADLINE_SCORING_MIN_SECONDS, MAX_SKILLS_PER_TEXT
+from ..models.records import EntityRecord
+from ..utils.request_context import RequestContext
+from ..utils.stage_graph import StageGraph, map_cpu
+from .analysis_service import AnalysisService
+from .cache_service import CacheService
+from .job_artifact_service import JobArtifactService
+from .nlp_service import NLPService
+from .rag_service import RAGService
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages, as reported to progress callbacks. The cache lookup runs
+# first; on a miss the next two start together and the others start once
+# their inputs are ready
+STAGES = (
+    "cache_lookup",
+    "resume_skills",
+    "job_artifacts",
+    "skill_matching",
+    "recommendation",
+    "course_scoring",
+    "storing",
+)
+
+
+class PipelineService:
+    """Service running the full course recommendation pipeline for one request."""
+
+    @staticmethod
+    def truncation_report(
+        reports: Dict[str, Dict[str, Any]],
+        entities: Dict[str, Iterable[EntityRecord]],
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Describe the inputs that hit a size cap.
+
+        Args:
+            reports: Report of each input's extraction (see
+                `NLPService.prepare_text`), keyed by field ("resume",
+                "job_description")
+            entities: Entities extracted from each input, with the same keys
+
+        Returns:
+            Truncation metadata for the capped inputs, or None if none were capped
+        """
+        truncation = {}
+        for name, report in reports.items():
+            skill_count = len(
+                NLPService.filter_skills(entities.get(name, []), limit=None)
+            )
+            report = {
+                **report,
+                "skill_limit_reached": skill_count > MAX_SKILLS_PER_TEXT,
+            }
+            if report["truncated"] or report["skill_limit_reached"]:
+                truncation[name] = report
+        return truncation or None
+
+    @staticmethod
+    def _from_cache(cached_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Turn a cached result into response data.
+
+        Args:
+            cached_result: Result returned by `CacheService.get_course_recommendation`
+
+        Returns:
+            Response data with a fresh analysis id, or a null one for a
+            near-duplicate hit, which carries no analysis
+        """
+        response_data = dict(cached_result)
+        analysis = response_data.pop("analysis", None)
+        response_data["analysis_id"] = (
+            AnalysisService.store(analysis) if analysis is not None else None
+        )
+        return response_data
+
+    @classmethod
+    def run(
+        cls,
+        resume_text: str,
+        job_description_text: str,
+        threshold: float = 0.5,
+        mode: str = "auto",
+        on_stage: Optional[Callable[[str], None]] = None,
+        timings: Optional[Dict[str, float]] = None,
+        deadline_seconds: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Recommend courses for a resume and job description.
+
+        The cache is looked up first, so a hit costs no NER, embedding or
+        upstream call. On a miss the stages run as a dependency graph (see
+        `app.utils.stage_graph`): resume NER and the job description artifacts
+        start together, and each later stage starts as soon as its inputs are
+        ready. Entities, skills and embeddings are memoized for the request
+        (see `RequestContext`), so each text goes through NER once.
+
+        With a deadline, stages that are short of time degrade (see
+        `app.utils.request_context.DEGRADATIONS`); the response lists the
+        degradations applied, and a degraded response is not cached.
+
+        Args:
+            resume_text: The resume text to analyze
+            job_description_text: The job description text to analyze
+            threshold: Similarity threshold for considering skills as a match
+            mode: Recommendation mode ("auto", "llm" or "deterministic")
+            on_stage: Called with the name of each stage (see `STAGES`) as
+                it starts
+            timings: Filled with the duration of each stage in milliseconds,
+                as each stage finishes
+            deadline_seconds: Time budget of the request (no deadline if None)
+
+        Returns:
+            Response data with the `CourseRecommendationResponse` fields
+        """
+
+        request_context = RequestContext(deadline_seconds)
+
+        if on_stage is not None:
+            on_stage("cache_lookup")
+        start = time.perf_counter()
+        cached_result = CacheService.get_course_recommendation(
+            resume_text, job_description_text, threshold, mode
+        )
+        if timings is not None:
+            timings["cache_lookup"] = round((time.perf_counter() - start) * 1000, 2)
+        if cached_result:
+            logger.info("Request: Returning cached course recommendations.")
+            request_context.close()
+            return cls._from_cache(cached_result)
+
+        def extract_resume_skills():
+            return NLPService.extract_skills(resume_text, request_context)
+
+        def match_skills(_resume_skills, job_artifacts):
+            # The resume skills are memoized by the resume_skills stage
+            return NLPService.compare_skills_semantic(
+                resume_text,
+                job_description_text,
+                threshold=threshold,
+                job_artifacts=job_artifacts,
+                request_context=request_context,
+            )
+
+        def recommend(skill_comparison, job_artifacts):
+            # Pass ALL job skills (matched and missing) as ground_truth_skills,
+            # not just missing skills
+            all_job_skills = set(
+                skill_comparison["matched_skills"] + skill_comparison["missing_skills"]
+            )
+            recommendations = RAGService.generate_course_recommendations(
+                job_description_text,
+                resume_text,
+                ground_truth_skills=all_job_skills,
+                mode=mode,
+                job_artifacts=job_artifacts,
+                request_context=request_context,
+            )
+            # The courses are selected: later stages running short of time
+            # no longer make this response retrieval-only
+            request_context.settle("retrieval_only")
+            return recommendations
+
+        def score_courses(skill_comparison, recommendations, job_artifacts):
+            if request_context.should_degrade(
+                "skip_course_scoring", DEADLINE_SCORING_MIN_SECONDS
+            ):
+                return None
+
+            # Only the course skills need to be compared with the job skills;
+            # the user skills are already scored
+            def course_vector(course):
+                course_skills = NLPService.extract_skills(
+                    course.get("description", ""), request_context
+                )
+                # Best similarity per job skill over the course's new skills
+                return AnalysisService.course_best_similarities(
+                    skill_comparison,
+                    sorted(course_skills),
+                    known_embeddings=job_artifacts["skill_embeddings"],
+                    request_context=request_context,
+                )
+
+            return map_cpu(course_vector, recommendations["recommended_courses"])
+
+        graph = StageGraph(timings)
+        graph.add("resume_skills", extract_resume_skills)
+        # Looks up (or computes once) everything derived from the job
+        # description alone; computing runs its own CPU and I/O stages
+        graph.add(
+            "job_artifacts",
+            lambda: JobArtifactService.get_artifacts(job_description_text),
+            kind="io",
+        )
+        graph.add(
+            "skill_matching", match_skills, deps=("resume_skills", "job_artifacts")
+        )
+        graph.add(
+            "recommendation",
+            recommend,
+            deps=("skill_matching", "job_artifacts"),
+            kind="io",
+        )
+        graph.add(
+            "course_scoring",
+            score_courses,
+            deps=("skill_matching", "recommendation", "job_artifacts"),
+            kind="io",
+        )
+
+        try:
+            # Returns once every started stage has finished, even on failure,
+            # so the request context is only closed after all of its work
+            results = graph.run(on_stage=on_stage)
+            return cls._build_response(
+                results,
+                resume_text,
+                job_description_text,
+                threshold,
+                mode,
+                request_context,
+                on_stage,
+                timings,
+            )
+        finally:
+            request_stats = request_context.stats()
+            logger.debug(
+                f"Request: Computed {request_stats['computed']}, reused "
+                f"{request_stats['reused']}"
+            )
+            request_context.close()
+
+    @classmethod
+    def _build_response(
+        cls,
+        results: Dict[str, Any],
+        resume_text: str,
+        job_description_text: str,
+        threshold: float,
+        mode: str,
+        request_context: RequestContext,
+        on_stage: Optional[Callable[[str], None]],
+        timings: Optional[Dict[str, float]],
+    ) -> Dict[str, Any]:
+        """
+        Score the courses, store the analysis and cache the response of a run.
+
+        Args:
+            results: Stage results of the run (see `run`)
+            resume_text: The resume text
+            job_description_text: The job description text
+            threshold: Similarity threshold for considering skills as a match
+            mode: Recommendation mode
+            request_context: Request context of the run
+            on_stage: Progress callback of the run
+            timings: Stage durations of the run
+
+        Returns:
+            Response data with the `CourseRecommendationResponse` fields
+        """
+        skill_comparison = results["skill_matching"]
+        recommendations = results["recommendation"]
+        course_vectors = results["course_scoring"]
+        job_artifacts = results["job_artifacts"]
+
+        # Get the original score
+        original_score = skill_comparison["score"]
+
+        # Add score to each recommended course, unless scoring was skipped
+        if course_vectors is None:
+            course_vectors = []
+            for course in recommendations["recommended_courses"]:
+                course["potential_score"] = None
+                course["score_improvement"] = None
+        for course, course_vector in zip(
+            recommendations["recommended_courses"], course_vectors
+        ):
+            potential_score = AnalysisService.score_vector(
+                AnalysisService.potential_vector(
+                    skill_comparison["similarity_matrix"], course_vector
+                ),
+                threshold,
+            )
+            course["potential_score"] = potential_score
+            course["score_improvement"] = max(0, potential_score - original_score)
+
+        # Prepare response data
+        response_data = {
+            "recommended_courses": recommendations["recommended_courses"],
+            "skill_gap": recommendations["skill_gap"],
+            "job_skills": recommendations["job_skills"],
+            "user_skills": recommendations["user_skills"],
+            "recommendations_text": recommendations["recommendations_text"],
+            "recommendation_mode": recommendations["recommendation_mode"],
+            "score": original_score,
+            "matched_skills": skill_comparison["matched_skills"],
+            "missing_skills": skill_comparison["missing_skills"],
+            "matching_details": [
+                m._asdict() for m in skill_comparison["matching_details"]
+            ],
+            "truncation": cls.truncation_report(
+                {
+                    # Both texts were prepared by their extraction already
+                    "resume": NLPService.prepare_text(resume_text, request_context)[1],
+                    "job_description": job_artifacts["truncation"],
+                },
+                {
+                    "resume": NLPService.extract_distinct_entities_from_all_models(
+                        resume_text, request_context
+                    ),
+                    "job_description": job_artifacts["job_entities"],
+                },
+            ),
+            "degradations": list(request_context.degradations),
+        }
+
+        # Keep the threshold-independent data for cheap re-thresholding
+        if on_stage is not None:
+            on_stage("storing")
+        start = time.perf_counter()
+        analysis = AnalysisService.build(
+            skill_comparison, course_vectors, response_data
+        )
+        analysis_id = AnalysisService.store(analysis)
+
+        # Cache the result for future requests, unless it is an error, fallback
+        # or degraded result that should be retried in full next time
+        if (
+            "error" in recommendations
+            or recommendations.get("fallback")
+            or request_context.degradations
+        ):
+            logger.info("Request: Error, fallback or degraded result, skipping cache.")
+        else:
+            logger.info("Request: Caching result for future requests...")
+            # The analysis id outlives neither its analysis nor its request:
+            # the cached result keeps the analysis itself (see `_from_cache`)
+            cache_success = CacheService.set_course_recommendation(
+                resume_text,
+                job_description_text,
+                threshold,
+                {**response_data, "analysis": analysis},
+                mode=mode,
+            )
+            logger.info(f"Request: Cache storage success: {cache_success}")
+        if timings is not None:
+            timings["storing"] = round((time.perf_counter() - start) * 1000, 2)
+
+        return {**response_data, "analysis_id": analysis_id}
@@ -2,37 +2,90 @@
 Service for Retrieval-Augmented Generation (RAG) based course recommendations.
 """
 
+import json
+import logging
 import re
 from typing import Any, Dict, List, Optional, Set, Tuple
 
-import cohere
+import httpx
+import urllib3
 from pinecone import Pinecone
-from sentence_transformers import SentenceTransformer
-
-from ..core.config import COHERE_API_KEY, PINECONE_API_KEY, PINECONE_INDEX_NAME
+from pinecone.exceptions import PineconeProtocolError
+
+from ..core.config import (
+    DEADLINE_LLM_MIN_SECONDS,
+    DEADLINE_SCORING_MIN_SECONDS,
+    LLM_TIMEOUT_SECONDS,
+    PINECONE_API_KEY,
+    PINECONE_HOST,
+    PINECONE_INDEX_NAME,
+    RECOMMENDATION_COUNT,
+    RETRIEVAL_TOP_K,
+)
+from ..utils.request_context import RequestContext
+from ..utils.stage_graph import map_io
+from .context_service import ContextService
+from .keyword_index_service import KeywordIndexService
+from .llm_service import LLMService, LLMUnavailableError
 from .nlp_service import NLPService
+from .recommendation_service import RecommendationService
+from .similarity_service import SimilarityService
+
+logger = logging.getLogger(__name__)
+
+# Short course ids as the prompt asks the LLM to cite them ("C1", "[C2]")
+COURSE_ID_PATTERN = re.compile(r"\bC\d+\b", re.IGNORECASE)
+# Numbered course titles of a free-text answer ("1. Title: reason")
+COURSE_TITLE_PATTERN = re.compile(r"\d+\.\s+([^:\n]+):")
 
 
 class RAGService:
     """Service for Retrieval-Augmented Generation (RAG) based course recommendations."""
 
-    _model = None
     _pc = None
     _index = None
     _dataset = None
 
     @classmethod
-    def _get_model(cls) -> SentenceTransformer:
+    def encode_query(cls, text: str) -> List[float]:
         """
-        Get or initialize the sentence transformer model.
+        Embed a retrieval query with the model shared with `SimilarityService`.
+
+        Goes through its batcher, so queries of concurrent requests are
+        encoded together.
+
+        Args:
+            text: The query text
 
         Returns:
-            The sentence transformer model instance
+            The query vector
         """
-        if cls._model is None:
-            # Using a pre-trained model that works well for semantic similarity
-            cls._model = SentenceTransformer("all-MiniLM-L6-v2")
-        return cls._model
+        return SimilarityService.get_embeddings([text])[0].tolist()
+
+    @staticmethod
+    def is_upstream_error(error: Exception) -> bool:
+        """
+        Return whether an error is a transient failure of Pinecone or the network.
+
+        Args:
+            error: The raised error
+
+        Returns:
+            True for 408, 429 and 5xx responses and for transport errors
+        """
+        status = getattr(error, "status_code", None) or getattr(error, "status", None)
+        if isinstance(status, int):
+            return status in (408, 429) or status >= 500
+        return isinstance(
+            error,
+            (
+                urllib3.exceptions.HTTPError,
+                httpx.TransportError,
+                PineconeProtocolError,
+                ConnectionError,
+                TimeoutError,
+            ),
+        )
 
     @classmethod
     def _get_pinecone_index(cls):
@@ -44,75 +97,118 @@ class RAGService:
         """
         if cls._pc is None or cls._index is None:
             cls._pc = Pinecone(api_key=PINECONE_API_KEY)
-            cls._index = cls._pc.Index(PINECONE_INDEX_NAME)
+            cls._index = cls._pc.Index(PINECONE_INDEX_NAME, host=PINECONE_HOST)
         return cls._index
 
+    @classmethod
+    def query_courses(cls, query_vector: List[float]) -> List[Dict[str, Any]]:
+        """
+        Retrieve the top courses for a query vector (metadata only).
+
+        Args:
+            query_vector: Embedding of the query text
+
+        Returns:
+            List of plain match dictionaries with id, score and metadata
+        """
+        index = cls._get_pinecone_index()
+        query_results = index.query(
+            vector=query_vector,
+            top_k=RETRIEVAL_TOP_K,
+            include_values=False,
+            include_metadata=True,
+        )["matches"]
+        return [
+            {
+                "id": match["id"],
+                "score": match["score"],
+                "metadata": dict(match["metadata"] or {}),
+            }
+            for match in query_results
+        ]
+
     @classmethod
     def augment_prompt(
         cls,
         job_description: str,
         user_data: str,
         ground_truth_skills: Optional[Set[str]] = None,
-    ) -> Tuple[str, List[str], Set[str], Set[str]]:
+        token_budget: Optional[int] = None,
+        job_artifacts: Optional[Dict[str, Any]] = None,
+        request_context: Optional[RequestContext] = None,
+    ) -> Tuple[str, List[Dict[str, Any]], Set[str], Set[str]]:
         """
         Generate an augmented prompt for the LLM using vector search results.
 
+        Courses retrieved for the job description are fused with the courses
+        the keyword index finds for the missing skills, then go through the
+        context assembly stage (dedupe, skill-gap reranking and token budget
+        packing) before they are pasted into the prompt.
+
         Args:
             job_description: Text of the job description
             user_data: Text of the user resume/profile
             ground_truth_skills: Optional set of predefined skills for the job
+            token_budget: Token budget for the course context (config default
+                if None, unbounded if 0 or less)
+            job_artifacts: Precomputed job description artifacts (see
+                `JobArtifactService`); their skills and course matches are
+                reused instead of being recomputed
+            request_context: Request context; skills already extracted for this
+                request (e.g. the resume's, during skill matching) are reused
 
         Returns:
             Tuple containing:
             - Augmented prompt for LLM
-            - List of relevant course descriptions from vector search
+            - Candidate courses from retrieval, ranked by skill-gap coverage
             - Set of job skills identified
             - Set of user skills identified
         """
-        # Get the model and convert job description to vector
-        model = cls._get_model()
-        results = model.encode(job_description).tolist()
-
-        # Get Pinecone index
-        index = cls._get_pinecone_index()
-
-        # Get top 50 results from knowledge base
-        query_results = index.query(
-            vector=results, top_k=50, include_values=True, include_metadata=True
-        )["matches"]
-        text_matches = [match["metadata"]["course_desc"] for match in query_results]
-
-        # Get the text from the results
-        courses = "\n\n".join(text_matches)
-
         # Extract skills using NLP service
         if ground_truth_skills is not None:
             # If ground truth skills are provided, use them directly
             job_skills = set(ground_truth_skills)
+        elif job_artifacts is not None:
+            job_skills = set(job_artifacts["job_skills"])
         else:
             # Otherwise extract job skills from the job description
-            job_entities = NLPService.extract_distinct_entities_from_all_models(
-                job_description
+            job_skills = set(
+                NLPService.extract_skills(job_description, request_context)
             )
-            job_skills = {
-                e.text
-                for e in job_entities
-                if e.label.upper() in ("SKILL", "PRODUCT", "ORG", "GPE", "LANGUAGE")
-            }
 
         # Extract user skills
-        user_entities = NLPService.extract_distinct_entities_from_all_models(user_data)
-        user_skills = {
-            e.text
-            for e in user_entities
-            if e.label.upper() in ("SKILL", "PRODUCT", "ORG", "GPE", "LANGUAGE")
-        }
+        user_skills = set(NLPService.extract_skills(user_data, request_context))
 
         # Calculate skill gap
         skill_gap = job_skills.difference(user_skills)
 
+        if job_artifacts is not None:
+            query_results = job_artifacts["course_matches"]
+        else:
+            # Convert the job description to a vector and get the top results
+            # from the knowledge base
+            query_results = cls.query_courses(cls.encode_query(job_description))
+
+        # Exact skill names the dense retrieval missed are found by keyword
+        keyword_results = KeywordIndexService.query_skills(skill_gap)
+        if keyword_results:
+            query_results = KeywordIndexService.fuse(query_results, keyword_results)
+
+        # Dedupe, rerank by skill-gap coverage and pack into the token budget
+        candidates, context_courses = ContextService.assemble(
+            query_results, skill_gap, token_budget, request_context
+        )
+
+        # Give each course in the context a short id the LLM can refer to
+        for i, course in enumerate(context_courses, start=1):
+            course["short_id"] = f"C{i}"
+        courses = "\n\n".join(
+            f"[{course['short_id']}] {course['context_text']}"
+            for course in context_courses
+        )
+
         # Create an augmented prompt
-        improved_prompt = f"""Based on the list of courses provided below, recommend the 5 most relevant courses that best address the skill gaps between the candidate's current abilities and the skills required for the job listing. Prioritize courses that are both highly relevant to the missing skills and well-aligned with the job requirements.
+        improved_prompt = f"""Based on the list of courses provided below, recommend the {RECOMMENDATION_COUNT} most relevant courses that best address the skill gaps between the candidate's current abilities and the skills required for the job listing. Prioritize courses that are both highly relevant to the missing skills and well-aligned with the job requirements.
         
         Courses:
         {courses}
@@ -122,11 +218,37 @@ class RAGService:
         
         Job listing: {job_description}
         
-        Format your response as a numbered list (1-5) with each course presented as:
-        1. [Course Title]: Brief explanation of why this course addresses the skill gap
+        Respond with JSON only, best course first, referring to courses by the id in square brackets:
+        {{"recommendations": [{{"id": "C1", "reason": "Brief explanation of why this course addresses the skill gap"}}]}}
         """
 
-        return improved_prompt, text_matches, job_skills, user_skills
+        logger.info(
+            f"Prompt: {len(query_results)} retrieved, "
+            f"{len(context_courses)} in context, {len(improved_prompt)} chars, "
+            f"~{ContextService.estimate_tokens(improved_prompt)} tokens"
+        )
+
+        return improved_prompt, candidates, job_skills, user_skills
+
+    @classmethod
+    def chat_with_timing(
+        cls, prompt: str, timeout: float = LLM_TIMEOUT_SECONDS
+    ) -> Tuple[str, Dict[str, float]]:
+        """
+        Stream a chat completion and measure its latency.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            timeout: Total seconds allowed, including retries
+
+        Returns:
+            Tuple of the generated text and a dictionary with the prompt size,
+            time to first token and total time (seconds)
+
+        Raises:
+            LLMUnavailableError: If the LLM cannot answer within its deadline
+        """
+        return LLMService.generate(prompt, timeout=timeout, json_mode=True)
 
     @classmethod
     def generate_course_recommendations(
@@ -134,6 +256,9 @@ class RAGService:
         job_description: str,
         user_data: str,
         ground_truth_skills: Optional[Set[str]] = None,
+        mode: str = "auto",
+        job_artifacts: Optional[Dict[str, Any]] = None,
+        request_context: Optional[RequestContext] = None,
     ) -> Dict[str, Any]:
         """
         Generate course recommendations based on skill gap between job requirements and user resume.
@@ -142,40 +267,120 @@ class RAGService:
             job_description: Text of the job description
             user_data: Text of the user resume/profile
             ground_truth_skills: Optional set of predefined skills for the job
+            mode: "llm" to always use the LLM, "deterministic" to select courses
+                by skill-gap coverage without an LLM, or "auto" to use the LLM
+                and fall back to deterministic selection when it is unavailable,
+                fails or is too slow. Even in "llm" mode, retrieval-only
+                results are returned while the LLM circuit breaker is open or
+                the request is short of time
+            job_artifacts: Precomputed job description artifacts
+            request_context: Request context memoizing extracted skills and
+                embeddings; its deadline bounds the LLM call
 
         Returns:
-            Dictionary containing course recommendations and related information
+            Dictionary containing course recommendations and related information,
+            with an `error` key if they could not be generated
+
+        Raises:
+            Exception: Upstream failures (see `is_upstream_error`), which are
+                worth retrying, and any failure in "llm" mode
         """
         try:
             # Generate augmented prompt using vector search
-            augmented_prompt, source_knowledge, job_skills, user_skills = (
-                cls.augment_prompt(job_description, user_data, ground_truth_skills)
+            augmented_prompt, candidates, job_skills, user_skills = cls.augment_prompt(
+                job_description,
+                user_data,
+                ground_truth_skills,
+                job_artifacts=job_artifacts,
+                request_context=request_context,
             )
 
-            # Call Cohere API for LLM-generated recommendations
-            co = cohere.Client(api_key=COHERE_API_KEY)
-            response = co.chat(
-                model="command-r-plus",
-                message=augmented_prompt,
-            )
-
-            # Extract course recommendations from the response
-            recommended_courses = cls.extract_course_recommendations(response.text)
-
             # Calculate skill gap
-            skill_gap = list(job_skills.difference(user_skills))
+            skill_gap = job_skills.difference(user_skills)
 
-            return {
-                "recommended_courses": recommended_courses,
-                "skill_gap": skill_gap,
+            result = {
+                "skill_gap": list(skill_gap),
                 "job_skills": list(job_skills),
                 "user_skills": list(user_skills),
-                "recommendations_text": response.text,
+                "recommendation_mode": "llm",
+                "fallback": False,
             }
 
+            if mode == "auto" and not LLMService.is_configured():
+                logger.info("LLM: No API key configured, using deterministic mode")
+                mode = "deterministic"
+
+            if (
+                mode != "deterministic"
+                and request_context is not None
+                and request_context.should_degrade(
+                    "retrieval_only", DEADLINE_LLM_MIN_SECONDS
+                )
+            ):
+                logger.info("LLM: Request short of time, using deterministic mode")
+                mode = "deterministic"
+
+            if mode != "deterministic":
+                timeout = LLM_TIMEOUT_SECONDS
+                remaining = request_context.remaining() if request_context else None
+                if remaining is not None:
+                    # Leave time to score the recommended courses
+                    timeout = min(timeout, remaining - DEADLINE_SCORING_MIN_SECONDS)
+                try:
+                    # Call Cohere API for LLM-generated recommendations
+                    recommendations_text, llm_stats = cls.chat_with_timing(
+                        augmented_prompt, timeout
+                    )
+                    logger.info(
+                        f"LLM: ~{llm_stats['prompt_tokens']:.0f} prompt tokens, "
+                        f"TTFT {llm_stats['time_to_first_token']:.2f}s, "
+                        f"total {llm_stats['total_time']:.2f}s"
+                    )
+
+                    # Resolve the structured output against the retrieved courses,
+                    # falling back to title matching if it cites no course id
+                    structured = cls.parse_structured_recommendations(
+                        recommendations_text, candidates
+                    )
+                    if structured is not None:
+                        recommended_courses, recommendations_text = structured
+                    else:
+                        logger.warning("LLM: No course ids, matching titles instead")
+                        recommended_courses = cls.extract_course_recommendations(
+                            recommendations_text, candidates
+                        )
+                    if recommended_courses:
+                        result["recommended_courses"] = recommended_courses
+                        result["recommendations_text"] = recommendations_text
+                        return result
+                    logger.warning(
+                        "LLM: Response references no known course, "
+                        "falling back to deterministic mode"
+                    )
+                    result["fallback"] = True
+                except LLMUnavailableError as e:
+                    logger.warning(f"LLM: Falling back to deterministic mode: {e}")
+                    result["fallback"] = True
+                    if timeout < LLM_TIMEOUT_SECONDS and not (
+                        request_context.has_budget(DEADLINE_LLM_MIN_SECONDS)
+                    ):
+                        # The request deadline cut the LLM call short
+                        request_context.degrade("retrieval_only")
+                except Exception as e:
+                    if mode == "llm":
+                        raise
+                    logger.warning(f"LLM: Falling back to deterministic mode: {e}")
+                    result["fallback"] = True
+
+            # Select courses by skill-gap coverage without an LLM
+            result.update(RecommendationService.recommend(candidates, skill_gap))
+            result["recommendation_mode"] = "deterministic"
+            return result
+
         except Exception as e:
-            # Log the error
-            print(f"Error generating course recommendations: {str(e)}")
+            if mode == "llm" or cls.is_upstream_error(e):
+                raise
+            logger.error(f"Error generating course recommendations: {e}")
             # Return a graceful failure response
             return {
                 "recommended_courses": [],
@@ -183,71 +388,125 @@ class RAGService:
                 "job_skills": [],
                 "user_skills": [],
                 "recommendations_text": f"Error generating recommendations: {str(e)}",
+                "recommendation_mode": "deterministic" if mode == "deterministic" else "llm",
+                "fallback": False,
                 "error": str(e),
             }
 
     @classmethod
-    def extract_course_recommendations(cls, llm_response: str) -> List[Dict[str, str]]:
+    def parse_structured_recommendations(
+        cls, llm_response: str, candidates: List[Dict[str, Any]]
+    ) -> Optional[Tuple[List[Dict[str, str]], str]]:
         """
-        Extract course information from LLM response.
+        Resolve a JSON LLM response that references courses by short id.
+
+        A response that is not valid JSON (e.g. cut off mid-object) still
+        yields the short ids it mentions, in order, without reasons.
 
         Args:
             llm_response: The text response from the LLM
+            candidates: Candidate courses returned by `augment_prompt`
 
         Returns:
-            List of dictionaries containing course name and URL
+            Tuple of the recommended courses and a numbered, human-readable
+            rendering of the recommendations, or None if the response
+            references no known course
         """
-        # Extract course names using regex
-        course_pattern = r"\d+\.\s+([^:]+):"
-        courses_names = re.findall(course_pattern, llm_response)
-
-        # Get the Pinecone index for searching
-        index = cls._get_pinecone_index()
+        by_id = {c["short_id"]: c for c in candidates if "short_id" in c}
+
+        # Tolerate code fences or text around the JSON object
+        items = None
+        start, end = llm_response.find("{"), llm_response.rfind("}")
+        if start != -1 and end > start:
+            try:
+                items = json.loads(llm_response[start : end + 1])["recommendations"]
+            except (ValueError, KeyError, TypeError):
+                items = None
+        if not isinstance(items, list):
+            items = [
+                {"id": short_id} for short_id in COURSE_ID_PATTERN.findall(llm_response)
+            ]
 
         courses_data = []
-        for course_name in courses_names:
-            course_name = course_name.strip()
-            # Create a search vector for the course name
-            model = cls._get_model()
-            query_vector = model.encode(course_name).tolist()
+        lines = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            short_id = str(item.get("id", "")).strip(" []").upper()
+            course = by_id.pop(short_id, None)
+            if course is None:
+                continue
+            courses_data.append(
+                {
+                    "course_name": course.get("Title", ""),
+                    "url": course.get("url", ""),
+                    "description": course.get("course_desc", ""),
+                }
+            )
+            line = f"{len(courses_data)}. {course.get('Title', '')}"
+            reason = str(item.get("reason", "")).strip()
+            lines.append(f"{line}: {reason}" if reason else line)
+            if len(courses_data) >= RECOMMENDATION_COUNT:
+                break
+
+        if not courses_data:
+            return None
+        return courses_data, "\n".join(lines)
+
+    @classmethod
+    def extract_course_recommendations(
+        cls, llm_response: str, candidates: List[Dict[str, Any]]
+    ) -> List[Dict[str, str]]:
+        """
+        Extract course information from a free-text LLM response.
+
+        Last resort when the response cites no course id: the numbered titles
+        it lists are matched against the candidate courses, and titles that
+        match none are looked up in Pinecone.
+
+        Args:
+            llm_response: The text response from the LLM
+            candidates: Candidate courses returned by `augment_prompt`
+
+        Returns:
+            List of dictionaries containing course name, URL and description
+        """
+        # Extract course names using regex
+        courses_names = [
+            name.strip(" *[]")
+            for name in COURSE_TITLE_PATTERN.findall(llm_response)
+        ][:RECOMMENDATION_COUNT]
 
+        def lookup(course_name: str) -> Dict[str, str]:
             # Search for the course in Pinecone without filtering
-            results = index.query(
-                vector=query_vector,
+            results = cls._get_pinecone_index().query(
+                vector=cls.encode_query(course_name),
                 top_k=10,
                 include_metadata=True,
             )["matches"]
+            metadata = [dict(result["metadata"] or {}) for result in results]
+            # Prefer a title containing the course name, else the best match
+            for course in metadata:
+                if course_name.lower() in course.get("Title", "").lower():
+                    return course
+            return metadata[0] if metadata else {}
+
+        def resolve(course_name: str) -> Dict[str, str]:
+            course = next(
+                (
+                    candidate
+                    for candidate in candidates
+                    if course_name.lower() in candidate.get("Title", "").lower()
+                ),
+                None,
+            )
+            if course is None:
+                course = lookup(course_name)
+            return {
+                "course_name": course_name,
+                "url": course.get("url", ""),
+                "description": course.get("course_desc", ""),
+            }
 
-            # Filter results programmatically
-            found_match = False
-            for result in results:
-                title = result["metadata"].get("Title", "")
-                # Check if the course_name is part of the title (case-insensitive)
-                if course_name.lower() in title.lower():
-                    courses_data.append(
-                        {
-                            "course_name": course_name,
-                            "url": result["metadata"].get("url", ""),
-                            "description": result["metadata"].get("course_desc", ""),
-                        }
-                    )
-                    found_match = True
-                    break
-
-            # If no match found, use the best semantic match
-            if not found_match and results:
-                best_match = results[0]
-                courses_data.append(
-                    {
-                        "course_name": course_name,
-                        "url": best_match["metadata"].get("url", ""),
-                        "description": best_match["metadata"].get("course_desc", ""),
-                    }
-                )
-            elif not found_match:
-                # Fallback: add without URL if nothing found
-                courses_data.append(
-                    {"course_name": course_name, "url": "", "description": ""}
-                )
-
-        return courses_data
+        # Names missing from the candidates need lookups, which run concurrently
+        return map_io(resolve, [name for name in courses_names if name])
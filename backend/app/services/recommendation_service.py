@@ -0,0 +1,131 @@
+"""
+Service for deterministic (LLM-free) course recommendations.
+"""
+
+from typing import Any, Dict, List, Set
+
+from ..core.config import CONTEXT_COVERAGE_THRESHOLD, RECOMMENDATION_COUNT
+
+
+class RecommendationService:
+    """Service for deterministic (LLM-free) course recommendations."""
+
+    @staticmethod
+    def select_by_coverage(
+        candidates: List[Dict[str, Any]],
+        skill_gap: Set[str],
+        count: int = RECOMMENDATION_COUNT,
+        threshold: float = CONTEXT_COVERAGE_THRESHOLD,
+    ) -> List[Dict[str, Any]]:
+        """
+        Pick the courses that together cover the most of the skill gap.
+
+        Greedy weighted set cover: at each step the course whose skills add the
+        most similarity mass over still-uncovered gap skills is chosen. Once no
+        course adds coverage, remaining slots are filled by coverage score.
+
+        Args:
+            candidates: Candidate courses annotated with `gap_coverage`
+                (see `ContextService.rank_by_gap_coverage`)
+            skill_gap: Job skills missing from the resume
+            count: Number of courses to select
+            threshold: Similarity at which a gap skill counts as covered
+
+        Returns:
+            Selected courses, each annotated with the `new_skills` it covers
+        """
+        gap_list = sorted(skill_gap)
+        uncovered = set(range(len(gap_list)))
+        remaining = [c for c in candidates if c.get("gap_coverage")]
+        selected = []
+
+        while remaining and uncovered and len(selected) < count:
+            best_course, best_gain = None, 0.0
+            for course in remaining:
+                coverage = course["gap_coverage"]
+                gain = sum(coverage[i] for i in uncovered if coverage[i] >= threshold)
+                if gain > best_gain:
+                    best_course, best_gain = course, gain
+
+            if best_course is None:
+                break
+
+            coverage = best_course["gap_coverage"]
+            newly_covered = {i for i in uncovered if coverage[i] >= threshold}
+            best_course["new_skills"] = [gap_list[i] for i in sorted(newly_covered)]
+            uncovered -= newly_covered
+            remaining.remove(best_course)
+            selected.append(best_course)
+
+        # Fill the remaining slots with the best ranked candidates
+        for course in candidates:
+            if len(selected) >= count:
+                break
+            if course not in selected:
+                course["new_skills"] = []
+                selected.append(course)
+
+        return selected
+
+    @staticmethod
+    def explain(courses: List[Dict[str, Any]]) -> str:
+        """
+        Render a numbered explanation for deterministically selected courses.
+
+        The format mirrors the one requested from the LLM so clients can
+        display either without changes.
+
+        Args:
+            courses: Courses returned by `select_by_coverage`
+
+        Returns:
+            Explanation text
+        """
+        lines = []
+        for i, course in enumerate(courses, start=1):
+            new_skills = course.get("new_skills") or []
+            also_covered = [
+                s for s in course.get("covered_skills", []) if s not in new_skills
+            ]
+            if new_skills:
+                reason = f"Covers {', '.join(new_skills)} from your skill gap"
+                if also_covered:
+                    reason += f", and reinforces {', '.join(also_covered)}"
+                reason += "."
+            elif also_covered:
+                reason = f"Reinforces {', '.join(also_covered)} from your skill gap."
+            else:
+                reason = "Closely related to the requirements of the job listing."
+            lines.append(f"{i}. {course.get('Title', '')}: {reason}")
+        return "\n".join(lines)
+
+    @classmethod
+    def recommend(
+        cls,
+        candidates: List[Dict[str, Any]],
+        skill_gap: Set[str],
+        count: int = RECOMMENDATION_COUNT,
+    ) -> Dict[str, Any]:
+        """
+        Build recommendations from candidate courses without calling an LLM.
+
+        Args:
+            candidates: Candidate courses annotated with `gap_coverage`
+            skill_gap: Job skills missing from the resume
+            count: Number of courses to recommend
+
+        Returns:
+            Dictionary with `recommended_courses` and `recommendations_text`
+        """
+        selected = cls.select_by_coverage(candidates, skill_gap, count=count)
+        return {
+            "recommended_courses": [
+                {
+                    "course_name": course.get("Title", ""),
+                    "url": course.get("url", ""),
+                    "description": course.get("course_desc", ""),
+                }
+                for course in selected
+            ],
+            "recommendations_text": cls.explain(selected),
+        }
@@ -2,29 +2,71 @@
 Service for similarity comparison using sentence transformers.
 """
 
-from typing import Dict, List, Optional, Set
+import random
+import threading
+from typing import Dict, List, Optional, Set, Tuple
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from ..core.config import (
+    CASCADE_AUDIT_RATE,
+    CASCADE_LOWER_MARGIN,
+    CASCADE_UPPER_MARGIN,
+    EMBEDDING_BATCH_MAX_ITEMS,
+    EMBEDDING_BATCH_MAX_WAIT_MS,
+    INFERENCE_BATCHING_ENABLED,
+    SIMILARITY_CASCADE_ENABLED,
+    WORD_VECTOR_MODEL,
+)
+from ..models.records import MatchRecord
+from ..utils.batcher import DynamicBatcher
+from ..utils.embedder import load_embedder
+from ..utils.loader import ModelLoader
+from ..utils.request_context import RequestContext
+from .skill_vocabulary_service import SkillVocabularyService
+
 
 class SimilarityService:
     """Service for similarity comparison using sentence transformers."""
 
     _model = None
+    _lock = threading.Lock()
+    _batcher: Optional[DynamicBatcher] = None
+
+    # Word-vector cascade settings (see `configure_cascade`)
+    _cascade_enabled = SIMILARITY_CASCADE_ENABLED
+    _cascade_margins = (CASCADE_LOWER_MARGIN, CASCADE_UPPER_MARGIN)
+    _cascade_audit_rate = CASCADE_AUDIT_RATE
+
+    # Cascade counters for this process
+    _cascade_stats = {
+        "pairs": 0,
+        "word_vector_pairs": 0,
+        "transformer_pairs": 0,
+        # Word-vector pairs re-scored for another threshold (see `rescore_pairs`)
+        "rescored_pairs": 0,
+        "audited_pairs": 0,
+        "agreed_pairs": 0,
+    }
+    _stats_lock = threading.Lock()
 
     @classmethod
-    def get_model(cls) -> SentenceTransformer:
+    def get_model(cls):
         """
-        Get or initialize the sentence transformer model.
+        Get or initialize the sentence embedding model.
+
+        The backend (PyTorch or ONNX Runtime) is chosen by EMBEDDING_BACKEND.
+        The instance is shared by every service that embeds text.
 
         Returns:
-            The sentence transformer model instance
+            The sentence embedding model instance
         """
         if cls._model is None:
-            # Using a pre-trained model that works well for semantic similarity
-            cls._model = SentenceTransformer("all-MiniLM-L6-v2")
+            with cls._lock:
+                if cls._model is None:
+                    # A pre-trained model that works well for semantic similarity
+                    cls._model = load_embedder()
         return cls._model
 
     @classmethod
@@ -32,6 +74,10 @@ class SimilarityService:
         """
         Get embeddings for a list of texts.
 
+        Small lists are batched with the texts of concurrent requests (see
+        `get_batcher`); lists that fill a batch on their own are encoded
+        directly.
+
         Args:
             texts: List of strings to encode
 
@@ -39,8 +85,30 @@ class SimilarityService:
             Array of embeddings
         """
         model = cls.get_model()
-        embeddings = model.encode(texts)
-        return embeddings
+        if not INFERENCE_BATCHING_ENABLED or len(texts) >= EMBEDDING_BATCH_MAX_ITEMS:
+            return model.encode(texts)
+        if not texts:
+            return np.zeros((0, model.get_sentence_embedding_dimension()))
+        return np.stack(cls.get_batcher().submit_many(texts))
+
+    @classmethod
+    def get_batcher(cls) -> DynamicBatcher:
+        """
+        Get the batcher in front of the sentence embedding model.
+
+        Returns:
+            Batcher encoding the texts of concurrent requests together
+        """
+        if cls._batcher is None:
+            with cls._lock:
+                if cls._batcher is None:
+                    cls._batcher = DynamicBatcher(
+                        lambda texts: cls.get_model().encode(texts),
+                        EMBEDDING_BATCH_MAX_ITEMS,
+                        EMBEDDING_BATCH_MAX_WAIT_MS,
+                        name="embedding-batcher",
+                    )
+        return cls._batcher
 
     @classmethod
     def get_avg_vector(
@@ -75,6 +143,458 @@ class SimilarityService:
         embeddings = cls.get_embeddings([text1, text2])
         return cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
 
+    @classmethod
+    def configure_cascade(
+        cls,
+        enabled: bool,
+        lower_margin: float = CASCADE_LOWER_MARGIN,
+        upper_margin: float = CASCADE_UPPER_MARGIN,
+        audit_rate: float = CASCADE_AUDIT_RATE,
+    ) -> None:
+        """
+        Change the word-vector cascade settings and reset its statistics.
+
+        Wider margins send more pairs to the transformer: more accurate, but
+        slower. Zero margins decide every pair with a word vector by the word
+        vectors alone.
+
+        Args:
+            enabled: Whether to use the cascade at all
+            lower_margin: Width of the uncertain band below the threshold
+            upper_margin: Width of the uncertain band above the threshold
+            audit_rate: Fraction of calls also scored by the transformer alone
+                to measure agreement
+        """
+        cls._cascade_enabled = enabled
+        cls._cascade_margins = (lower_margin, upper_margin)
+        cls._cascade_audit_rate = audit_rate
+        with cls._stats_lock:
+            for name in cls._cascade_stats:
+                cls._cascade_stats[name] = 0
+
+    @classmethod
+    def get_cascade_stats(cls) -> Dict[str, float]:
+        """
+        Report how many pairs each cascade tier decided and how often the
+        word-vector decisions agreed with the transformer on audited calls.
+
+        Returns:
+            Dictionary of counters and rates
+        """
+        with cls._stats_lock:
+            stats = dict(cls._cascade_stats)
+        stats["enabled"] = cls._cascade_enabled
+        stats["lower_margin"], stats["upper_margin"] = cls._cascade_margins
+        stats["word_vector_share"] = (
+            round(stats["word_vector_pairs"] / stats["pairs"], 4)
+            if stats["pairs"]
+            else 0.0
+        )
+        stats["agreement_rate"] = (
+            round(stats["agreed_pairs"] / stats["audited_pairs"], 4)
+            if stats["audited_pairs"]
+            else None
+        )
+        return stats
+
+    @classmethod
+    def word_vectors(cls, skills: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Get normalized averaged word vectors from the loaded spaCy vocab.
+
+        Args:
+            skills: Skill texts
+
+        Returns:
+            Vector by skill text, for the skills with at least one known word
+            (empty if the model has no vectors table)
+        """
+        vocab = ModelLoader.get_model(WORD_VECTOR_MODEL).vocab
+        if vocab.vectors.shape[0] == 0:
+            return {}
+
+        vectors = {}
+        for skill in skills:
+            words = {
+                word: vocab.get_vector(word)
+                for word in skill.lower().split()
+                if vocab.has_vector(word)
+            }
+            vector = cls.get_avg_vector(skill, words)
+            norm = np.linalg.norm(vector) if vector is not None else 0.0
+            if norm > 0:
+                vectors[skill] = (vector / norm).astype(np.float32)
+        return vectors
+
+    @classmethod
+    def embed_skills(
+        cls,
+        skills: List[str],
+        known_embeddings: Optional[Dict[str, np.ndarray]] = None,
+        request_context: Optional[RequestContext] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get the sentence embeddings of skills, encoding as few as possible.
+
+        Embeddings come from `known_embeddings`, then from the vocabulary's
+        precomputed matrix, and only the remaining skills are encoded in one
+        batch (once per request, and counted in its invocations, when a request
+        context is given).
+
+        Args:
+            skills: Skill texts
+            known_embeddings: Precomputed embeddings by skill text
+            request_context: Request context memoizing the encoded skills
+
+        Returns:
+            Embedding by skill text
+        """
+        known_embeddings = known_embeddings or {}
+        missing = [s for s in dict.fromkeys(skills) if s not in known_embeddings]
+        embeddings = {
+            **known_embeddings,
+            **SkillVocabularyService.lookup_embeddings(missing),
+        }
+        unknown_skills = [s for s in missing if s not in embeddings]
+        if unknown_skills and request_context is not None:
+
+            def encode(skills: List[str]) -> np.ndarray:
+                request_context.record_invocation("embedding", skills)
+                return cls.get_embeddings(skills)
+
+            embeddings.update(
+                request_context.memoize_many("embeddings", unknown_skills, encode)
+            )
+        elif unknown_skills:
+            embeddings.update(zip(unknown_skills, cls.get_embeddings(unknown_skills)))
+        return embeddings
+
+    @classmethod
+    def _transformer_similarities(
+        cls,
+        job_skills: List[str],
+        user_skills: List[str],
+        known_embeddings: Optional[Dict[str, np.ndarray]] = None,
+        request_context: Optional[RequestContext] = None,
+    ) -> np.ndarray:
+        """
+        Compute job x user cosine similarities with the sentence embeddings.
+
+        Skills without a known or vocabulary embedding are encoded, once per
+        request when a request context is given.
+        """
+        all_skills = job_skills + user_skills
+
+        # Get embeddings for all skills at once (more efficient)
+        embedded = cls.embed_skills(all_skills, known_embeddings, request_context)
+        embeddings = np.array([embedded[s] for s in all_skills])
+
+        # Split embeddings back into job and user skills
+        job_embeddings = embeddings[: len(job_skills)]
+        user_embeddings = embeddings[len(job_skills) :]
+        return cosine_similarity(job_embeddings, user_embeddings).astype(np.float32)
+
+    @classmethod
+    def _cascade_similarities(
+        cls,
+        job_skills: List[str],
+        user_skills: List[str],
+        threshold: float,
+        known_embeddings: Optional[Dict[str, np.ndarray]] = None,
+        request_context: Optional[RequestContext] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute job x user similarities, using the transformer only when needed.
+
+        Every pair is first scored with averaged word vectors. Pairs inside the
+        uncertain band around the threshold, or with a skill that has no word
+        vector, are re-scored with the transformer; only their skills are
+        embedded. Returns the matrix and the mask of the pairs the word vectors
+        decided.
+        """
+        vectors = cls.word_vectors(list(dict.fromkeys(job_skills + user_skills)))
+        matrix = np.full((len(job_skills), len(user_skills)), np.nan, np.float32)
+
+        rows = [i for i, skill in enumerate(job_skills) if skill in vectors]
+        cols = [j for j, skill in enumerate(user_skills) if skill in vectors]
+        if rows and cols:
+            matrix[np.ix_(rows, cols)] = np.array(
+                [vectors[job_skills[i]] for i in rows]
+            ) @ np.array([vectors[user_skills[j]] for j in cols]).T
+
+        lower_margin, upper_margin = cls._cascade_margins
+        uncertain = np.isnan(matrix) | (
+            (matrix >= threshold - lower_margin) & (matrix < threshold + upper_margin)
+        )
+
+        uncertain_rows = np.flatnonzero(uncertain.any(axis=1))
+        uncertain_cols = np.flatnonzero(uncertain.any(axis=0))
+        if uncertain_rows.size:
+            block = np.ix_(uncertain_rows, uncertain_cols)
+            transformer = cls._transformer_similarities(
+                [job_skills[i] for i in uncertain_rows],
+                [user_skills[j] for j in uncertain_cols],
+                known_embeddings,
+                request_context,
+            )
+            merged = matrix[block]
+            merged[uncertain[block]] = transformer[uncertain[block]]
+            matrix[block] = merged
+
+        audited = agreed = 0
+        if random.random() < cls._cascade_audit_rate:
+            reference = cls._transformer_similarities(
+                job_skills, user_skills, known_embeddings, request_context
+            )
+            confident = ~uncertain
+            audited = int(confident.sum())
+            agreed = int(
+                ((matrix >= threshold) == (reference >= threshold))[confident].sum()
+            )
+
+        with cls._stats_lock:
+            stats = cls._cascade_stats
+            stats["pairs"] += int(matrix.size)
+            stats["transformer_pairs"] += int(uncertain.sum())
+            stats["word_vector_pairs"] += int(matrix.size - uncertain.sum())
+            stats["audited_pairs"] += audited
+            stats["agreed_pairs"] += agreed
+
+        return matrix, ~uncertain
+
+    @classmethod
+    def rescore_pairs(
+        cls,
+        job_skills: List[str],
+        user_skills: List[str],
+        matrix: np.ndarray,
+        word_vector_pairs: np.ndarray,
+        threshold: float,
+        request_context: Optional[RequestContext] = None,
+    ) -> int:
+        """
+        Re-score the word-vector pairs that are uncertain at a new threshold.
+
+        A word-vector similarity is only trusted clearly away from the
+        threshold it was decided at. Pairs whose word-vector similarity falls
+        inside the uncertain band around `threshold` get their transformer
+        similarity instead; the others keep deciding the same way.
+
+        Args:
+            job_skills: Job skills, in the matrix row order
+            user_skills: User skills, in the matrix column order
+            matrix: Job x user similarities; updated in place
+            word_vector_pairs: Mask of the pairs decided by word vectors (see
+                `similarity_matrix_with_tiers`); re-scored pairs are cleared
+            threshold: The new threshold
+            request_context: Request context memoizing the encoded skills
+
+        Returns:
+            Number of re-scored pairs
+        """
+        lower_margin, upper_margin = cls._cascade_margins
+        uncertain = word_vector_pairs & (
+            (matrix >= threshold - lower_margin) & (matrix < threshold + upper_margin)
+        )
+        rows = np.flatnonzero(uncertain.any(axis=1))
+        if not rows.size:
+            return 0
+
+        cols = np.flatnonzero(uncertain.any(axis=0))
+        block = np.ix_(rows, cols)
+        transformer = cls._transformer_similarities(
+            [job_skills[i] for i in rows],
+            [user_skills[j] for j in cols],
+            request_context=request_context,
+        )
+        merged = matrix[block]
+        merged[uncertain[block]] = transformer[uncertain[block]]
+        matrix[block] = merged
+        word_vector_pairs &= ~uncertain
+
+        rescored = int(uncertain.sum())
+        with cls._stats_lock:
+            cls._cascade_stats["rescored_pairs"] += rescored
+        return rescored
+
+    @classmethod
+    def similarity_matrix(
+        cls,
+        job_skills: List[str],
+        user_skills: List[str],
+        known_embeddings: Optional[Dict[str, np.ndarray]] = None,
+        threshold: Optional[float] = None,
+        request_context: Optional[RequestContext] = None,
+    ) -> np.ndarray:
+        """
+        Compute the cosine similarity of every job skill with every user skill.
+
+        See `similarity_matrix_with_tiers`, whose matrix this returns.
+
+        Args:
+            job_skills: Ordered list of job skills
+            user_skills: Ordered list of user skills
+            known_embeddings: Precomputed embeddings by skill text
+            threshold: Match threshold the similarities will be compared with
+            request_context: Request context memoizing the encoded skills
+
+        Returns:
+            Float32 matrix of shape (len(job_skills), len(user_skills))
+        """
+        return cls.similarity_matrix_with_tiers(
+            job_skills, user_skills, known_embeddings, threshold, request_context
+        )[0]
+
+    @classmethod
+    def similarity_matrix_with_tiers(
+        cls,
+        job_skills: List[str],
+        user_skills: List[str],
+        known_embeddings: Optional[Dict[str, np.ndarray]] = None,
+        threshold: Optional[float] = None,
+        request_context: Optional[RequestContext] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the cosine similarity of every job skill with every user skill.
+
+        Job skills with the same canonical form as a user skill (see
+        `SkillVocabularyService`) score 1.0 against it without being embedded.
+        For the rest, embeddings come from `known_embeddings`, then from the
+        vocabulary's precomputed matrix, and only unknown skills are encoded.
+
+        When a threshold is given and the cascade is enabled, pairs clearly
+        above or below it keep their word-vector similarity (see
+        `_cascade_similarities`), and only decide correctly around that
+        threshold until re-scored (see `rescore_pairs`).
+
+        Args:
+            job_skills: Ordered list of job skills
+            user_skills: Ordered list of user skills
+            known_embeddings: Precomputed embeddings by skill text (e.g. the
+                cached job description skills); only the others are encoded.
+            threshold: Match threshold the similarities will be compared with
+            request_context: Request context memoizing the encoded skills
+
+        Returns:
+            Tuple of the float32 matrix of shape (len(job_skills),
+            len(user_skills)) and the mask of the pairs decided by word vectors
+        """
+        matrix = np.zeros((len(job_skills), len(user_skills)), dtype=np.float32)
+        word_vector_pairs = np.zeros(matrix.shape, dtype=bool)
+
+        # Short-circuit exact canonical matches
+        user_columns = {}
+        for j, skill in enumerate(user_skills):
+            user_columns.setdefault(SkillVocabularyService.match_key(skill), j)
+        exact_matches = {}
+        for i, skill in enumerate(job_skills):
+            j = user_columns.get(SkillVocabularyService.match_key(skill))
+            if j is not None:
+                exact_matches[i] = j
+        pending_rows = [i for i in range(len(job_skills)) if i not in exact_matches]
+
+        if pending_rows and user_skills:
+            pending_skills = [job_skills[i] for i in pending_rows]
+            if threshold is not None and cls._cascade_enabled:
+                (
+                    matrix[pending_rows],
+                    word_vector_pairs[pending_rows],
+                ) = cls._cascade_similarities(
+                    pending_skills,
+                    user_skills,
+                    threshold,
+                    known_embeddings,
+                    request_context,
+                )
+            else:
+                matrix[pending_rows] = cls._transformer_similarities(
+                    pending_skills, user_skills, known_embeddings, request_context
+                )
+
+        for i, j in exact_matches.items():
+            matrix[i, j] = 1.0
+
+        return matrix, word_vector_pairs
+
+    @staticmethod
+    def best_matches(
+        matrix: np.ndarray, user_skills: List[str]
+    ) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """
+        Find the best user skill for each job skill in a similarity matrix.
+
+        Non-positive similarities count as no match at all.
+
+        Args:
+            matrix: Job x user similarity matrix
+            user_skills: User skills, in the matrix column order
+
+        Returns:
+            Tuple of the best similarity per job skill and the matching user
+            skill (or None)
+        """
+        if matrix.size == 0:
+            return np.zeros(matrix.shape[0], dtype=np.float32), [None] * matrix.shape[0]
+        best_similarities = np.maximum(matrix.max(axis=1), 0.0)
+        best_indices = matrix.argmax(axis=1)
+        matches = [
+            user_skills[j] if sim > 0 else None
+            for j, sim in zip(best_indices, best_similarities)
+        ]
+        return best_similarities, matches
+
+    @staticmethod
+    def score_from_similarities(
+        job_skills: List[str],
+        best_similarities: np.ndarray,
+        best_matches: List[Optional[str]],
+        threshold: float,
+    ) -> Dict:
+        """
+        Score job skills given the best similarity each one reached.
+
+        This does not depend on any model call, so results can be re-scored
+        for a different threshold instantly.
+
+        Args:
+            job_skills: Ordered list of job skills
+            best_similarities: Best similarity per job skill
+            best_matches: Best matching user skill per job skill
+            threshold: Cosine similarity threshold to consider a match
+
+        Returns:
+            Dictionary containing score, matched skills, missing skills and
+            matching details (a list of `MatchRecord` tuples)
+        """
+        matched_skills = []
+        missing_skills = []
+        matching_details = []
+
+        for job_skill, similarity, best_match in zip(
+            job_skills, best_similarities, best_matches
+        ):
+            is_match = bool(similarity >= threshold)
+            matching_details.append(
+                MatchRecord(job_skill, best_match, float(similarity), is_match)
+            )
+
+            # Add to matched or missing based on threshold
+            if is_match:
+                matched_skills.append(job_skill)
+            else:
+                missing_skills.append(job_skill)
+
+        # Calculate the score as a percentage
+        match_ratio = len(matched_skills) / len(job_skills) if job_skills else 0.0
+        score = round(match_ratio * 100, 2)
+
+        return {
+            "score": score,
+            "matched_skills": matched_skills,
+            "missing_skills": missing_skills,
+            "matching_details": matching_details,
+        }
+
     @classmethod
     def semantic_matching_score(
         cls,
@@ -82,6 +602,8 @@ class SimilarityService:
         user_skills: Set[str],
         threshold: float = 0.5,
         verbose: bool = False,
+        known_embeddings: Optional[Dict[str, np.ndarray]] = None,
+        request_context: Optional[RequestContext] = None,
     ) -> Dict:
         """
         Computes semantic match score between user and job skills using sentence transformers.
@@ -91,17 +613,21 @@ class SimilarityService:
             user_skills: Set of skills the user currently has.
             threshold: Cosine similarity threshold to consider a match.
             verbose: Whether to print skill matches and gaps.
+            known_embeddings: Precomputed embeddings by skill text (e.g. the
+                cached job description skills); only the others are encoded.
+            request_context: Request context memoizing the encoded skills
 
         Returns:
             Dictionary containing score and detailed matching information
+            (`matching_details` is a list of `MatchRecord` tuples). It also
+            holds `job_skills_order`, `user_skills_order`, `similarity_matrix`
+            and `word_vector_pairs`, which `rescore_pairs` needs before the
+            matrix is compared with another threshold.
         """
         # Convert sets to lists for encoding
         job_skills_list = list(job_skills)
         user_skills_list = list(user_skills)
 
-        # Get all skills for embedding
-        all_skills = job_skills_list + user_skills_list
-
         # Skip if no skills to compare
         if not job_skills or not user_skills:
             return {
@@ -109,59 +635,39 @@ class SimilarityService:
                 "matched_skills": [],
                 "missing_skills": list(job_skills) if job_skills else [],
                 "matching_details": [],
+                "job_skills_order": job_skills_list,
+                "user_skills_order": user_skills_list,
+                "similarity_matrix": np.zeros(
+                    (len(job_skills_list), len(user_skills_list)), dtype=np.float32
+                ),
+                "word_vector_pairs": np.zeros(
+                    (len(job_skills_list), len(user_skills_list)), dtype=bool
+                ),
             }
 
-        # Get embeddings for all skills at once (more efficient)
-        embeddings = cls.get_embeddings(all_skills)
-
-        # Split embeddings back into job and user skills
-        job_embeddings = embeddings[: len(job_skills_list)]
-        user_embeddings = embeddings[len(job_skills_list) :]
-
-        matched_skills = []
-        missing_skills = []
-        matching_details = []
-
         # Compare each job skill with all user skills
-        for i, job_skill in enumerate(job_skills_list):
-            max_similarity = 0
-            best_match = None
-
-            # Calculate similarity with each user skill
-            for j, user_skill in enumerate(user_skills_list):
-                sim = cosine_similarity([job_embeddings[i]], [user_embeddings[j]])[0][0]
-
-                if sim > max_similarity:
-                    max_similarity = sim
-                    best_match = user_skill
-
-            # Record match details
-            detail = {
-                "job_skill": job_skill,
-                "best_match": best_match,
-                "similarity": float(max_similarity),
-                "is_match": max_similarity >= threshold,
-            }
-            matching_details.append(detail)
-
-            # Add to matched or missing based on threshold
-            if max_similarity >= threshold:
-                matched_skills.append(job_skill)
-            else:
-                missing_skills.append(job_skill)
-
-        # Calculate the score as a percentage
-        match_ratio = len(matched_skills) / len(job_skills_list)
-        score = round(match_ratio * 100, 2)
+        matrix, word_vector_pairs = cls.similarity_matrix_with_tiers(
+            job_skills_list,
+            user_skills_list,
+            known_embeddings,
+            threshold=threshold,
+            request_context=request_context,
+        )
+        best_similarities, best_matches = cls.best_matches(matrix, user_skills_list)
+
+        result = cls.score_from_similarities(
+            job_skills_list, best_similarities, best_matches, threshold
+        )
 
         if verbose:
+            matched_count = len(result["matched_skills"])
             print(
-                f"✅ Matched: {len(matched_skills)} / {len(job_skills_list)} | Score: {score}"
+                f"✅ Matched: {matched_count} / {len(job_skills_list)} | "
+                f"Score: {result['score']}"
             )
 
-        return {
-            "score": score,
-            "matched_skills": matched_skills,
-            "missing_skills": missing_skills,
-            "matching_details": matching_details,
-        }
+        result["job_skills_order"] = job_skills_list
+        result["user_skills_order"] = user_skills_list
+        result["similarity_matrix"] = matrix
+        result["word_vector_pairs"] = word_vector_pairs
+        return result
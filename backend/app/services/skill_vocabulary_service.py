@@ -0,0 +1,293 @@
+"""
+Service for normalizing extracted skills to a canonical vocabulary.
+
+The vocabulary is built from the `Skills` column of the courses dataset plus
+a table of common aliases. Skills that normalize to the same canonical skill
+are exact matches and need no model call, and the embeddings of all canonical
+skills are computed once into a matrix.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..core.config import (
+    COURSES_DATASET_PATH,
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL_NAME,
+    SKILL_VOCABULARY_ENABLED,
+    SKILL_VOCABULARY_MIN_COURSES,
+)
+from ..utils.course_catalog import load_catalog
+from ..utils.text_utils import normalize_skill, split_skill_list
+from .cache_service import CacheService
+
+logger = logging.getLogger(__name__)
+
+# Canonical skill -> aliases commonly found in resumes and job postings
+SKILL_ALIASES: Dict[str, List[str]] = {
+    "JavaScript": ["JS", "ECMAScript", "ES6", "Javascript"],
+    "TypeScript": ["TS"],
+    "Python": ["Python3", "Python 3"],
+    "Node.js": ["Node", "NodeJS", "Node JS"],
+    "React": ["React.js", "ReactJS", "React JS"],
+    "Vue.js": ["Vue", "VueJS"],
+    "Angular": ["AngularJS", "Angular.js"],
+    "Next.js": ["NextJS"],
+    "Kubernetes": ["k8s"],
+    "Amazon Web Services": ["AWS"],
+    "Google Cloud Platform": ["GCP", "Google Cloud"],
+    "Microsoft Azure": ["Azure"],
+    "PostgreSQL": ["Postgres", "psql"],
+    "MongoDB": ["Mongo"],
+    "Microsoft SQL Server": ["MSSQL", "SQL Server"],
+    "Go": ["Golang"],
+    "C#": ["CSharp", "C Sharp"],
+    "C++": ["CPP", "C plus plus"],
+    ".NET": ["dotnet", "dot net", ".NET Core"],
+    "CI/CD": ["CICD", "CI CD", "continuous integration", "continuous delivery"],
+    "Machine Learning": ["ML"],
+    "Deep Learning": ["DL"],
+    "Artificial Intelligence": ["AI"],
+    "Natural Language Processing": ["NLP"],
+    "TensorFlow": ["Tensorflow"],
+    "PyTorch": ["Pytorch"],
+    "scikit-learn": ["sklearn", "scikit learn", "Scikit-Learn"],
+    "Amazon S3": ["S3"],
+    "Amazon EC2": ["EC2"],
+    "Infrastructure as Code": ["IaC"],
+    "User Experience Design": ["UX", "UX Design"],
+    "User Interface Design": ["UI", "UI Design"],
+    "Search Engine Optimization": ["SEO"],
+    "Object-Oriented Programming": ["OOP"],
+    "REST APIs": ["REST", "RESTful", "REST API", "RESTful APIs"],
+    "Power BI": ["PowerBI"],
+    "Microsoft Excel": ["Excel", "MS Excel"],
+}
+
+
+class SkillVocabularyService:
+    """Service for normalizing extracted skills to a canonical vocabulary."""
+
+    # Normalized key -> canonical skill
+    _canonical: Optional[Dict[str, str]] = None
+    # Canonical skill -> row of the embedding matrix
+    _rows: Dict[str, int] = {}
+    _embeddings: Optional[np.ndarray] = None
+    _version: Optional[str] = None
+    _lock = threading.RLock()
+    # Cleared while a background warm-up is running
+    _ready = threading.Event()
+    _ready.set()
+
+    @staticmethod
+    def _load_dataset_skills(file_path: str = COURSES_DATASET_PATH) -> List[str]:
+        """
+        Read the skills listed by at least SKILL_VOCABULARY_MIN_COURSES courses.
+
+        Reads the `Skills` column of the catalogue cache (see
+        `app.utils.course_catalog`), so duplicate listings count once.
+
+        Args:
+            file_path: Path to the courses CSV file
+
+        Returns:
+            Skills in order of decreasing course count
+        """
+        if not os.path.exists(file_path):
+            logger.warning(
+                f"Skill vocabulary: {file_path} not found, using aliases only"
+            )
+            return []
+
+        df = load_catalog(file_path, columns=["Skills"])
+        counts = Counter()
+        for skills in df["Skills"]:
+            # Count each skill once per course
+            counts.update(set(split_skill_list(str(skills))))
+
+        return [
+            skill
+            for skill, count in counts.most_common()
+            if count >= SKILL_VOCABULARY_MIN_COURSES
+        ]
+
+    @classmethod
+    def load(cls) -> Dict[str, str]:
+        """
+        Build the vocabulary on first use.
+
+        The alias table wins over the dataset when both define a key.
+
+        Returns:
+            Mapping of normalized key to canonical skill
+        """
+        if cls._canonical is None:
+            with cls._lock:
+                if cls._canonical is None:
+                    canonical = {}
+                    if SKILL_VOCABULARY_ENABLED:
+                        for skill in cls._load_dataset_skills():
+                            canonical.setdefault(normalize_skill(skill), skill)
+                        for skill, aliases in SKILL_ALIASES.items():
+                            for name in [skill, *aliases]:
+                                canonical[normalize_skill(name)] = skill
+
+                    skills = list(dict.fromkeys(canonical.values()))
+                    cls._rows = {skill: i for i, skill in enumerate(skills)}
+                    cls._canonical = canonical
+                    logger.info(f"Skill vocabulary: {len(skills)} canonical skills")
+        return cls._canonical
+
+    @classmethod
+    def version(cls) -> str:
+        """
+        Identify the vocabulary, for cache keys of data derived from it.
+
+        Returns:
+            Short digest of the normalized key -> canonical skill mapping
+        """
+        if cls._version is None:
+            mapping = "\n".join(f"{k}\t{v}" for k, v in sorted(cls.load().items()))
+            cls._version = hashlib.sha256(mapping.encode("utf-8")).hexdigest()[:16]
+        return cls._version
+
+    @classmethod
+    def canonical_skills(cls) -> List[str]:
+        """Return the canonical skills in embedding-matrix row order."""
+        cls.load()
+        return list(cls._rows)
+
+    @classmethod
+    def canonicalize(cls, skill: str) -> str:
+        """
+        Map a skill to its canonical form.
+
+        Args:
+            skill: Extracted skill text
+
+        Returns:
+            The canonical skill, or the skill unchanged if it is unknown
+        """
+        return cls.load().get(normalize_skill(skill), skill)
+
+    @classmethod
+    def match_key(cls, skill: str) -> str:
+        """
+        Return the key under which two skills count as an exact match.
+
+        Args:
+            skill: Skill text
+
+        Returns:
+            Normalized canonical form of the skill
+        """
+        return normalize_skill(cls.canonicalize(skill))
+
+    @classmethod
+    def _compute_embeddings(cls) -> np.ndarray:
+        """Load the canonical skill embeddings from the cache or compute them."""
+        skills = cls.canonical_skills()
+        digest = hashlib.sha256("\n".join(skills).encode("utf-8")).hexdigest()
+        key = f"skill-vocab:{EMBEDDING_MODEL_NAME}:{EMBEDDING_BACKEND}:{digest}"
+
+        embeddings = CacheService.get_value(key)
+        if embeddings is None:
+            # Imported here because SimilarityService uses this service
+            from .similarity_service import SimilarityService
+
+            logger.info(f"Skill vocabulary: Embedding {len(skills)} skills...")
+            embeddings = (
+                np.asarray(SimilarityService.get_embeddings(skills), np.float32)
+                if skills
+                else np.zeros((0, 0), dtype=np.float32)
+            )
+            CacheService.set_value(key, embeddings, expire_hours=24 * 30)
+        return embeddings
+
+    @classmethod
+    def get_embeddings(cls) -> np.ndarray:
+        """
+        Get the embedding matrix of the canonical skills.
+
+        Computed once per vocabulary and embedding model, then kept in the
+        disk cache so restarts do not re-embed the vocabulary.
+
+        Returns:
+            Matrix with one row per canonical skill
+        """
+        if cls._embeddings is None:
+            with cls._lock:
+                if cls._embeddings is None:
+                    cls._embeddings = cls._compute_embeddings()
+        return cls._embeddings
+
+    @classmethod
+    def warm_up(cls) -> None:
+        """Build the vocabulary and its embedding matrix before they are needed."""
+        cls.version()
+        if cls._rows:
+            cls.get_embeddings()
+
+    @classmethod
+    def is_ready(cls) -> bool:
+        """Return whether no warm-up is in progress."""
+        return cls._ready.is_set()
+
+    @classmethod
+    def warm_up_in_background(
+        cls, wait_for: Optional[Callable[[], None]] = None
+    ) -> None:
+        """
+        Warm up in a background thread, marking the app not ready until it
+        finishes (successfully or not), so the first requests do not pay for
+        reading the catalogue and embedding the vocabulary.
+
+        Args:
+            wait_for: Called in the thread before warming up, to wait for
+                work that may fill the cache first
+        """
+        cls._ready.clear()
+
+        def run():
+            try:
+                if wait_for is not None:
+                    wait_for()
+                cls.warm_up()
+            except Exception as e:
+                logger.error(f"Skill vocabulary: Warm-up failed: {e}")
+            finally:
+                cls._ready.set()
+
+        threading.Thread(target=run, name="skill-vocab-warm-up", daemon=True).start()
+
+    @classmethod
+    def lookup_embeddings(cls, skills: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up precomputed embeddings for skills in the vocabulary.
+
+        Args:
+            skills: Skill texts
+
+        Returns:
+            Embedding by skill text, for the skills whose canonical form is in
+            the vocabulary
+        """
+        canonical = cls.load()
+        if not canonical:
+            return {}
+
+        found = {}
+        embeddings = None
+        for skill in skills:
+            row = cls._rows.get(canonical.get(normalize_skill(skill), ""))
+            if row is not None:
+                if embeddings is None:
+                    embeddings = cls.get_embeddings()
+                found[skill] = embeddings[row]
+        return found
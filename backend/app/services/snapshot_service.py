@@ -0,0 +1,299 @@
+"""
+Service for exporting and importing snapshots of the hottest cache entries.
+
+A fresh deploy starts with an empty cache. Importing a snapshot taken from
+the previous release before the app reports ready keeps the hit rate (and the
+LLM and Pinecone load) where it was.
+"""
+
+import gzip
+import hashlib
+import logging
+import math
+import pickle
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..core.config import (
+    CACHE_SNAPSHOT_TOP_N,
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL_NAME,
+    LLM_MODEL,
+    MODELS_DIR,
+    PINECONE_INDEX_NAME,
+)
+from ..utils.loader import ModelLoader
+from .cache_service import CacheService
+
+logger = logging.getLogger(__name__)
+
+# Format 2 stores absolute expiry times instead of remaining TTLs
+SNAPSHOT_FORMAT = 2
+
+# Key prefix of each exportable namespace. Recommendation keys are bare hashes.
+NAMESPACE_PREFIXES = {
+    "entities": "jd-artifacts:",
+    "embeddings": "skill-vocab:",
+}
+NEAR_DUPLICATE_PREFIX = "near-dup:"
+
+# Versions each namespace's values depend on
+NAMESPACE_DEPENDENCIES = {
+    "entities": ("ner", "embedding", "index"),
+    "embeddings": ("embedding",),
+    "recommendations": ("ner", "embedding", "index", "llm"),
+}
+
+# Hit counts lose half their weight per day since the last access
+HOTNESS_HALF_LIFE_SECONDS = 24 * 3600
+
+
+class SnapshotService:
+    """Service for exporting and importing snapshots of the hottest cache entries."""
+
+    _versions: Optional[Dict[str, str]] = None
+    _ready = threading.Event()
+    _ready.set()
+
+    @staticmethod
+    def namespace_of(key: str) -> Optional[str]:
+        """
+        Get the snapshot namespace of a cache key.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The namespace, or None for keys that are not exported on their own
+        """
+        for namespace, prefix in NAMESPACE_PREFIXES.items():
+            if key.startswith(prefix):
+                return namespace
+        if ":" not in key:
+            return "recommendations"
+        return None
+
+    @classmethod
+    def current_versions(cls) -> Dict[str, str]:
+        """
+        Fingerprint the models and index the cached values were derived from.
+
+        The spaCy models all report version 0.0.0, so they are identified by
+        a digest of their weights instead.
+
+        Returns:
+            Version string by dependency ("ner", "embedding", "index", "llm")
+        """
+        if cls._versions is None:
+            digest = hashlib.sha256()
+            for model_name in sorted(ModelLoader.list_available_models()):
+                model_dir = Path(MODELS_DIR) / model_name
+                for path in (model_dir / "meta.json", model_dir / "ner" / "model"):
+                    if path.exists():
+                        digest.update(path.read_bytes())
+            cls._versions = {
+                "ner": digest.hexdigest()[:16],
+                "embedding": f"{EMBEDDING_MODEL_NAME}:{EMBEDDING_BACKEND}",
+                "index": PINECONE_INDEX_NAME,
+                "llm": LLM_MODEL,
+            }
+        return cls._versions
+
+    @staticmethod
+    def hotness(hits: int, last_access: float, now: float) -> float:
+        """
+        Score an entry by access frequency, decayed by time since last access.
+
+        Args:
+            hits: Number of cache hits on the entry
+            last_access: Time of the last read or write (0 if unknown)
+            now: Current time
+
+        Returns:
+            Hotness score (higher is hotter)
+        """
+        age = max(0.0, now - last_access) if last_access else math.inf
+        return (hits + 1) * 0.5 ** (age / HOTNESS_HALF_LIFE_SECONDS)
+
+    @staticmethod
+    def _expires_at(cache, key: str, now: float) -> Optional[float]:
+        """Return the time a key expires, or None if it never does."""
+        ttl = cache.ttl(key)
+        return None if ttl is None else now + ttl
+
+    @staticmethod
+    def _remaining(expires_at: Optional[float], now: float) -> Optional[int]:
+        """Return the seconds left until an expiry time (None: never expires)."""
+        return None if expires_at is None else int(expires_at - now)
+
+    @classmethod
+    def export_snapshot(
+        cls,
+        path: str,
+        top_n: int = CACHE_SNAPSHOT_TOP_N,
+        namespaces: Iterable[str] = tuple(NAMESPACE_DEPENDENCIES),
+    ) -> Dict[str, Any]:
+        """
+        Write the hottest cache entries to a gzip-compressed snapshot.
+
+        Near-duplicate buckets are exported for the recommendations they point
+        to, so fuzzy lookups keep working after import. Entries keep their
+        absolute expiry time, so the time between export and import counts
+        against their TTL.
+
+        Args:
+            path: Snapshot file to write
+            top_n: Maximum number of entries to export
+            namespaces: Namespaces to export
+
+        Returns:
+            Summary with the number of exported entries per namespace
+        """
+        cache = CacheService._get_cache()
+        namespaces = set(namespaces)
+        now = time.time()
+
+        keys = [k for k in cache.iter_keys() if cls.namespace_of(k) in namespaces]
+        ranked = sorted(
+            zip(keys, cache.get_access(keys)),
+            key=lambda item: cls.hotness(*item[1], now),
+            reverse=True,
+        )
+
+        entries, counts = [], {}
+        for key, _ in ranked:
+            if len(entries) >= top_n:
+                break
+            value = cache.get(key)
+            if value is None:
+                continue
+            namespace = cls.namespace_of(key)
+            entries.append((namespace, key, value, cls._expires_at(cache, key, now)))
+            counts[namespace] = counts.get(namespace, 0) + 1
+
+        exported = {key for namespace, key, _, _ in entries}
+        buckets = cls._export_buckets(cache, exported, now)
+
+        snapshot = {
+            "format": SNAPSHOT_FORMAT,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "versions": cls.current_versions(),
+            "entries": entries,
+            "buckets": buckets,
+        }
+        with gzip.open(path, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        logger.info(f"Cache snapshot: Exported {len(entries)} entries to {path}")
+        return {"entries": counts, "near_duplicate_buckets": len(buckets)}
+
+    @classmethod
+    def _export_buckets(cls, cache, exported: set, now: float) -> List[tuple]:
+        """Collect the near-duplicate bucket entries of exported recommendations."""
+        bucket_keys = list(cache.iter_keys(NEAR_DUPLICATE_PREFIX))
+        buckets = []
+        for key, bucket in zip(bucket_keys, cache.get_buckets(bucket_keys)):
+            entries = [entry for entry in bucket if entry[0] in exported]
+            if entries:
+                buckets.append((key, entries, cls._expires_at(cache, key, now)))
+        return buckets
+
+    @classmethod
+    def import_snapshot(cls, path: str) -> Dict[str, Any]:
+        """
+        Load a snapshot into the cache.
+
+        Entries whose namespace depends on a model or index version that
+        changed since the snapshot was taken are dropped, as are the ones that
+        expired since; the others keep only what is left of their TTL.
+
+        Args:
+            path: Snapshot file to read
+
+        Returns:
+            Summary with the number of imported and dropped entries
+        """
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        cache = CacheService._get_cache()
+        marker = f"snapshot:{digest}"
+        if cache.get(marker) is not None:
+            # Another worker or replica sharing this cache already imported it
+            return {"imported": 0, "dropped": 0, "already_imported": True}
+
+        with gzip.open(path, "rb") as f:
+            snapshot = pickle.load(f)
+        if snapshot.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format {snapshot.get('format')}")
+
+        current = cls.current_versions()
+        stale = {
+            namespace
+            for namespace, dependencies in NAMESPACE_DEPENDENCIES.items()
+            if any(snapshot["versions"].get(d) != current[d] for d in dependencies)
+        }
+
+        now = time.time()
+        imported, dropped = {}, 0
+        for namespace, key, value, expires_at in snapshot["entries"]:
+            ttl = cls._remaining(expires_at, now)
+            if namespace in stale or (ttl is not None and ttl <= 0):
+                dropped += 1
+                continue
+            cache.set(key, value, ttl)
+            imported[namespace] = imported.get(namespace, 0) + 1
+
+        if "recommendations" not in stale:
+            for key, entries, expires_at in snapshot["buckets"]:
+                ttl = cls._remaining(expires_at, now)
+                if ttl is not None and ttl <= 0:
+                    continue
+                for entry in entries:
+                    cache.add_to_bucket(
+                        key, entry, CacheService._max_bucket_size, ttl or 24 * 3600
+                    )
+
+        cache.set(marker, True, 24 * 3600)
+        logger.info(
+            f"Cache snapshot: Imported {sum(imported.values())} entries, "
+            f"dropped {dropped} (stale namespaces: {sorted(stale) or 'none'})"
+        )
+        return {"imported": imported, "dropped": dropped, "stale": sorted(stale)}
+
+    @classmethod
+    def is_ready(cls) -> bool:
+        """Return whether no snapshot import is in progress."""
+        return cls._ready.is_set()
+
+    @classmethod
+    def wait_ready(cls) -> None:
+        """Wait for a snapshot import in progress, if any, to finish."""
+        cls._ready.wait()
+
+    @classmethod
+    def import_in_background(cls, path: str) -> None:
+        """
+        Import a snapshot in a background thread, marking the app not ready
+        until it finishes (successfully or not).
+
+        Args:
+            path: Snapshot file to read
+        """
+        if not Path(path).exists():
+            logger.warning(f"Cache snapshot: {path} not found, starting cold")
+            return
+
+        cls._ready.clear()
+
+        def run():
+            try:
+                cls.import_snapshot(path)
+            except Exception as e:
+                logger.error(f"Cache snapshot: Import failed: {e}")
+            finally:
+                cls._ready.set()
+
+        threading.Thread(target=run, name="cache-snapshot-import", daemon=True).start()
@@ -0,0 +1,183 @@
+"""
+Utility class for batching model inference across concurrent requests.
+
+Transformer encoders and spaCy pipelines are far more efficient on a batch
+than on the same inputs one call at a time, but each request only brings a
+few short texts. A `DynamicBatcher` sits in front of a model: callers submit
+items and block, a worker thread collects the items of every caller for up to
+`max_wait_ms` (or until `max_items` are waiting), runs the model once on the
+batch and hands each caller the results of its own items.
+
+Under low load a lone caller waits at most `max_wait_ms` extra; under high
+load batches fill up before the wait ends. By default one worker runs the
+batches, so the model is never called from two threads at once: spaCy
+pipelines and transformer encoders are not guaranteed to be thread-safe.
+A `fn` that is safe to call concurrently can be given several workers, which
+share the queue: one collects the next batch while the others run theirs.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..core.config import INFERENCE_BATCH_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+class DynamicBatcher:
+    """Batches the items submitted by concurrent callers into single model calls."""
+
+    def __init__(
+        self,
+        fn: Callable[[List[Any]], Sequence[Any]],
+        max_items: int,
+        max_wait_ms: float,
+        name: str = "batcher",
+        workers: Optional[int] = None,
+    ):
+        """
+        Create a batcher; its worker threads start on the first submit.
+
+        Args:
+            fn: Runs the model on a list of items and returns one result per
+                item, in order
+            max_items: Most items per batch
+            max_wait_ms: Longest time the first item of a batch waits for more
+            name: Name of the worker threads and in the logs
+            workers: Batches run at once (default: INFERENCE_BATCH_WORKERS);
+                more than one only if `fn` is safe to call concurrently
+        """
+        self.fn = fn
+        self.max_items = max(1, max_items)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.name = name
+        self.workers = max(1, workers or INFERENCE_BATCH_WORKERS)
+        self._queue: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+        self._workers: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        # Held while collecting, so idle workers do not split a batch
+        self._collect_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+
+    def submit_many(self, items: Sequence[Any]) -> List[Any]:
+        """
+        Run the model on some items, batched with other callers' items.
+
+        Args:
+            items: Items of this caller
+
+        Returns:
+            Result of each item, in order
+
+        Raises:
+            Exception: The exception the model raised on the batch
+        """
+        return [future.result() for future in self.enqueue_many(items)]
+
+    def enqueue_many(self, items: Sequence[Any]) -> List[Future]:
+        """
+        Queue some items without waiting for them.
+
+        Lets a caller queue work on several batchers before waiting on any.
+
+        Args:
+            items: Items of this caller
+
+        Returns:
+            A future per item, resolving to its result
+        """
+        if not items:
+            return []
+        self._ensure_workers()
+        futures = []
+        for item in items:
+            future: Future = Future()
+            self._queue.put((item, future))
+            futures.append(future)
+        return futures
+
+    def submit(self, item: Any) -> Any:
+        """
+        Run the model on one item, batched with other callers' items.
+
+        Args:
+            item: The item
+
+        Returns:
+            Its result
+        """
+        return self.submit_many([item])[0]
+
+    def _ensure_workers(self) -> None:
+        """Start the worker threads if they are not running."""
+        if not self._workers:
+            with self._lock:
+                if not self._workers:
+                    for i in range(self.workers):
+                        worker = threading.Thread(
+                            target=self._work, name=f"{self.name}-{i}", daemon=True
+                        )
+                        worker.start()
+                        self._workers.append(worker)
+
+    def _collect(self) -> List[tuple]:
+        """Wait for an item, then for more until the batch is full or due."""
+        batch = [self._queue.get()]
+        due = time.monotonic() + self.max_wait
+        while len(batch) < self.max_items:
+            timeout = due - time.monotonic()
+            try:
+                # Take what is already queued even once the wait is over
+                item = (
+                    self._queue.get(timeout=timeout)
+                    if timeout > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            batch.append(item)
+        return batch
+
+    def _work(self) -> None:
+        """Run batches until the process exits."""
+        while True:
+            with self._collect_lock:
+                batch = self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = list(self.fn(items))
+                if len(results) != len(items):
+                    raise ValueError(
+                        f"{self.name} returned {len(results)} results for "
+                        f"{len(items)} items"
+                    )
+            except Exception as e:
+                logger.warning(f"{self.name}: Batch of {len(items)} items failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+            with self._lock:
+                self._batches += 1
+                self._items += len(batch)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Report how well items were batched.
+
+        Returns:
+            Number of workers, batches, items and the mean batch size
+        """
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "batches": self._batches,
+                "items": self._items,
+                "mean_batch_size": round(self._items / max(self._batches, 1), 2),
+            }
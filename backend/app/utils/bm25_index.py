@@ -0,0 +1,201 @@
+"""
+Utility class for a compact in-memory BM25 keyword index.
+
+Terms are interned into integer ids and the postings are stored as three flat
+arrays (CSR layout): `offsets[t]:offsets[t + 1]` slices the document ids and
+term frequencies of term `t`. The whole index is a handful of NumPy arrays, so
+it serializes to one `.npz` file that loads without unpickling anything.
+"""
+
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .text_utils import canonicalize_text
+
+# Standard BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into index terms.
+
+    Uses `canonicalize_text`, so terms are lowercase and skills like C++ and
+    C# keep their symbols.
+
+    Args:
+        text: The text to split
+
+    Returns:
+        Terms in order of appearance
+    """
+    return canonicalize_text(text).split()
+
+
+class BM25Index:
+    """A BM25 index over a fixed set of documents."""
+
+    def __init__(
+        self,
+        terms: Sequence[str],
+        offsets: np.ndarray,
+        doc_ids: np.ndarray,
+        term_freqs: np.ndarray,
+        doc_lengths: np.ndarray,
+        documents: List[Dict[str, Any]],
+    ):
+        """
+        Wrap the arrays of a built index (see `build` and `load`).
+
+        Args:
+            terms: Term of each term id
+            offsets: Start of each term's postings, plus the total at the end
+            doc_ids: Document ids of the postings
+            term_freqs: Term frequencies of the postings
+            doc_lengths: Number of terms in each document
+            documents: Stored fields of each document
+        """
+        self.term_ids = {sys.intern(term): i for i, term in enumerate(terms)}
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.term_freqs = term_freqs
+        self.doc_lengths = doc_lengths
+        self.documents = documents
+
+        n_docs = len(doc_lengths)
+        self.avg_doc_length = float(doc_lengths.mean()) if n_docs else 0.0
+        doc_freqs = np.diff(offsets).astype(np.float32)
+        # BM25 idf, kept positive for terms in more than half the documents
+        self.idf = np.log1p((n_docs - doc_freqs + 0.5) / (doc_freqs + 0.5))
+        # Length normalization of each document, precomputed for queries
+        if n_docs:
+            self._norms = (
+                BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / self.avg_doc_length)
+            ).astype(np.float32)
+        else:
+            self._norms = np.zeros(0, dtype=np.float32)
+
+    @classmethod
+    def build(
+        cls, texts: Iterable[str], documents: List[Dict[str, Any]]
+    ) -> "BM25Index":
+        """
+        Index documents.
+
+        Args:
+            texts: Indexed text of each document
+            documents: Stored fields of each document, returned with the hits
+
+        Returns:
+            The index
+        """
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        doc_lengths = []
+        for doc_id, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            doc_lengths.append(sum(counts.values()))
+            for term, count in counts.items():
+                postings.setdefault(term, []).append((doc_id, count))
+
+        terms = sorted(postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        doc_ids = []
+        term_freqs = []
+        for i, term in enumerate(terms):
+            doc_ids.extend(doc_id for doc_id, _ in postings[term])
+            term_freqs.extend(count for _, count in postings[term])
+            offsets[i + 1] = len(doc_ids)
+
+        return cls(
+            terms,
+            offsets,
+            np.array(doc_ids, dtype=np.int32),
+            np.minimum(term_freqs, np.iinfo(np.uint16).max).astype(np.uint16),
+            np.array(doc_lengths, dtype=np.int32),
+            documents,
+        )
+
+    def search(self, query: str, top_k: int) -> List[Tuple[int, float]]:
+        """
+        Find the documents that best match a query.
+
+        Args:
+            query: Query text; repeated terms count once
+            top_k: Maximum number of hits
+
+        Returns:
+            (document id, BM25 score) pairs, best first; only documents
+            sharing a term with the query
+        """
+        if top_k <= 0:
+            return []
+        scores = np.zeros(len(self.doc_lengths), dtype=np.float32)
+        for term in dict.fromkeys(tokenize(query)):
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            docs = self.doc_ids[start:end]
+            freqs = self.term_freqs[start:end].astype(np.float32)
+            # A term occurs once per document in its postings, so no np.add.at
+            scores[docs] += (
+                self.idf[term_id] * freqs * (BM25_K1 + 1) / (freqs + self._norms[docs])
+            )
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > top_k:
+            matched = matched[np.argpartition(-scores[matched], top_k - 1)[:top_k]]
+        order = matched[np.argsort(-scores[matched], kind="stable")]
+        return [(int(doc_id), float(scores[doc_id])) for doc_id in order]
+
+    def save(self, path: Path) -> None:
+        """
+        Serialize the index to an `.npz` file.
+
+        Args:
+            path: File to write
+        """
+        terms = sorted(self.term_ids, key=self.term_ids.get)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            terms=np.array(terms, dtype=str),
+            offsets=self.offsets,
+            doc_ids=self.doc_ids,
+            term_freqs=self.term_freqs,
+            doc_lengths=self.doc_lengths,
+            documents=np.frombuffer(
+                json.dumps(self.documents).encode("utf-8"), dtype=np.uint8
+            ),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "BM25Index":
+        """
+        Load an index written by `save`.
+
+        Args:
+            path: File to read
+
+        Returns:
+            The index
+        """
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["terms"].tolist(),
+                data["offsets"],
+                data["doc_ids"],
+                data["term_freqs"],
+                data["doc_lengths"],
+                json.loads(data["documents"].tobytes().decode("utf-8")),
+            )
+
+    def __len__(self) -> int:
+        """Return the number of indexed documents."""
+        return len(self.doc_lengths)
@@ -0,0 +1,221 @@
+"""
+Utility functions for ingesting the course catalogue into a columnar cache.
+
+The courses CSV is read in chunks: each chunk is normalized, deduplicated by
+url against every chunk before it and appended to a Parquet file as one row
+group, so peak memory depends on the chunk size rather than on the size of the
+catalogue. Later loads read the Parquet file, which needs no CSV parsing and
+can read just the columns it needs.
+
+The cache records the size and modification time of the CSV it was built from
+and is rebuilt when they change.
+"""
+
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ..core.config import CATALOG_CACHE_DIR, CATALOG_CHUNK_ROWS, COURSES_DATASET_PATH
+
+logger = logging.getLogger(__name__)
+
+# Columns read from the CSV
+SOURCE_COLUMNS = ["Title", "Category", "Sub-Category", "Short Intro", "Skills", "url"]
+
+# Columns of the prepared catalogue; `row` is the CSV row the course came from,
+# which the dense and keyword indexes use as the course id
+CATALOG_SCHEMA = pa.schema(
+    [
+        ("row", pa.int64()),
+        ("Title", pa.string()),
+        ("url", pa.string()),
+        ("course_desc", pa.string()),
+        ("Skills", pa.string()),
+    ]
+)
+
+# Parquet schema metadata key holding the source fingerprint
+SOURCE_METADATA_KEY = b"source"
+
+
+def _source_fingerprint(csv_path: str) -> str:
+    """Identify a CSV file by its size and modification time."""
+    stat = os.stat(csv_path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def catalog_cache_path(csv_path: str) -> Path:
+    """
+    Get the Parquet cache file of a courses CSV.
+
+    Args:
+        csv_path: Path to the courses CSV file
+
+    Returns:
+        Path inside CATALOG_CACHE_DIR (may not exist yet)
+    """
+    return Path(CATALOG_CACHE_DIR) / f"{Path(csv_path).stem}.parquet"
+
+
+def read_csv_chunks(
+    csv_path: str, chunk_rows: int = CATALOG_CHUNK_ROWS
+) -> Iterator[pd.DataFrame]:
+    """
+    Read the source columns of a courses CSV in chunks.
+
+    Args:
+        csv_path: Path to the courses CSV file
+        chunk_rows: Rows per chunk
+
+    Returns:
+        Chunks with all values as strings (missing values empty); their index
+        continues across chunks
+    """
+    reader = pd.read_csv(
+        csv_path,
+        usecols=SOURCE_COLUMNS,
+        dtype=str,
+        encoding="utf-8",
+        quotechar='"',
+        escapechar="\\",
+        on_bad_lines="skip",
+        chunksize=chunk_rows,
+    )
+    for chunk in reader:
+        yield chunk.fillna("")
+
+
+def prepare_chunk(chunk: pd.DataFrame, seen_urls: Set[str]) -> pd.DataFrame:
+    """
+    Build the catalogue rows of a chunk, dropping courses already seen.
+
+    Args:
+        chunk: Chunk from `read_csv_chunks`
+        seen_urls: Urls of the earlier chunks; updated with this chunk's
+
+    Returns:
+        Chunk with the `CATALOG_SCHEMA` columns
+    """
+    chunk = chunk[~chunk["url"].isin(seen_urls)].drop_duplicates(subset=["url"])
+    seen_urls.update(chunk["url"])
+
+    course_desc = chunk["Title"].str.cat(
+        [chunk["Category"], chunk["Sub-Category"], chunk["Short Intro"]],
+        sep="; ",
+    )
+    return pd.DataFrame(
+        {
+            "row": chunk.index.astype("int64"),
+            "Title": chunk["Title"],
+            "url": chunk["url"],
+            "course_desc": course_desc.str.cat(chunk["Skills"], sep="; "),
+            "Skills": chunk["Skills"],
+        }
+    )
+
+
+def ingest_courses(
+    csv_path: str,
+    output_path: Optional[Path] = None,
+    chunk_rows: int = CATALOG_CHUNK_ROWS,
+) -> Dict[str, Any]:
+    """
+    Stream a courses CSV into the Parquet catalogue cache.
+
+    The file is written next to its destination and moved into place when
+    complete, so readers never see a partial catalogue.
+
+    Args:
+        csv_path: Path to the courses CSV file
+        output_path: Parquet file to write (default: `catalog_cache_path`)
+        chunk_rows: Rows per chunk (and per Parquet row group)
+
+    Returns:
+        Rows read, courses written and chunks processed
+    """
+    output_path = output_path or catalog_cache_path(csv_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # A unique name per writer, as several server workers (or threads of one
+    # worker) may ingest a stale cache at the same time
+    fd, tmp_name = tempfile.mkstemp(
+        dir=output_path.parent, prefix=f"{output_path.name}.", suffix=".tmp"
+    )
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    schema = CATALOG_SCHEMA.with_metadata(
+        {SOURCE_METADATA_KEY: _source_fingerprint(csv_path).encode()}
+    )
+
+    seen_urls: Set[str] = set()
+    stats = {"rows": 0, "courses": 0, "chunks": 0}
+    try:
+        with pq.ParquetWriter(tmp_path, schema) as writer:
+            for chunk in read_csv_chunks(csv_path, chunk_rows):
+                prepared = prepare_chunk(chunk, seen_urls)
+                writer.write_table(
+                    pa.Table.from_pandas(prepared, schema=schema, preserve_index=False)
+                )
+                stats["rows"] += len(chunk)
+                stats["courses"] += len(prepared)
+                stats["chunks"] += 1
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    logger.info(
+        f"Catalog: Ingested {stats['courses']} courses from {stats['rows']} rows "
+        f"of {csv_path} into {output_path}"
+    )
+    return stats
+
+
+def catalog_is_current(csv_path: str, cache_path: Path) -> bool:
+    """
+    Check that a catalogue cache was built from the current CSV.
+
+    Args:
+        csv_path: Path to the courses CSV file
+        cache_path: Parquet cache file
+
+    Returns:
+        True if the cache can be read in place of the CSV
+    """
+    try:
+        metadata = pq.read_schema(cache_path).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return False
+    return metadata.get(SOURCE_METADATA_KEY) == _source_fingerprint(csv_path).encode()
+
+
+def load_catalog(
+    csv_path: str = COURSES_DATASET_PATH, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Load the prepared catalogue, ingesting the CSV first if the cache is stale.
+
+    Args:
+        csv_path: Path to the courses CSV file
+        columns: Catalogue columns to read (default: all)
+
+    Returns:
+        One row per distinct course url, indexed by the CSV row
+
+    Raises:
+        FileNotFoundError: If the CSV file does not exist
+    """
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"Course data file not found at: {csv_path}")
+
+    cache_path = catalog_cache_path(csv_path)
+    if not catalog_is_current(csv_path, cache_path):
+        ingest_courses(csv_path, cache_path)
+
+    if columns is not None:
+        columns = ["row", *[column for column in columns if column != "row"]]
+    df = pd.read_parquet(cache_path, columns=columns)
+    return df.set_index("row").rename_axis(None)
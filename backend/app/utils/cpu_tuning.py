@@ -0,0 +1,206 @@
+"""
+Utility functions for sizing thread pools and server workers to the CPU quota.
+
+Torch, the BLAS libraries behind NumPy and spaCy each default to one thread
+per visible core. Inside a container the visible cores usually exceed the
+cgroup CPU quota, and with several server workers every worker starts its own
+pools, so the cores end up oversubscribed. These helpers size everything from
+the cores the process may actually use.
+"""
+
+import json
+import logging
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..core.config import CPU_THREADS, CPU_TUNING_PATH, SERVER_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# Environment variables read by the BLAS/OpenMP runtimes when they start
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+)
+
+CGROUP_V2_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+CGROUP_V1_QUOTA = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+CGROUP_V1_PERIOD = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+
+
+def _cgroup_cpu_quota() -> Optional[float]:
+    """Return the cgroup CPU quota in cores, or None if there is no limit."""
+    try:
+        if CGROUP_V2_CPU_MAX.exists():
+            quota, period = CGROUP_V2_CPU_MAX.read_text().split()[:2]
+            if quota == "max":
+                return None
+            return int(quota) / int(period)
+        if CGROUP_V1_QUOTA.exists() and CGROUP_V1_PERIOD.exists():
+            quota = int(CGROUP_V1_QUOTA.read_text())
+            if quota <= 0:
+                return None
+            return quota / int(CGROUP_V1_PERIOD.read_text())
+    except (OSError, ValueError) as e:
+        logger.warning(f"CPU tuning: Could not read cgroup quota: {e}")
+    return None
+
+
+def available_cpus() -> int:
+    """
+    Count the cores this process may use.
+
+    Takes the smallest of the CPU affinity mask and the cgroup quota (rounded
+    up, so a quota of 1.5 cores counts as 2).
+
+    Returns:
+        Number of usable cores, at least 1
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
+
+
+def default_settings(cpus: int) -> Dict[str, int]:
+    """
+    Pick workers and threads per worker without measurements.
+
+    Requests are mostly short NER and embedding calls, which scale better
+    across processes than across threads, so small machines get one worker
+    using every core and larger ones get workers with two threads each.
+
+    Args:
+        cpus: Number of usable cores
+
+    Returns:
+        Dictionary with `workers` and `threads`
+    """
+    if cpus < 4:
+        return {"workers": 1, "threads": cpus}
+    return {"workers": cpus // 2, "threads": 2}
+
+
+def load_calibration(path: str = CPU_TUNING_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Load settings stored by the calibration command.
+
+    Args:
+        path: Path to the calibration file
+
+    Returns:
+        The stored settings, or None if there are none
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"CPU tuning: Ignoring unreadable calibration {path}: {e}")
+        return None
+
+
+def resolve_settings(path: str = CPU_TUNING_PATH) -> Dict[str, Any]:
+    """
+    Decide the worker and thread counts to use.
+
+    Explicit CPU_THREADS / SERVER_WORKERS settings win. Otherwise calibrated
+    settings are used if they were measured with the same number of cores,
+    and the defaults from `default_settings` if not.
+
+    Args:
+        path: Path to the calibration file
+
+    Returns:
+        Dictionary with `cpus`, `workers`, `threads` and their `source`
+    """
+    cpus = available_cpus()
+    settings = dict(default_settings(cpus), source="default")
+
+    calibration = load_calibration(path)
+    if calibration and calibration.get("cpus") == cpus:
+        settings.update(
+            workers=int(calibration["workers"]),
+            threads=int(calibration["threads"]),
+            source="calibration",
+        )
+
+    if SERVER_WORKERS > 0:
+        settings.update(workers=SERVER_WORKERS, source="environment")
+    if CPU_THREADS > 0:
+        settings.update(threads=CPU_THREADS, source="environment")
+
+    settings["cpus"] = cpus
+    return settings
+
+
+def set_thread_env(threads: int) -> None:
+    """
+    Limit the BLAS/OpenMP thread pools through the environment.
+
+    The variables only take effect for libraries that have not been loaded
+    yet, and are inherited by child processes. Variables that are already set
+    are left alone.
+
+    Args:
+        threads: Threads per pool
+    """
+    for name in THREAD_ENV_VARS:
+        os.environ.setdefault(name, str(threads))
+
+
+def apply_thread_settings(threads: int) -> None:
+    """
+    Limit the intra-op thread pools of BLAS/OpenMP and torch.
+
+    This should run before NumPy or torch are imported (see `set_thread_env`).
+    It imports torch, so processes that only spawn workers should call
+    `set_thread_env` instead.
+
+    Args:
+        threads: Threads per pool
+    """
+    set_thread_env(threads)
+
+    try:
+        import torch
+    except ImportError:
+        return
+
+    torch.set_num_threads(threads)
+    try:
+        # Inter-op parallelism only helps graphs with independent branches
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Already fixed once parallel work has started in this process
+        pass
+
+
+def tune_process(path: str = CPU_TUNING_PATH) -> Dict[str, Any]:
+    """
+    Resolve the settings and size this process's thread pools accordingly.
+
+    Args:
+        path: Path to the calibration file
+
+    Returns:
+        The applied settings (see `resolve_settings`)
+    """
+    settings = resolve_settings(path)
+    apply_thread_settings(settings["threads"])
+    logger.info(
+        f"CPU tuning: {settings['cpus']} cores, {settings['workers']} workers x "
+        f"{settings['threads']} threads ({settings['source']})"
+    )
+    return settings
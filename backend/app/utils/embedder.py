@@ -0,0 +1,162 @@
+"""
+Utility classes for loading the sentence embedding model with the configured backend.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import List, Union
+
+import numpy as np
+
+from ..core.config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL_NAME,
+    EMBEDDING_ONNX_DIR,
+    MODEL_BUNDLES_ENABLED,
+)
+from .model_bundle import embedder_bundle_is_current, embedder_bundle_path
+
+# File names inside the ONNX model directory (see app.build_onnx_embedder)
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_INT8_MODEL_FILE = "model_int8.onnx"
+ONNX_TOKENIZER_FILE = "tokenizer.json"
+ONNX_SETTINGS_FILE = "embedder.json"
+
+EMBEDDING_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+class OnnxEmbedder:
+    """
+    Sentence embedder running an exported transformer with ONNX Runtime.
+
+    Reproduces the all-MiniLM-L6-v2 sentence-transformers pipeline (token
+    embeddings, mean pooling over the attention mask, L2 normalization) and
+    exposes the subset of `SentenceTransformer.encode` the services use.
+    """
+
+    def __init__(self, model_dir: str = EMBEDDING_ONNX_DIR, quantized: bool = False):
+        """
+        Load the exported model and its tokenizer.
+
+        Args:
+            model_dir: Directory written by `app.build_onnx_embedder`
+            quantized: Whether to load the int8 dynamically quantized model
+
+        Raises:
+            ValueError: If the model has not been exported
+        """
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_dir = Path(model_dir)
+        model_file = ONNX_INT8_MODEL_FILE if quantized else ONNX_MODEL_FILE
+        model_path = model_dir / model_file
+        if not model_path.exists():
+            raise ValueError(
+                f"ONNX embedding model not found at {model_path}; "
+                "run `python -m app.build_onnx_embedder` first"
+            )
+
+        with open(model_dir / ONNX_SETTINGS_FILE, encoding="utf-8") as f:
+            settings = json.load(f)
+        self.max_seq_length = settings["max_seq_length"]
+        self.dimension = settings["dimension"]
+        self.model_path = model_path
+
+        options = ort.SessionOptions()
+        # Follow the thread limits set by app.utils.cpu_tuning
+        threads = int(os.environ.get("OMP_NUM_THREADS", 0))
+        if threads > 0:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        self._session = ort.InferenceSession(
+            str(model_path), options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self._session.get_inputs()}
+
+        self._tokenizer = Tokenizer.from_file(str(model_dir / ONNX_TOKENIZER_FILE))
+        self._tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self._tokenizer.enable_padding()
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """Return the size of the embeddings."""
+        return self.dimension
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Embed a batch of texts into normalized mean-pooled vectors."""
+        encodings = self._tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.array(
+                [e.type_ids for e in encodings], dtype=np.int64
+            )
+        token_embeddings = self._session.run(None, feeds)[0]
+
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(
+            mask.sum(axis=1), 1e-9, None
+        )
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+    def encode(
+        self, sentences: Union[str, List[str]], batch_size: int = 32, **kwargs
+    ) -> np.ndarray:
+        """
+        Embed one text or a list of texts.
+
+        Texts are batched by length to keep padding small, as
+        `SentenceTransformer.encode` does.
+
+        Args:
+            sentences: A text or list of texts
+            batch_size: Number of texts per inference call
+            **kwargs: Accepted for compatibility with `SentenceTransformer.encode`
+
+        Returns:
+            A vector for a single text, otherwise an array with one row per text
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        embeddings = np.zeros((len(texts), self.dimension), dtype=np.float32)
+
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        for start in range(0, len(texts), batch_size):
+            indices = order[start : start + batch_size]
+            embeddings[indices] = self._encode_batch([texts[i] for i in indices])
+
+        return embeddings[0] if single else embeddings
+
+
+def load_embedder(backend: str = EMBEDDING_BACKEND):
+    """
+    Load the sentence embedding model with the given backend.
+
+    Args:
+        backend: "torch" for sentence-transformers on PyTorch (from its bundle
+            when one was built for the configured model and the installed
+            sentence-transformers), "onnx" for the exported model on ONNX Runtime,
+            "onnx-int8" for its int8 version
+
+    Returns:
+        A model exposing `encode`
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend == "torch":
+        from sentence_transformers import SentenceTransformer
+
+        bundle_path = embedder_bundle_path()
+        if MODEL_BUNDLES_ENABLED and embedder_bundle_is_current(bundle_path):
+            return SentenceTransformer(str(bundle_path))
+        return SentenceTransformer(EMBEDDING_MODEL_NAME)
+    if backend in ("onnx", "onnx-int8"):
+        return OnnxEmbedder(quantized=backend == "onnx-int8")
+    raise ValueError(
+        f"Unknown embedding backend '{backend}', expected one of {EMBEDDING_BACKENDS}"
+    )
@@ -2,7 +2,6 @@
 Utility functions for embedding and indexing course data.
 """
 
-import os
 from typing import Dict, List, Optional
 
 import pandas as pd
@@ -11,56 +10,23 @@ from sentence_transformers import SentenceTransformer
 from tqdm import tqdm
 
 from ..core.config import COURSES_DATASET_PATH, PINECONE_API_KEY, PINECONE_INDEX_NAME
+from .course_catalog import load_catalog
 
 
 def load_courses_data(file_path: Optional[str] = None) -> pd.DataFrame:
     """
-    Load course data from a CSV file.
+    Load course data, from the catalogue cache of the CSV file.
+
+    The CSV is streamed into the cache first if it has changed since the cache
+    was built (see `app.utils.course_catalog`).
 
     Args:
         file_path: Path to the CSV file, defaults to config value
 
     Returns:
-        DataFrame containing the course data
+        DataFrame containing the course data, one row per distinct url
     """
-    if file_path is None:
-        file_path = COURSES_DATASET_PATH
-
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Course data file not found at: {file_path}")
-
-    # Load the CSV file
-    df = pd.read_csv(
-        file_path,
-        encoding="utf-8",
-        quotechar='"',
-        escapechar="\\",
-        on_bad_lines="skip",
-    )
-
-    # Preprocess the data
-    df = df.fillna("")  # Fill NaN values
-
-    # Create a combined course description field
-    df["course_desc"] = (
-        df["Title"].astype(str)
-        + "; "
-        + df["Category"].astype(str)
-        + "; "
-        + df["Sub-Category"].astype(str)
-        + "; "
-        + df["Short Intro"].astype(str)
-        + "; "
-        + df["Skills"].astype(str)
-    )
-
-    # Select relevant columns
-    df = df[["Title", "url", "course_desc", "Skills"]]
-
-    # Remove duplicates
-    df = df.drop_duplicates(subset=["url"])
-
-    return df
+    return load_catalog(file_path or COURSES_DATASET_PATH)
 
 
 def embed_courses(
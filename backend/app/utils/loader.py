@@ -2,12 +2,23 @@
 Utility class for loading and caching spaCy models.
 """
 
+import logging
+import time
 from pathlib import Path
 from typing import Dict, Optional
 
 import spacy
 
-from ..core.config import DEFAULT_MODEL, MODELS_DIR
+from ..core.config import (
+    DEFAULT_MODEL,
+    MODEL_BUNDLES_DIR,
+    MODEL_BUNDLES_ENABLED,
+    MODELS_DIR,
+)
+from .memory_utils import MB, process_memory
+from .model_bundle import bundle_is_current, load_bundle
+
+logger = logging.getLogger(__name__)
 
 
 class ModelLoader:
@@ -20,6 +31,9 @@ class ModelLoader:
         """
         Load a spaCy model by name, or return a cached instance if already loaded.
 
+        The model is restored from its bundle (see `app.utils.model_bundle`)
+        when a current one exists, otherwise loaded from its directory.
+
         Args:
             model_name: Name of the model to load. If None, uses the default model.
 
@@ -41,8 +55,22 @@ class ModelLoader:
         if not model_path.exists():
             raise ValueError(f"Model '{model_name}' not found in {MODELS_DIR}")
 
-        # Load the model
-        nlp = spacy.load(model_path)
+        # Load the model, logging what it cost
+        rss_before = process_memory()["rss"] or 0
+        start = time.perf_counter()
+        bundle_dir = Path(MODEL_BUNDLES_DIR) / model_name
+        if MODEL_BUNDLES_ENABLED and bundle_is_current(bundle_dir, model_path):
+            nlp = load_bundle(bundle_dir)
+            source = "bundle"
+        else:
+            nlp = spacy.load(model_path)
+            source = "directory"
+        elapsed = time.perf_counter() - start
+        rss_after = process_memory()["rss"] or 0
+        logger.info(
+            f"Loaded model '{model_name}' from {source} in {elapsed:.2f}s "
+            f"(+{(rss_after - rss_before) / MB:.0f} MB, RSS {rss_after / MB:.0f} MB)"
+        )
 
         # Cache the model
         cls._models[model_name] = nlp
@@ -0,0 +1,100 @@
+"""
+Utility functions for measuring memory use.
+"""
+
+import sys
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+MB = 2**20
+
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """
+    Read the memory use of the current process from /proc (Linux only).
+
+    USS (memory only this process uses) is what would be freed if it exited;
+    with several workers forked from one parent it is the per-worker cost,
+    while RSS also counts shared pages.
+
+    Returns:
+        Bytes of `rss`, `peak_rss`, `uss` and `pss` (None where unavailable)
+    """
+    memory = {"rss": None, "peak_rss": None, "uss": None, "pss": None}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in ("VmRSS", "VmHWM"):
+                    key = "rss" if name == "VmRSS" else "peak_rss"
+                    memory[key] = int(value.split()[0]) * 1024
+    except OSError:
+        return memory
+
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            private = 0
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in ("Private_Clean", "Private_Dirty"):
+                    private += int(value.split()[0]) * 1024
+                elif name == "Pss":
+                    memory["pss"] = int(value.split()[0]) * 1024
+            memory["uss"] = private
+    except OSError:
+        pass
+    return memory
+
+
+def deep_sizeof(obj: Any, _seen: Optional[set] = None) -> int:
+    """
+    Estimate the bytes held by an object and everything it references.
+
+    Follows dicts, lists, tuples, sets and object attributes; NumPy arrays
+    count their data buffer unless they are views. Shared objects are counted
+    once.
+
+    Args:
+        obj: The object to measure
+
+    Returns:
+        Estimated size in bytes
+    """
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        # Includes the data buffer for arrays that own it, not for views
+        return sys.getsizeof(obj)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(
+            deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items()
+        )
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+def thinc_param_bytes(model: Any) -> int:
+    """
+    Sum the bytes of the parameters of a thinc model and its layers.
+
+    Args:
+        model: A thinc `Model` (e.g. a spaCy pipe's `model`)
+
+    Returns:
+        Parameter bytes
+    """
+    total = 0
+    for node in model.walk():
+        for name in node.param_names:
+            if node.has_param(name):
+                total += node.get_param(name).nbytes
+    return total
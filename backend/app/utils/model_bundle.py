@@ -0,0 +1,279 @@
+"""
+Utility functions for packing spaCy models into bundles that load quickly.
+
+`spacy.load` on a model directory parses and resolves `config.cfg`, validates
+it, then reads the vocabulary, tokenizer and every pipe from separate files.
+A bundle stores what that produces instead:
+
+- `config.cfg`: the config with every variable already interpolated
+- `pipeline.bin`: the whole pipeline (vocabulary, tokenizer, pipes) as one
+  `Language.to_bytes` blob, without the word vectors
+- `vectors.npy` / `vector_keys.npy`: the word vector table and its key to row
+  mapping, memory-mapped on load instead of being copied into the process
+- `bundle.json`: the manifest, with a fingerprint of the source model
+
+A bundle is only used while its fingerprint matches the source directory and
+the installed spaCy version, so retraining a model never serves stale weights.
+Likewise, the saved sentence embedding model is only used while its manifest
+matches the configured model and the installed sentence-transformers version.
+"""
+
+import hashlib
+import json
+import logging
+import shutil
+import time
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import spacy
+
+from ..core.config import EMBEDDING_MODEL_NAME, MODEL_BUNDLES_DIR
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_MANIFEST_FILE = "bundle.json"
+BUNDLE_CONFIG_FILE = "config.cfg"
+BUNDLE_PIPELINE_FILE = "pipeline.bin"
+BUNDLE_VECTORS_FILE = "vectors.npy"
+BUNDLE_VECTOR_KEYS_FILE = "vector_keys.npy"
+
+# Directory of the saved sentence embedding model inside MODEL_BUNDLES_DIR
+EMBEDDER_BUNDLE_DIR = "embedder"
+
+
+def source_fingerprint(model_path: Path) -> str:
+    """
+    Fingerprint a model directory and the installed spaCy version.
+
+    Args:
+        model_path: Directory of the model
+
+    Returns:
+        Hex digest over the path, size and modification time of every file
+    """
+    digest = hashlib.sha256(spacy.__version__.encode())
+    for path in sorted(p for p in model_path.rglob("*") if p.is_file()):
+        stat = path.stat()
+        digest.update(
+            f"{path.relative_to(model_path)}:{stat.st_size}:{stat.st_mtime_ns}".encode()
+        )
+    return digest.hexdigest()
+
+
+def build_bundle(model_path: Path, bundle_dir: Path) -> Dict[str, Any]:
+    """
+    Pack a spaCy model directory into a bundle.
+
+    The bundle is written next to `bundle_dir` and moved into place when
+    complete, so a running server never sees a partial bundle.
+
+    Args:
+        model_path: Directory of the model
+        bundle_dir: Directory to write the bundle to (replaced if it exists)
+
+    Returns:
+        The bundle manifest
+    """
+    nlp = spacy.load(model_path)
+    vectors = nlp.vocab.vectors
+    # Floret vectors hash subwords instead of mapping keys to rows; they stay in
+    # the pipeline bytes
+    split_vectors = vectors.mode == "default"
+
+    tmp_dir = bundle_dir.with_name(bundle_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    (tmp_dir / BUNDLE_CONFIG_FILE).write_text(
+        nlp.config.interpolate().to_str(), encoding="utf-8"
+    )
+    exclude = ["vectors"] if split_vectors else []
+    (tmp_dir / BUNDLE_PIPELINE_FILE).write_bytes(nlp.to_bytes(exclude=exclude))
+    if split_vectors:
+        np.save(tmp_dir / BUNDLE_VECTORS_FILE, np.ascontiguousarray(vectors.data))
+        keys = np.array(list(vectors.key2row.items()), dtype=np.uint64)
+        np.save(tmp_dir / BUNDLE_VECTOR_KEYS_FILE, keys.reshape(-1, 2))
+
+    manifest = {
+        "model_name": model_path.name,
+        "spacy_version": spacy.__version__,
+        "fingerprint": source_fingerprint(model_path),
+        "vectors": {
+            "split": split_vectors,
+            "name": vectors.name,
+            "shape": list(vectors.shape),
+        },
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    with open(tmp_dir / BUNDLE_MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(bundle_dir, ignore_errors=True)
+    tmp_dir.rename(bundle_dir)
+    return manifest
+
+
+def read_manifest(bundle_dir: Path) -> Optional[Dict[str, Any]]:
+    """
+    Read the manifest of a bundle.
+
+    Args:
+        bundle_dir: Directory of the bundle
+
+    Returns:
+        The manifest, or None if there is no complete bundle
+    """
+    try:
+        with open(bundle_dir / BUNDLE_MANIFEST_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def bundle_is_current(bundle_dir: Path, model_path: Path) -> bool:
+    """
+    Check that a bundle exists and was built from the current source model.
+
+    Args:
+        bundle_dir: Directory of the bundle
+        model_path: Directory of the source model
+
+    Returns:
+        True if the bundle can be loaded in place of the source model
+    """
+    manifest = read_manifest(bundle_dir)
+    if manifest is None:
+        return False
+    if manifest.get("fingerprint") != source_fingerprint(model_path):
+        logger.warning(
+            f"Model bundle {bundle_dir} is stale (source model or spaCy changed); "
+            "rebuild it with `python -m app.build_model_bundles`"
+        )
+        return False
+    return True
+
+
+def load_bundle(bundle_dir: Path) -> spacy.language.Language:
+    """
+    Restore a spaCy model from a bundle.
+
+    Args:
+        bundle_dir: Directory of the bundle
+
+    Returns:
+        The loaded model, its word vectors memory-mapped from the bundle
+    """
+    from spacy.vectors import Vectors
+
+    manifest = read_manifest(bundle_dir)
+    if manifest is None:
+        raise ValueError(f"No model bundle in {bundle_dir}")
+
+    config = spacy.util.load_config(bundle_dir / BUNDLE_CONFIG_FILE, interpolate=False)
+    # The config was filled and validated when the source model was trained
+    nlp = spacy.util.load_model_from_config(config, auto_fill=False, validate=False)
+    vectors_info = manifest["vectors"]
+    exclude = ["vectors"] if vectors_info["split"] else []
+    nlp.from_bytes((bundle_dir / BUNDLE_PIPELINE_FILE).read_bytes(), exclude=exclude)
+
+    if vectors_info["split"]:
+        data = np.load(bundle_dir / BUNDLE_VECTORS_FILE, mmap_mode="r")
+        keys = np.load(bundle_dir / BUNDLE_VECTOR_KEYS_FILE)
+        vectors = Vectors(
+            strings=nlp.vocab.strings, data=data, name=vectors_info["name"]
+        )
+        for key, row in keys:
+            vectors.add(int(key), row=int(row))
+        nlp.vocab.vectors = vectors
+    return nlp
+
+
+def embedder_bundle_path(
+    bundles_dir: str = MODEL_BUNDLES_DIR, model_name: str = EMBEDDING_MODEL_NAME
+) -> Path:
+    """
+    Get the directory of the saved sentence embedding model.
+
+    Loading a sentence-transformers model from a local directory skips
+    resolving its files through the Hugging Face cache.
+
+    Args:
+        bundles_dir: Directory of the bundles
+        model_name: Name of the sentence-transformers model
+
+    Returns:
+        Directory of the saved model (may not exist yet)
+    """
+    return Path(bundles_dir) / EMBEDDER_BUNDLE_DIR / model_name
+
+
+def embedder_fingerprint(model_name: str = EMBEDDING_MODEL_NAME) -> Dict[str, str]:
+    """
+    Identify the sentence embedding model a bundle must have been saved from.
+
+    Args:
+        model_name: Name of the sentence-transformers model
+
+    Returns:
+        The model name and the installed sentence-transformers version
+    """
+    return {
+        "model_name": model_name,
+        "sentence_transformers_version": metadata.version("sentence-transformers"),
+    }
+
+
+def write_embedder_manifest(
+    bundle_path: Path, model_name: str = EMBEDDING_MODEL_NAME
+) -> Dict[str, Any]:
+    """
+    Record what a saved sentence embedding model was saved from.
+
+    Args:
+        bundle_path: Directory of the saved model
+        model_name: Name of the sentence-transformers model
+
+    Returns:
+        The manifest
+    """
+    manifest = {
+        **embedder_fingerprint(model_name),
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    with open(bundle_path / BUNDLE_MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def embedder_bundle_is_current(
+    bundle_path: Path, model_name: str = EMBEDDING_MODEL_NAME
+) -> bool:
+    """
+    Check that a saved sentence embedding model matches the configured one.
+
+    Args:
+        bundle_path: Directory of the saved model
+        model_name: Name of the sentence-transformers model
+
+    Returns:
+        True if the saved model can be loaded in place of the hub model
+    """
+    manifest = read_manifest(bundle_path)
+    if manifest is None:
+        if bundle_path.exists():
+            logger.warning(
+                f"Embedder bundle {bundle_path} has no manifest; rebuild it with "
+                "`python -m app.build_model_bundles`"
+            )
+        return False
+    fingerprint = embedder_fingerprint(model_name)
+    if any(manifest.get(name) != value for name, value in fingerprint.items()):
+        logger.warning(
+            f"Embedder bundle {bundle_path} is stale (model or sentence-transformers "
+            "changed); rebuild it with `python -m app.build_model_bundles`"
+        )
+        return False
+    return True
@@ -0,0 +1,263 @@
+"""
+Utility class for memoizing work within one recommendation request and
+tracking its deadline.
+
+A request analyses the same texts in several services (the resume is needed
+for skill matching and again for the prompt, skills recur across recommended
+courses). Services that receive a `RequestContext` look their results up in it,
+so each text is run through NER and each skill is embedded once per request.
+
+A request may also have a deadline. Stages check the remaining budget before
+expensive work and degrade when it runs short, always in the order of
+`DEGRADATIONS`: a degradation implies the ones before it, so a request that
+had to use fewer NER models does not then wait on the LLM either. A stage that
+already ran at full quality is settled (see `settle`), and is no longer
+degraded by a later stage running short.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Degradations, from the first applied to the last
+DEGRADATIONS = (
+    # Recommended courses are returned without potential scores
+    "skip_course_scoring",
+    # Courses are selected by skill-gap coverage instead of by the LLM
+    "retrieval_only",
+    # Only the default NER model extracts the resume and course skills
+    "fewer_ner_models",
+)
+
+
+class RequestContext:
+    """Memoizes the work of one request and tracks its deadline."""
+
+    # Totals over every finished request in this process
+    _totals: Counter = Counter()
+    _totals_lock = threading.Lock()
+
+    def __init__(self, deadline_seconds: Optional[float] = None):
+        """
+        Start a request.
+
+        Args:
+            deadline_seconds: Time budget of the request from now (no deadline
+                if None or 0)
+        """
+        self.deadline = (
+            time.monotonic() + deadline_seconds if deadline_seconds else None
+        )
+        self.degradations: List[str] = []
+        # Degradations whose stage already ran without them (see `settle`)
+        self._settled: Set[str] = set()
+        self._memo: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self.computed: Counter = Counter()
+        self.reused: Counter = Counter()
+        # Times each (model, key) went through a model (see
+        # `record_invocation`); `stats` reports the maximum, which is 1 unless
+        # some work escaped the memo
+        self._invocations: Counter = Counter()
+
+    def memoize_many(
+        self,
+        kind: str,
+        keys: Iterable[Hashable],
+        compute_many: Callable[[List[Hashable]], Iterable[Any]],
+    ) -> Dict[Hashable, Any]:
+        """
+        Get memoized values, computing the missing ones in one batch.
+
+        Safe to call from concurrent stages: a key being computed by another
+        thread is waited for instead of being computed twice.
+
+        Args:
+            kind: Kind of value (e.g. "entities", "embeddings")
+            keys: Keys of the values
+            compute_many: Computes the values of a list of keys, in order
+
+        Returns:
+            Value by key
+        """
+        keys = list(dict.fromkeys(keys))
+        with self._lock:
+            owned = [key for key in keys if (kind, key) not in self._memo]
+            for key in owned:
+                self._memo[(kind, key)] = Future()
+            self.computed[kind] += len(owned)
+            self.reused[kind] += len(keys) - len(owned)
+
+        if owned:
+            try:
+                values = list(compute_many(owned))
+            except Exception as e:
+                for key in owned:
+                    self._memo[(kind, key)].set_exception(e)
+                raise
+            for key, value in zip(owned, values):
+                self._memo[(kind, key)].set_result(value)
+
+        return {key: self._memo[(kind, key)].result() for key in keys}
+
+    def record_invocation(self, model: str, keys: Iterable[Hashable]) -> None:
+        """
+        Count that some inputs were run through a model.
+
+        Called where the model actually runs, so inputs processed more than
+        once in a request show up in `stats`.
+
+        Args:
+            model: The model (e.g. "ner:<model name>", "embedding")
+            keys: The inputs (e.g. texts, skills)
+        """
+        with self._lock:
+            self._invocations.update((model, key) for key in keys)
+
+    def is_memoized(self, kind: str, key: Hashable) -> bool:
+        """Return whether a value is memoized or being computed."""
+        with self._lock:
+            return (kind, key) in self._memo
+
+    def memoize(self, kind: str, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Get a memoized value, computing it on first use.
+
+        Args:
+            kind: Kind of value (e.g. "entities", "skills")
+            key: Key of the value (e.g. the text it was derived from)
+            compute: Computes the value
+
+        Returns:
+            The value
+        """
+        return self.memoize_many(kind, [key], lambda _: [compute()])[key]
+
+    def remaining(self) -> Optional[float]:
+        """
+        Get the time left before the deadline.
+
+        Returns:
+            Seconds left (negative once passed), or None without a deadline
+        """
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def has_budget(self, seconds: float) -> bool:
+        """
+        Check whether at least `seconds` are left before the deadline.
+
+        Args:
+            seconds: Time the caller's work needs
+
+        Returns:
+            True if there is no deadline or enough time left
+        """
+        remaining = self.remaining()
+        return remaining is None or remaining >= seconds
+
+    def degrade(self, degradation: str) -> None:
+        """
+        Apply a degradation and the unsettled ones before it in `DEGRADATIONS`.
+
+        Args:
+            degradation: One of `DEGRADATIONS`
+        """
+        implied = DEGRADATIONS[: DEGRADATIONS.index(degradation)]
+        with self._lock:
+            for name in (*implied, degradation):
+                if name in self.degradations:
+                    continue
+                if name != degradation and name in self._settled:
+                    continue
+                self.degradations.append(name)
+        remaining = self.remaining()
+        logger.info(
+            f"Request: Degraded to {degradation}"
+            + (f" with {remaining:.2f}s left" if remaining is not None else "")
+        )
+
+    def settle(self, degradation: str) -> None:
+        """
+        Record that the stage of a degradation ran (or is running) without it.
+
+        A later degradation then no longer implies this one; the stage itself
+        can still degrade explicitly, e.g. when a call it started is cut short.
+
+        Args:
+            degradation: One of `DEGRADATIONS`
+        """
+        with self._lock:
+            self._settled.add(degradation)
+
+    def is_degraded(self, degradation: str) -> bool:
+        """Return whether a degradation was applied."""
+        with self._lock:
+            return degradation in self.degradations
+
+    def should_degrade(self, degradation: str, min_seconds: float) -> bool:
+        """
+        Decide whether a stage must degrade, applying the degradation if so.
+
+        Args:
+            degradation: The stage's degradation, one of `DEGRADATIONS`
+            min_seconds: Time the stage needs at full quality
+
+        Returns:
+            True if the degradation was already applied or the remaining budget
+            is below `min_seconds`; False settles the degradation
+        """
+        with self._lock:
+            if degradation in self.degradations:
+                return True
+            if self.has_budget(min_seconds):
+                self._settled.add(degradation)
+                return False
+        self.degrade(degradation)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report how much work was computed and reused in this request.
+
+        Returns:
+            Computed and reused counts per kind, and the most times any single
+            input went through the same model (1 when nothing was duplicated)
+        """
+        with self._lock:
+            return {
+                "computed": dict(self.computed),
+                "reused": dict(self.reused),
+                "max_invocations_per_key": max(
+                    self._invocations.values(), default=0
+                ),
+            }
+
+    def close(self) -> None:
+        """Add this request's counts to the process totals."""
+        stats = self.stats()
+        with self._totals_lock:
+            totals = RequestContext._totals
+            totals["requests"] += 1
+            for kind, count in stats["computed"].items():
+                totals[f"{kind}_computed"] += count
+            for kind, count in stats["reused"].items():
+                totals[f"{kind}_reused"] += count
+            totals["max_invocations_per_key"] = max(
+                totals["max_invocations_per_key"],
+                stats["max_invocations_per_key"],
+            )
+            for degradation in self.degradations:
+                totals[f"degraded_{degradation}"] += 1
+
+    @classmethod
+    def get_totals(cls) -> Dict[str, int]:
+        """Return the counts over every finished request in this process."""
+        with cls._totals_lock:
+            return dict(cls._totals)
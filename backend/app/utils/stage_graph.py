@@ -0,0 +1,226 @@
+"""
+Utility for running the stages of a pipeline as a dependency graph.
+
+Each stage starts as soon as the stages it depends on have finished, so
+independent stages overlap and the latency of a run approaches its critical
+path instead of the sum of all stages.
+
+CPU stages (NER, embedding, scoring) run on a shared, bounded thread pool
+sized to the cores; spaCy, NumPy and PyTorch release the GIL in their heavy
+loops. I/O stages (cache, Pinecone and LLM calls) run on threads owned by the
+run, because the upstream clients are synchronous. I/O stages may wait on CPU
+work (including nested graphs); CPU stages must never wait on other stages,
+which keeps the shared pool from deadlocking.
+"""
+
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from ..core.config import PIPELINE_CPU_WORKERS
+from .cpu_tuning import available_cpus
+
+_cpu_pool: Optional[ThreadPoolExecutor] = None
+_cpu_pool_lock = threading.Lock()
+
+
+def cpu_pool_size() -> int:
+    """Return the number of threads of the CPU pool (see `cpu_pool`)."""
+    return PIPELINE_CPU_WORKERS or available_cpus()
+
+
+def cpu_pool() -> ThreadPoolExecutor:
+    """
+    Get the thread pool shared by the CPU stages of every run.
+
+    Returns:
+        Pool with PIPELINE_CPU_WORKERS threads (default: one per core)
+    """
+    global _cpu_pool
+    if _cpu_pool is None:
+        with _cpu_pool_lock:
+            if _cpu_pool is None:
+                _cpu_pool = ThreadPoolExecutor(
+                    max_workers=cpu_pool_size(),
+                    thread_name_prefix="pipeline-cpu",
+                )
+    return _cpu_pool
+
+
+class Stage(NamedTuple):
+    """A pipeline stage: a function of the results of its dependencies."""
+
+    name: str
+    fn: Callable[..., Any]
+    deps: tuple
+    kind: str
+
+
+class StageGraph:
+    """
+    A dependency graph of stages.
+
+    Example:
+        graph = StageGraph()
+        graph.add("a", load_a, kind="io")
+        graph.add("b", compute_b)
+        graph.add("c", combine, deps=("a", "b"))
+        results = graph.run()  # a and b run concurrently, then c(a, b)
+    """
+
+    def __init__(self, timings: Optional[Dict[str, float]] = None):
+        """
+        Create an empty graph.
+
+        Args:
+            timings: Dictionary to record stage durations in as each stage
+                finishes (a new one if None), so other threads can follow a
+                run's progress
+        """
+        self._stages: Dict[str, Stage] = {}
+        self.timings: Dict[str, float] = {} if timings is None else timings
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        deps: Iterable[str] = (),
+        kind: str = "cpu",
+    ) -> "StageGraph":
+        """
+        Add a stage.
+
+        Args:
+            name: Unique stage name
+            fn: Called with the results of `deps`, in order
+            deps: Names of the stages this one needs (added before it)
+            kind: "cpu" to run on the shared CPU pool, "io" to run on a
+                thread of this run
+
+        Returns:
+            The graph, for chaining
+        """
+        if name in self._stages:
+            raise ValueError(f"Duplicate stage '{name}'")
+        deps = tuple(deps)
+        missing = [dep for dep in deps if dep not in self._stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stages {missing}")
+        if kind not in ("cpu", "io"):
+            raise ValueError(f"Unknown stage kind '{kind}'")
+        self._stages[name] = Stage(name, fn, deps, kind)
+        return self
+
+    def run(
+        self,
+        stop_when: Optional[Callable[[str, Any], bool]] = None,
+        on_stage: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run every stage once its dependencies are done.
+
+        Stage durations (milliseconds) are recorded in `timings`.
+
+        Args:
+            stop_when: Called with each finished stage's name and result;
+                returning True skips the stages that have not started yet
+                (e.g. on a cache hit)
+            on_stage: Called with the name of each stage as it starts
+
+        Returns:
+            Result by stage name, for the stages that ran
+
+        Raises:
+            Exception: The first exception raised by a stage, once the other
+                stages already running have finished; stages that have not
+                started yet are skipped
+        """
+        results: Dict[str, Any] = {}
+        pending = dict(self._stages)
+        running: Dict[Future, str] = {}
+        started: Dict[str, float] = {}
+        io_stages = sum(stage.kind == "io" for stage in self._stages.values())
+        io_pool = ThreadPoolExecutor(
+            max_workers=max(1, io_stages), thread_name_prefix="pipeline-io"
+        )
+
+        def submit_ready() -> None:
+            for name, stage in list(pending.items()):
+                if all(dep in results for dep in stage.deps):
+                    del pending[name]
+                    if on_stage is not None:
+                        on_stage(name)
+                    pool = cpu_pool() if stage.kind == "cpu" else io_pool
+                    args = [results[dep] for dep in stage.deps]
+                    started[name] = time.perf_counter()
+                    running[pool.submit(stage.fn, *args)] = name
+
+        try:
+            submit_ready()
+            while running:
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                stop = False
+                for future in done:
+                    name = running.pop(future)
+                    elapsed = time.perf_counter() - started[name]
+                    self.timings[name] = round(elapsed * 1000, 2)
+                    # Re-raises the stage's exception
+                    results[name] = future.result()
+                    if stop_when is not None and stop_when(name, results[name]):
+                        stop = True
+                if stop:
+                    pending.clear()
+                    break
+                submit_ready()
+        except BaseException:
+            # Let the stages already running finish, so the caller can release
+            # what they use; their results and errors are dropped
+            wait(list(running))
+            raise
+        finally:
+            # After a stop, stages already running finish in the background
+            io_pool.shutdown(wait=False)
+
+        return results
+
+
+def map_cpu(fn: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+    """
+    Apply a CPU-bound function to items concurrently on the shared pool.
+
+    Must only be called from I/O stages or outside a graph (see module docs).
+
+    Args:
+        fn: Function of one item
+        items: Items to process
+
+    Returns:
+        Results in the order of the items
+    """
+    return list(cpu_pool().map(fn, items))
+
+
+def map_io(fn: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+    """
+    Apply an I/O-bound function to items concurrently on dedicated threads.
+
+    Args:
+        fn: Function of one item
+        items: Items to process
+
+    Returns:
+        Results in the order of the items
+    """
+    items = list(items)
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(
+        max_workers=len(items), thread_name_prefix="pipeline-io"
+    ) as pool:
+        return list(pool.map(fn, items))
@@ -0,0 +1,190 @@
+"""
+Utility functions for normalizing and fingerprinting free text.
+"""
+
+import hashlib
+import re
+from typing import Iterator, List
+
+EMAIL_PATTERN = re.compile(r"\S+@\S+\.\S+")
+URL_PATTERN = re.compile(r"(https?://|www\.)\S+")
+PHONE_PATTERN = re.compile(r"\+?\d[\d\s().-]{6,}\d")
+NON_WORD_PATTERN = re.compile(r"[^\w+#]+")
+SKILL_SEPARATOR_PATTERN = re.compile(r"[,;|]")
+
+
+def canonicalize_text(text: str) -> str:
+    """
+    Canonicalize text so that cosmetic edits do not change it.
+
+    Lowercases the text, strips contact information (emails, URLs, phone
+    numbers), replaces bullets and punctuation with spaces and collapses
+    whitespace. `+` and `#` are kept so skills like C++ and C# survive.
+
+    Args:
+        text: The raw text
+
+    Returns:
+        Canonical form of the text
+    """
+    text = text.lower()
+    text = EMAIL_PATTERN.sub(" ", text)
+    text = URL_PATTERN.sub(" ", text)
+    text = PHONE_PATTERN.sub(" ", text)
+    text = NON_WORD_PATTERN.sub(" ", text)
+    return " ".join(text.split())
+
+
+def split_skill_list(skills: str) -> List[str]:
+    """
+    Split a delimited skill list (e.g. the `Skills` column of the courses).
+
+    Args:
+        skills: Comma/semicolon/pipe separated skill string
+
+    Returns:
+        List of non-empty skill strings
+    """
+    return [s.strip() for s in SKILL_SEPARATOR_PATTERN.split(skills or "") if s.strip()]
+
+
+def normalize_skill(skill: str) -> str:
+    """
+    Reduce a skill to a lookup key that ignores case and spacing.
+
+    Punctuation inside the skill is kept, so "Node.js", "C++" and ".NET" stay
+    distinct from "Node", "C" and "NET".
+
+    Args:
+        skill: The skill text
+
+    Returns:
+        Normalized key
+    """
+    return " ".join(skill.lower().split()).strip(" ,;:")
+
+
+def _shingles(tokens: List[str], size: int) -> List[str]:
+    """Return the overlapping word n-grams of a token list."""
+    if len(tokens) <= size:
+        return [" ".join(tokens)] if tokens else []
+    return [" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)]
+
+
+def simhash(text: str, bits: int = 64, shingle_size: int = 3) -> int:
+    """
+    Compute a SimHash signature over the word shingles of a text.
+
+    Texts that share most of their shingles get signatures with a small
+    Hamming distance.
+
+    Args:
+        text: Canonicalized text
+        bits: Signature size in bits
+        shingle_size: Number of words per shingle
+
+    Returns:
+        The signature as an integer
+    """
+    weights = [0] * bits
+    for shingle in _shingles(text.split(), shingle_size):
+        digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=bits // 8)
+        value = int.from_bytes(digest.digest(), "big")
+        for bit in range(bits):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    signature = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            signature |= 1 << bit
+    return signature
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """
+    Count the differing bits between two signatures.
+
+    Args:
+        a: First signature
+        b: Second signature
+
+    Returns:
+        Number of differing bits
+    """
+    return bin(a ^ b).count("1")
+
+
+def signature_bands(signature: int, bands: int, bits: int = 64) -> List[int]:
+    """
+    Split a signature into equally sized bands for LSH bucketing.
+
+    Two signatures within Hamming distance `bands - 1` are guaranteed to
+    share at least one identical band.
+
+    Args:
+        signature: The signature to split
+        bands: Number of bands
+        bits: Signature size in bits
+
+    Returns:
+        List of band values, one per band
+    """
+    width = bits // bands
+    mask = (1 << width) - 1
+    return [(signature >> (i * width)) & mask for i in range(bands)]
+
+
+# Blank lines separate paragraphs and resume/job description sections
+PARAGRAPH_BREAK_PATTERN = re.compile(r"\n\s*\n")
+
+
+def _split_long_block(block: str, max_chars: int) -> Iterator[str]:
+    """Split a block longer than `max_chars` on line breaks, then on spaces."""
+    for line in block.splitlines():
+        line = line.strip()
+        while len(line) > max_chars:
+            cut = line.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            yield line[:cut]
+            line = line[cut:].strip()
+        if line:
+            yield line
+
+
+def split_into_chunks(text: str, max_chars: int) -> Iterator[str]:
+    """
+    Lazily split text into chunks on paragraph and section boundaries.
+
+    Paragraphs are packed together while they fit in `max_chars`. Paragraphs
+    that are too long on their own are split on line breaks, and lines that
+    are still too long are split on whitespace.
+
+    Args:
+        text: The text to split
+        max_chars: Maximum number of characters per chunk
+
+    Returns:
+        Iterator over chunks of at most `max_chars` characters
+    """
+    current: List[str] = []
+    size = 0
+
+    for paragraph in PARAGRAPH_BREAK_PATTERN.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        blocks = (
+            [paragraph]
+            if len(paragraph) <= max_chars
+            else _split_long_block(paragraph, max_chars)
+        )
+        for block in blocks:
+            if current and size + len(block) + 2 > max_chars:
+                yield "\n\n".join(current)
+                current, size = [], 0
+            current.append(block)
+            size += len(block) + 2
+
+    if current:
+        yield "\n\n".join(current)
@@ -0,0 +1,146 @@
+"""Tests for the cross-request batching of `DynamicBatcher`."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+import spacy
+
+from app.core.config import MODELS_DIR
+from app.utils.batcher import DynamicBatcher
+
+NER_MODEL = "ner_model_20000"
+
+
+def test_results_are_returned_in_order():
+    batcher = DynamicBatcher(lambda items: [item * 2 for item in items], 8, 1)
+
+    assert batcher.submit_many([1, 2, 3]) == [2, 4, 6]
+    assert batcher.submit(5) == 10
+    assert batcher.submit_many([]) == []
+
+
+def test_concurrent_callers_share_batches():
+    batch_sizes = []
+
+    def fn(items):
+        batch_sizes.append(len(items))
+        return [item.upper() for item in items]
+
+    batcher = DynamicBatcher(fn, 64, 50, workers=1)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda n: batcher.submit_many([f"t{n}"]), range(8)))
+
+    assert results == [[f"T{n}"] for n in range(8)]
+    assert len(batch_sizes) < 8
+    assert batcher.stats()["items"] == 8
+
+
+def test_batches_hold_at_most_max_items():
+    batch_sizes = []
+
+    def fn(items):
+        batch_sizes.append(len(items))
+        return items
+
+    batcher = DynamicBatcher(fn, 3, 20, workers=1)
+
+    assert batcher.submit_many(list(range(10))) == list(range(10))
+    assert max(batch_sizes) <= 3
+
+
+def test_model_errors_reach_the_callers():
+    def fn(items):
+        raise RuntimeError("model failed")
+
+    batcher = DynamicBatcher(fn, 8, 1, workers=1)
+
+    with pytest.raises(RuntimeError, match="model failed"):
+        batcher.submit_many(["a", "b"])
+    # The worker keeps serving after a failed batch
+    batcher.fn = lambda items: items
+    assert batcher.submit("c") == "c"
+
+
+def test_wrong_result_count_is_an_error():
+    batcher = DynamicBatcher(lambda items: items[:-1], 8, 1, workers=1)
+
+    with pytest.raises(ValueError):
+        batcher.submit_many(["a", "b"])
+
+
+def test_workers_run_batches_concurrently():
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fn(items):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return items
+
+    batcher = DynamicBatcher(fn, 1, 0, workers=4)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(batcher.submit, range(4)))
+
+    assert results == list(range(4))
+    assert batcher.stats()["workers"] == 4
+    assert peak > 1
+
+
+def test_one_worker_calls_the_model_by_default():
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fn(items):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return items
+
+    batcher = DynamicBatcher(fn, 1, 0)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(batcher.submit, range(8)))
+
+    assert batcher.workers == 1
+    assert peak == 1
+
+
+@pytest.mark.skipif(
+    not (Path(MODELS_DIR) / NER_MODEL).is_dir(), reason="NER model not available"
+)
+def test_concurrent_submits_match_a_real_model():
+    nlp = spacy.load(Path(MODELS_DIR) / NER_MODEL)
+    sentences = [
+        "Experience with machine learning, data analysis and project management.",
+        "We need communication skills and knowledge of Python programming.",
+        "Responsible for software development, cloud computing and customer service.",
+    ]
+    texts = [f"{sentences[i % 3]} Role {i}." for i in range(48)]
+    expected = [[(e.text, e.label_) for e in doc.ents] for doc in nlp.pipe(texts)]
+
+    batcher = DynamicBatcher(
+        lambda items: [
+            [(e.text, e.label_) for e in doc.ents] for doc in nlp.pipe(items)
+        ],
+        8,
+        5,
+    )
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(batcher.submit, texts))
+
+    assert results == expected
+    assert all(results)
+    assert batcher.stats()["mean_batch_size"] > 1
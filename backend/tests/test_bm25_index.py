@@ -0,0 +1,71 @@
+"""Tests for the BM25 keyword index."""
+
+from app.utils.bm25_index import BM25Index, tokenize
+
+TEXTS = [
+    "Python for data analysis",
+    "Advanced Python and machine learning with Python",
+    "Cooking basics",
+]
+DOCUMENTS = [{"title": f"Course {i}"} for i in range(len(TEXTS))]
+
+
+def build() -> BM25Index:
+    return BM25Index.build(TEXTS, DOCUMENTS)
+
+
+def test_tokenize_keeps_skill_symbols():
+    assert tokenize("C++ and C#") == ["c++", "and", "c#"]
+
+
+def test_only_documents_sharing_a_term_are_returned():
+    hits = build().search("python", top_k=10)
+
+    assert {doc_id for doc_id, _ in hits} == {0, 1}
+    assert all(score > 0 for _, score in hits)
+
+
+def test_hits_are_ranked_best_first():
+    hits = build().search("machine learning python", top_k=10)
+
+    assert hits[0][0] == 1
+    assert [score for _, score in hits] == sorted(
+        (score for _, score in hits), reverse=True
+    )
+
+
+def test_repeated_query_terms_count_once():
+    index = build()
+
+    assert index.search("python python", top_k=10) == index.search(
+        "python", top_k=10
+    )
+
+
+def test_top_k_bounds_the_hits():
+    index = build()
+
+    assert len(index.search("python cooking", top_k=1)) == 1
+    assert index.search("python", top_k=0) == []
+    assert index.search("unknown", top_k=10) == []
+
+
+def test_saved_index_loads_with_the_same_results(tmp_path):
+    index = build()
+    path = tmp_path / "index.npz"
+
+    index.save(path)
+    loaded = BM25Index.load(path)
+
+    assert len(loaded) == len(index)
+    assert loaded.documents == DOCUMENTS
+    assert loaded.search("python learning", top_k=10) == index.search(
+        "python learning", top_k=10
+    )
+
+
+def test_empty_index_has_no_hits():
+    index = BM25Index.build([], [])
+
+    assert len(index) == 0
+    assert index.search("python", top_k=10) == []
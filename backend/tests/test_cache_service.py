@@ -0,0 +1,104 @@
+"""
+Tests for the exact and near-duplicate lookups of `CacheService`.
+"""
+
+import random
+
+import pytest
+
+from app.services.cache_backends import DiskCacheBackend
+from app.services.cache_service import CacheService
+
+WORDS = (
+    "python java react docker kubernetes aws sql team lead design build ship "
+    "scale data pipeline model api service cloud test"
+).split()
+
+RESUME = " ".join(random.Random(0).choice(WORDS) for _ in range(300))
+JOB_DESCRIPTION = "Senior engineer with Python, Docker and AWS experience. " * 20
+
+RESULT = {
+    "recommended_courses": [{"course_name": "Docker", "url": "u", "description": ""}],
+    "skill_gap": ["kubernetes"],
+    "job_skills": ["python", "kubernetes"],
+    "user_skills": ["python"],
+    "score": 50.0,
+    "matching_details": [
+        {
+            "job_skill": "python",
+            "best_match": "python",
+            "similarity": 1.0,
+            "is_match": True,
+        }
+    ],
+    "analysis_id": "abc",
+    "truncation": None,
+}
+
+
+@pytest.fixture(autouse=True)
+def backend(tmp_path):
+    backend = DiskCacheBackend(str(tmp_path / "cache"), 10**8)
+    CacheService.set_backend(backend)
+    yield backend
+    CacheService.set_backend(None)
+
+
+def test_exact_hit_returns_the_stored_result():
+    CacheService.set_course_recommendation(RESUME, JOB_DESCRIPTION, 0.5, RESULT)
+
+    assert CacheService.get_course_recommendation(RESUME, JOB_DESCRIPTION, 0.5) == (
+        RESULT
+    )
+    assert CacheService.get_course_recommendation(RESUME, JOB_DESCRIPTION, 0.6) is None
+
+
+def test_near_duplicate_hit_strips_per_user_fields():
+    CacheService.set_course_recommendation(RESUME, JOB_DESCRIPTION, 0.5, RESULT)
+
+    result = CacheService.get_course_recommendation(
+        RESUME + " extra", JOB_DESCRIPTION, 0.5
+    )
+
+    assert result["recommended_courses"] == RESULT["recommended_courses"]
+    assert result["score"] == RESULT["score"]
+    for field in ("analysis_id", "user_skills", "truncation"):
+        assert field not in result
+    assert result["matching_details"][0]["best_match"] is None
+    assert CacheService.get_cache_stats()["lookups"]["near_duplicate_hits"] == 1
+
+
+def test_near_duplicate_skips_expired_entries(backend):
+    closest = RESUME + " extra"
+    CacheService.set_course_recommendation(
+        closest, JOB_DESCRIPTION, 0.5, {**RESULT, "score": 1.0}
+    )
+    CacheService.set_course_recommendation(
+        RESUME + " extra words appended here now",
+        JOB_DESCRIPTION,
+        0.5,
+        {**RESULT, "score": 2.0},
+    )
+    # The closest result expires while its bucket entries live on
+    closest_key = CacheService._create_cache_key(closest, JOB_DESCRIPTION, 0.5)
+    backend.set(closest_key, RESULT, expire_seconds=0)
+
+    result = CacheService.get_course_recommendation(RESUME, JOB_DESCRIPTION, 0.5)
+
+    assert result is not None
+    assert result["score"] == 2.0
+
+
+def test_distant_texts_miss():
+    CacheService.set_course_recommendation(RESUME, JOB_DESCRIPTION, 0.5, RESULT)
+
+    other = " ".join(random.Random(1).choice(WORDS) for _ in range(300))
+    assert CacheService.get_course_recommendation(other, JOB_DESCRIPTION, 0.5) is None
+
+
+def test_access_records_are_buffered_until_read(backend):
+    backend.record_access("key", True, 60)
+    backend.record_access("key", True, 60)
+
+    assert backend._cache.get("access:key") is None
+    assert backend.get_access(["key"])[0][0] == 2
@@ -0,0 +1,63 @@
+"""Tests for the skill-gap reranking of `ContextService`."""
+
+import numpy as np
+import pytest
+
+from app.services.context_service import ContextService
+from app.services.similarity_service import SimilarityService
+from app.services.skill_vocabulary_service import SkillVocabularyService
+from app.utils.request_context import RequestContext
+
+VECTORS = {
+    "python": [1.0, 0.0],
+    "docker": [0.0, 1.0],
+    "cooking": [-1.0, 0.0],
+}
+
+
+@pytest.fixture
+def encoded(monkeypatch):
+    """Serve "python" from the vocabulary and encode every other skill."""
+    calls = []
+
+    def lookup_embeddings(skills):
+        return {s: np.array(VECTORS[s]) for s in skills if s == "python"}
+
+    def get_embeddings(skills):
+        calls.append(list(skills))
+        return np.array([VECTORS[s] for s in skills])
+
+    monkeypatch.setattr(SkillVocabularyService, "lookup_embeddings", lookup_embeddings)
+    monkeypatch.setattr(SimilarityService, "get_embeddings", get_embeddings)
+    return calls
+
+
+def courses():
+    return [
+        {"Title": "Cooking", "Skills": "cooking"},
+        {"Title": "Python", "Skills": "python, docker"},
+    ]
+
+
+def test_courses_are_ranked_by_gap_coverage(encoded):
+    ranked = ContextService.rank_by_gap_coverage(courses(), {"python", "docker"})
+
+    assert [course["Title"] for course in ranked] == ["Python", "Cooking"]
+    assert ranked[0]["covered_skills"] == ["docker", "python"]
+
+
+def test_vocabulary_skills_are_not_encoded(encoded):
+    ContextService.rank_by_gap_coverage(courses(), {"python"})
+
+    assert encoded == [["cooking", "docker"]]
+
+
+def test_encoded_skills_count_as_invocations(encoded):
+    request_context = RequestContext()
+
+    for gap in ({"python"}, {"docker"}):
+        ContextService.rank_by_gap_coverage(courses(), gap, 0.5, request_context)
+
+    # Encoded once, and counted, although both calls needed the same skills
+    assert encoded == [["cooking", "docker"]]
+    assert request_context.stats()["max_invocations_per_key"] == 1
@@ -0,0 +1,169 @@
+"""Tests for the queueing, retries and leases of `JobService`."""
+
+import threading
+import time
+
+import httpx
+import pytest
+import urllib3
+from pinecone.exceptions import PineconeApiException
+
+from app.services import job_service
+from app.services.job_service import JobService
+from app.services.pipeline_service import PipelineService
+
+REQUEST = {
+    "resume_text": "Python developer",
+    "job_description_text": "Python and Docker engineer",
+    "threshold": 0.5,
+    "mode": "deterministic",
+}
+
+
+@pytest.fixture(autouse=True)
+def job_db(tmp_path, monkeypatch):
+    """Give each test its own job database and instant retries."""
+    monkeypatch.setattr(job_service, "JOB_DB_PATH", str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(job_service, "JOB_RETRY_BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(JobService, "_local", threading.local())
+
+
+def pipeline(monkeypatch, *outcomes):
+    """Make the pipeline raise or return each outcome in turn."""
+    outcomes = list(outcomes)
+
+    def run(*args, on_stage=None, timings=None, **kwargs):
+        on_stage("recommendation")
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(PipelineService, "run", run)
+
+
+def run_next():
+    """Claim and run the next due job."""
+    job = JobService._claim()
+    assert job is not None
+    JobService._run(job)
+
+
+@pytest.mark.parametrize(
+    "error, retryable",
+    [
+        (PineconeApiException(status=503), True),
+        (PineconeApiException(status=429), True),
+        (PineconeApiException(status=400), False),
+        (urllib3.exceptions.MaxRetryError(None, "/query"), True),
+        (httpx.ConnectError("refused"), True),
+        (ValueError("bad input"), False),
+    ],
+)
+def test_upstream_failures_are_retryable(error, retryable):
+    assert JobService._is_retryable(error) is retryable
+
+
+def test_identical_active_requests_share_a_job():
+    job_id, reused = JobService.submit(REQUEST)
+    same_id, same_reused = JobService.submit(dict(REQUEST))
+    other_id, _ = JobService.submit({**REQUEST, "threshold": 0.6})
+
+    assert (reused, same_reused) == (False, True)
+    assert same_id == job_id
+    assert other_id != job_id
+
+
+def test_finished_jobs_are_not_reused(monkeypatch):
+    pipeline(monkeypatch, {"score": 50.0})
+    job_id, _ = JobService.submit(REQUEST)
+    run_next()
+
+    new_id, reused = JobService.submit(REQUEST)
+
+    assert not reused
+    assert new_id != job_id
+
+
+def test_upstream_failures_are_retried(monkeypatch):
+    pipeline(
+        monkeypatch,
+        urllib3.exceptions.ProtocolError("connection reset"),
+        {"score": 50.0},
+    )
+    job_id, _ = JobService.submit(REQUEST)
+
+    run_next()
+    job = JobService.get(job_id)
+    assert job["status"] == "queued"
+    assert "connection reset" in job["error"]
+
+    run_next()
+    job = JobService.get(job_id)
+    assert job["status"] == "succeeded"
+    assert job["attempts"] == 2
+    assert job["error"] is None
+    assert job["result"] == {"score": 50.0}
+
+
+def test_retries_stop_after_the_last_attempt(monkeypatch):
+    monkeypatch.setattr(job_service, "JOB_MAX_ATTEMPTS", 2)
+    error = type("ServiceUnavailable", (Exception,), {"status": 503})
+    pipeline(monkeypatch, error("down"), error("still down"))
+    job_id, _ = JobService.submit(REQUEST)
+
+    run_next()
+    run_next()
+
+    job = JobService.get(job_id)
+    assert job["status"] == "failed"
+    assert job["attempts"] == 2
+    assert JobService._claim() is None
+
+
+def test_other_errors_fail_at_once(monkeypatch):
+    pipeline(monkeypatch, ValueError("bad input"))
+    job_id, _ = JobService.submit(REQUEST)
+
+    run_next()
+
+    job = JobService.get(job_id)
+    assert job["status"] == "failed"
+    assert job["attempts"] == 1
+
+
+def test_heartbeat_keeps_a_slow_job_leased(monkeypatch):
+    monkeypatch.setattr(job_service, "JOB_LEASE_SECONDS", 0.3)
+    release = threading.Event()
+
+    def run(*args, on_stage=None, timings=None, **kwargs):
+        release.wait(5)
+        return {"score": 50.0}
+
+    monkeypatch.setattr(PipelineService, "run", run)
+    job_id, _ = JobService.submit(REQUEST)
+    job = JobService._claim()
+    worker = threading.Thread(target=JobService._run, args=(job,))
+    worker.start()
+    try:
+        # Well past the first lease, the job is still not claimable
+        time.sleep(0.6)
+        assert JobService._claim() is None
+    finally:
+        release.set()
+        worker.join()
+
+    assert JobService.get(job_id)["status"] == "succeeded"
+
+
+def test_expired_leases_are_claimed_again():
+    job_id, _ = JobService.submit(REQUEST)
+    assert JobService._claim()["id"] == job_id
+    assert JobService._claim() is None
+
+    # The worker died: nothing renews the lease any more
+    JobService._update(job_id, lease_expires_at=time.time() - 1)
+
+    reclaimed = JobService._claim()
+    assert reclaimed["id"] == job_id
+    assert JobService.get(job_id)["attempts"] == 2
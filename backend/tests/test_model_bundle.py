@@ -0,0 +1,38 @@
+"""
+Tests for checking the saved sentence embedding model against its source.
+"""
+
+import pytest
+
+from app.utils import model_bundle
+from app.utils.model_bundle import embedder_bundle_is_current, write_embedder_manifest
+
+
+@pytest.fixture
+def installed_version(monkeypatch):
+    """Pretend a sentence-transformers version is installed."""
+    versions = {"sentence-transformers": "3.0.0"}
+    monkeypatch.setattr(model_bundle.metadata, "version", versions.__getitem__)
+    return versions
+
+
+def test_bundle_without_manifest_is_not_used(tmp_path, installed_version):
+    assert not embedder_bundle_is_current(tmp_path, "model")
+
+
+def test_bundle_saved_from_the_same_model_and_version_is_used(
+    tmp_path, installed_version
+):
+    write_embedder_manifest(tmp_path, "model")
+
+    assert embedder_bundle_is_current(tmp_path, "model")
+    assert not embedder_bundle_is_current(tmp_path, "other-model")
+
+
+def test_bundle_is_stale_after_upgrading_sentence_transformers(
+    tmp_path, installed_version
+):
+    write_embedder_manifest(tmp_path, "model")
+    installed_version["sentence-transformers"] = "3.1.0"
+
+    assert not embedder_bundle_is_current(tmp_path, "model")
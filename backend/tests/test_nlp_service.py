@@ -0,0 +1,72 @@
+"""Tests for the input bounding of `NLPService.prepare_text`."""
+
+import pytest
+
+from app.services import nlp_service
+from app.services.nlp_service import NLPService
+from app.utils.request_context import RequestContext
+
+
+@pytest.fixture(autouse=True)
+def small_caps(monkeypatch):
+    """Shrink the size caps so tests can hit them with short texts."""
+    monkeypatch.setattr(nlp_service, "MAX_PROCESSED_CHARS", 50)
+    monkeypatch.setattr(nlp_service, "NER_CHUNK_CHARS", 20)
+    monkeypatch.setattr(nlp_service, "MAX_NER_CHUNKS", 2)
+
+
+def test_short_text_is_kept_whole():
+    chunks, report = NLPService.prepare_text("Python and SQL")
+
+    assert chunks == ["Python and SQL"]
+    assert report == {
+        "chars": 14,
+        "processed_chars": 14,
+        "chunks": 1,
+        "truncated": False,
+    }
+
+
+def test_long_text_is_cut_at_a_word_boundary():
+    text = "word " * 20
+
+    chunks, report = NLPService.prepare_text(text)
+
+    assert report["truncated"]
+    assert all(chunk.split() == ["word"] * len(chunk.split()) for chunk in chunks)
+    assert report["processed_chars"] <= 50
+
+
+def test_whitespace_only_text_over_the_cap_is_sliced():
+    chunks, report = NLPService.prepare_text(" " * 80)
+
+    assert chunks == []
+    assert report["truncated"]
+    assert report["processed_chars"] == 0
+
+
+def test_text_without_whitespace_over_the_cap_is_sliced():
+    _, report = NLPService.prepare_text("x" * 80)
+
+    assert report["truncated"]
+    assert report["chars"] == 80
+
+
+def test_chunks_beyond_the_limit_are_dropped():
+    text = "\n\n".join(["alpha beta gamma"] * 3)
+
+    chunks, report = NLPService.prepare_text(text)
+
+    assert len(chunks) == 2
+    assert report["chunks"] == 2
+    assert report["truncated"]
+
+
+def test_text_is_prepared_once_per_request():
+    request_context = RequestContext()
+
+    first = NLPService.prepare_text("Python and SQL", request_context)
+    second = NLPService.prepare_text("Python and SQL", request_context)
+
+    assert second is first
+    assert request_context.stats()["reused"]["prepared"] == 1
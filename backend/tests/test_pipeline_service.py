@@ -0,0 +1,130 @@
+"""Tests for the deadline degradations reported by `PipelineService.run`."""
+
+import json
+import time
+
+import numpy as np
+import pytest
+
+from app.models.records import EntityRecord
+from app.services import nlp_service, pipeline_service, rag_service
+from app.services.cache_backends import DiskCacheBackend
+from app.services.cache_service import CacheService
+from app.services.job_artifact_service import JobArtifactService
+from app.services.llm_service import LLMService
+from app.services.nlp_service import NLPService
+from app.services.pipeline_service import PipelineService
+from app.services.rag_service import RAGService
+from app.services.similarity_service import SimilarityService
+from app.services.skill_vocabulary_service import SkillVocabularyService
+from app.utils.loader import ModelLoader
+from app.utils.request_context import DEGRADATIONS
+
+RESUME = "python sql"
+JOB_DESCRIPTION = "python docker"
+COURSE = {
+    "short_id": "C1",
+    "Title": "Containers",
+    "url": "u",
+    "course_desc": "docker kubernetes",
+}
+
+
+def embed(skill):
+    return np.random.default_rng(sum(map(ord, skill))).normal(size=8)
+
+
+@pytest.fixture
+def upstreams(tmp_path, monkeypatch):
+    """
+    Fake the models and upstreams; NER needs 0.5s of budget, the LLM 0.3s and
+    course scoring 0.1s. Returns the (model, text) NER runs and the LLM calls.
+    """
+    calls = {"ner": [], "llm": 0, "llm_seconds": 0.0}
+
+    def pipe_entities(texts, model_name, batch_size=None):
+        calls["ner"].extend((model_name, text) for text in texts)
+        return [[EntityRecord(w, "SKILL") for w in text.split()] for text in texts]
+
+    def chat_with_timing(prompt, timeout):
+        calls["llm"] += 1
+        time.sleep(calls["llm_seconds"])
+        text = json.dumps({"recommendations": [{"id": "C1", "reason": "gap"}]})
+        return text, {"prompt_tokens": 1, "time_to_first_token": 0, "total_time": 0}
+
+    def augment_prompt(job_description, user_data, ground_truth_skills, **kwargs):
+        user_skills = NLPService.extract_skills(user_data, kwargs["request_context"])
+        return "prompt", [dict(COURSE)], set(ground_truth_skills), set(user_skills)
+
+    monkeypatch.setattr(nlp_service, "INFERENCE_BATCHING_ENABLED", False)
+    monkeypatch.setattr(nlp_service, "DEFAULT_MODEL", "full")
+    monkeypatch.setattr(nlp_service, "DEADLINE_NER_MIN_SECONDS", 0.5)
+    monkeypatch.setattr(rag_service, "DEADLINE_LLM_MIN_SECONDS", 0.3)
+    monkeypatch.setattr(rag_service, "DEADLINE_SCORING_MIN_SECONDS", 0.1)
+    monkeypatch.setattr(pipeline_service, "DEADLINE_SCORING_MIN_SECONDS", 0.1)
+    monkeypatch.setattr(ModelLoader, "list_available_models", lambda: ["full", "extra"])
+    monkeypatch.setattr(NLPService, "_pipe_entities", pipe_entities)
+    monkeypatch.setattr(SkillVocabularyService, "canonicalize", str.lower)
+    monkeypatch.setattr(SkillVocabularyService, "match_key", str.lower)
+    monkeypatch.setattr(SkillVocabularyService, "lookup_embeddings", lambda _: {})
+    monkeypatch.setattr(
+        SimilarityService,
+        "get_embeddings",
+        lambda skills: np.array([embed(skill) for skill in skills]),
+    )
+    monkeypatch.setattr(
+        JobArtifactService,
+        "get_artifacts",
+        lambda text: {
+            "job_entities": [EntityRecord(w, "SKILL") for w in text.split()],
+            "job_skills": text.split(),
+            "skill_embeddings": {},
+            "course_matches": [],
+            "truncation": NLPService.prepare_text(text)[1],
+        },
+    )
+    monkeypatch.setattr(RAGService, "augment_prompt", augment_prompt)
+    monkeypatch.setattr(RAGService, "chat_with_timing", chat_with_timing)
+    monkeypatch.setattr(LLMService, "is_configured", lambda: True)
+
+    CacheService.set_backend(DiskCacheBackend(str(tmp_path / "cache"), 10**8))
+    yield calls
+    CacheService.set_backend(None)
+
+
+def models_run_on(calls, text):
+    return sorted(model for model, ner_text in calls["ner"] if ner_text == text)
+
+
+def test_late_shortage_only_degrades_the_stages_still_to_run(upstreams):
+    # The LLM leaves too little time for a full NER of the course description
+    upstreams["llm_seconds"] = 0.6
+
+    response = PipelineService.run(RESUME, JOB_DESCRIPTION, deadline_seconds=1.0)
+
+    assert response["degradations"] == ["fewer_ner_models"]
+    assert upstreams["llm"] == 1
+    assert response["recommendation_mode"] == "llm"
+    assert response["recommended_courses"][0]["potential_score"] is not None
+    assert models_run_on(upstreams, RESUME) == ["extra", "full"]
+    assert models_run_on(upstreams, COURSE["course_desc"]) == ["full"]
+
+
+def test_early_shortage_degrades_every_stage(upstreams):
+    response = PipelineService.run(RESUME, JOB_DESCRIPTION, deadline_seconds=0.2)
+
+    assert response["degradations"] == list(DEGRADATIONS)
+    assert upstreams["llm"] == 0
+    assert response["recommendation_mode"] == "deterministic"
+    assert response["recommended_courses"][0]["potential_score"] is None
+    assert models_run_on(upstreams, RESUME) == ["full"]
+
+
+def test_full_budget_degrades_nothing_and_is_cached(upstreams):
+    response = PipelineService.run(RESUME, JOB_DESCRIPTION, deadline_seconds=30)
+
+    assert response["degradations"] == []
+    assert models_run_on(upstreams, RESUME) == ["extra", "full"]
+    assert CacheService.get_course_recommendation(
+        RESUME, JOB_DESCRIPTION, 0.5, "auto"
+    )
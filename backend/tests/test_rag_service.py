@@ -0,0 +1,69 @@
+"""Tests for the error handling and response parsing of `RAGService`."""
+
+import pytest
+import urllib3
+
+from app.services.rag_service import RAGService
+
+CANDIDATES = [
+    {"short_id": "C1", "Title": "Intro to Python", "url": "u1", "course_desc": "d1"},
+    {"short_id": "C2", "Title": "Docker Deep Dive", "url": "u2", "course_desc": "d2"},
+]
+
+
+def failing_retrieval(error):
+    def augment_prompt(*args, **kwargs):
+        raise error
+
+    return augment_prompt
+
+
+def test_upstream_failures_reach_the_caller(monkeypatch):
+    monkeypatch.setattr(
+        RAGService,
+        "augment_prompt",
+        failing_retrieval(urllib3.exceptions.ProtocolError("connection reset")),
+    )
+
+    with pytest.raises(urllib3.exceptions.ProtocolError):
+        RAGService.generate_course_recommendations("job", "resume")
+
+
+def test_llm_mode_failures_reach_the_caller(monkeypatch):
+    monkeypatch.setattr(
+        RAGService, "augment_prompt", failing_retrieval(ValueError("bad prompt"))
+    )
+
+    with pytest.raises(ValueError):
+        RAGService.generate_course_recommendations("job", "resume", mode="llm")
+
+
+def test_other_failures_return_an_error_result(monkeypatch):
+    monkeypatch.setattr(
+        RAGService, "augment_prompt", failing_retrieval(ValueError("bad prompt"))
+    )
+
+    result = RAGService.generate_course_recommendations("job", "resume")
+
+    assert result["error"] == "bad prompt"
+    assert result["recommended_courses"] == []
+
+
+def test_json_recommendations_resolve_by_id():
+    courses, text = RAGService.parse_structured_recommendations(
+        '```json\n{"recommendations": [{"id": "[C2]", "reason": "gap"}]}\n```',
+        CANDIDATES,
+    )
+
+    assert [course["url"] for course in courses] == ["u2"]
+    assert text == "1. Docker Deep Dive: gap"
+
+
+def test_free_text_without_ids_is_matched_by_title(monkeypatch):
+    answer = "1. **Docker Deep Dive**: containers\n2. Intro to Python: basics"
+    monkeypatch.setattr(RAGService, "_get_pinecone_index", pytest.fail)
+
+    assert RAGService.parse_structured_recommendations(answer, CANDIDATES) is None
+    courses = RAGService.extract_course_recommendations(answer, CANDIDATES)
+
+    assert [course["url"] for course in courses] == ["u2", "u1"]
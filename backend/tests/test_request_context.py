@@ -0,0 +1,114 @@
+"""
+Tests for the per-request memoization and deadline of `RequestContext`.
+"""
+
+from app.utils.request_context import DEGRADATIONS, RequestContext
+
+
+def test_memoized_values_are_computed_once():
+    request_context = RequestContext()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "value"
+
+    assert request_context.memoize("skills", "text", compute) == "value"
+    assert request_context.memoize("skills", "text", compute) == "value"
+    assert calls == [1]
+    stats = request_context.stats()
+    assert stats["computed"] == {"skills": 1}
+    assert stats["reused"] == {"skills": 1}
+
+
+def test_memoize_many_computes_only_the_missing_keys():
+    request_context = RequestContext()
+    request_context.memoize_many("embeddings", ["a"], lambda keys: keys)
+    computed = []
+
+    def compute(keys):
+        computed.extend(keys)
+        return [key.upper() for key in keys]
+
+    values = request_context.memoize_many("embeddings", ["a", "b"], compute)
+
+    assert values == {"a": "a", "b": "B"}
+    assert computed == ["b"]
+
+
+def test_invocations_outside_the_memo_are_reported():
+    request_context = RequestContext()
+    request_context.record_invocation("ner:model", ["resume"])
+    assert request_context.stats()["max_invocations_per_key"] == 1
+
+    request_context.record_invocation("ner:model", ["resume"])
+    assert request_context.stats()["max_invocations_per_key"] == 2
+
+
+def test_no_deadline_always_has_budget():
+    request_context = RequestContext()
+
+    assert request_context.remaining() is None
+    assert request_context.has_budget(1e9)
+    assert not request_context.should_degrade("retrieval_only", 1e9)
+    assert request_context.degradations == []
+
+
+def test_short_budget_degrades():
+    request_context = RequestContext(deadline_seconds=60)
+
+    assert 0 < request_context.remaining() <= 60
+    assert not request_context.should_degrade("skip_course_scoring", 1)
+    assert request_context.should_degrade("skip_course_scoring", 120)
+    assert request_context.is_degraded("skip_course_scoring")
+
+
+def test_degradation_implies_the_earlier_ones():
+    request_context = RequestContext(deadline_seconds=60)
+
+    assert request_context.should_degrade("retrieval_only", 120)
+
+    assert request_context.degradations == ["skip_course_scoring", "retrieval_only"]
+    # Applied degradations stick even once the budget would suffice
+    assert request_context.should_degrade("skip_course_scoring", 0)
+    assert not request_context.is_degraded("fewer_ner_models")
+
+
+def test_last_degradation_applies_all():
+    request_context = RequestContext()
+
+    request_context.degrade(DEGRADATIONS[-1])
+    request_context.degrade(DEGRADATIONS[0])
+
+    assert request_context.degradations == list(DEGRADATIONS)
+
+
+def test_degradations_are_added_to_the_totals():
+    before = RequestContext.get_totals()
+    request_context = RequestContext()
+    request_context.degrade("retrieval_only")
+
+    request_context.close()
+
+    after = RequestContext.get_totals()
+    assert after["requests"] == before.get("requests", 0) + 1
+    for degradation, added in (
+        ("skip_course_scoring", 1),
+        ("retrieval_only", 1),
+        ("fewer_ner_models", 0),
+    ):
+        key = f"degraded_{degradation}"
+        assert after.get(key, 0) == before.get(key, 0) + added
+
+
+def test_settled_stages_are_not_degraded_later():
+    request_context = RequestContext(deadline_seconds=60)
+    assert not request_context.should_degrade("skip_course_scoring", 1)
+    request_context.settle("retrieval_only")
+
+    request_context.degrade("fewer_ner_models")
+
+    assert request_context.degradations == ["fewer_ner_models"]
+    # A settled stage can still degrade itself (e.g. a cut-off LLM call)
+    request_context.degrade("retrieval_only")
+    assert request_context.degradations == ["fewer_ner_models", "retrieval_only"]
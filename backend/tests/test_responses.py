@@ -0,0 +1,86 @@
+"""
+Tests that the hand-built response bodies match the response schema.
+"""
+
+import pytest
+
+from app.api.responses import shape_content
+from app.models.schemas import CourseRecommendationResponse
+
+RESPONSE_DATA = {
+    "recommended_courses": [
+        {
+            "course_name": "Kubernetes Basics",
+            "url": "https://example.com/k8s",
+            "description": "Deploy containers",
+            "potential_score": 100.0,
+            "score_improvement": 50.0,
+        }
+    ],
+    "skill_gap": ["Kubernetes"],
+    "job_skills": ["Python", "Kubernetes"],
+    "user_skills": ["Python"],
+    "recommendations_text": "1. Kubernetes Basics: Covers Kubernetes.",
+    "recommendation_mode": "deterministic",
+    "score": 50.0,
+    "matched_skills": ["Python"],
+    "missing_skills": ["Kubernetes"],
+    "matching_details": [
+        {
+            "job_skill": "Python",
+            "best_match": "Python",
+            "similarity": 1.0,
+            "is_match": True,
+        },
+        {
+            "job_skill": "Kubernetes",
+            "best_match": None,
+            "similarity": 0.2,
+            "is_match": False,
+        },
+    ],
+    "analysis_id": "0123abcd",
+    "truncation": {
+        "resume": {
+            "chars": 70000,
+            "processed_chars": 60000,
+            "chunks": 20,
+            "truncated": True,
+            "skill_limit_reached": False,
+        }
+    },
+    "degradations": ["skip_course_scoring"],
+    # Internal pipeline fields never reach the client
+    "fallback": False,
+}
+
+
+def test_body_has_exactly_the_schema_fields():
+    content = shape_content(RESPONSE_DATA)
+
+    assert set(content) == set(CourseRecommendationResponse.model_fields)
+
+
+def test_body_round_trips_through_the_schema():
+    content = shape_content(RESPONSE_DATA)
+
+    validated = CourseRecommendationResponse.model_validate(content)
+    assert validated.model_dump() == content
+
+
+def test_empty_data_gets_the_schema_defaults():
+    content = shape_content({})
+
+    assert content == CourseRecommendationResponse().model_dump()
+
+
+@pytest.mark.parametrize(
+    "excluded", [["user_skills", "matching_details"], ["course_descriptions"]]
+)
+def test_excluded_fields_are_omitted(excluded):
+    content = shape_content(RESPONSE_DATA, excluded)
+
+    assert not set(excluded) & set(content)
+    if "course_descriptions" in excluded:
+        assert "description" not in content["recommended_courses"][0]
+    CourseRecommendationResponse.model_validate(content)
@@ -0,0 +1,111 @@
+"""Tests for the word-vector cascade of `SimilarityService` and re-scoring."""
+
+import numpy as np
+import pytest
+
+from app.services.analysis_service import AnalysisService
+from app.services.cache_backends import DiskCacheBackend
+from app.services.cache_service import CacheService
+from app.services.similarity_service import SimilarityService
+from app.services.skill_vocabulary_service import SkillVocabularyService
+
+WORD_VECTORS = {
+    "a": [1.0, 0.0],
+    "x": [1.0, 0.0],
+    "y": [0.6, 0.8],
+    "z": [0.0, 1.0],
+}
+EMBEDDINGS = {
+    "a": [1.0, 0.0],
+    "x": [0.9, 0.436],
+    "y": [0.8, 0.6],
+    "z": [0.7, 0.714],
+}
+
+
+@pytest.fixture
+def encoded(monkeypatch):
+    """Enable the cascade with fixed word vectors and embeddings."""
+    calls = []
+
+    def get_embeddings(skills):
+        calls.append(list(skills))
+        return np.array([EMBEDDINGS[s] for s in skills])
+
+    monkeypatch.setattr(SimilarityService, "_cascade_enabled", True)
+    monkeypatch.setattr(SimilarityService, "_cascade_margins", (0.2, 0.2))
+    monkeypatch.setattr(SimilarityService, "_cascade_audit_rate", 0.0)
+    monkeypatch.setattr(
+        SimilarityService,
+        "word_vectors",
+        lambda skills: {s: np.array(WORD_VECTORS[s], np.float32) for s in skills},
+    )
+    monkeypatch.setattr(SimilarityService, "get_embeddings", get_embeddings)
+    monkeypatch.setattr(SkillVocabularyService, "lookup_embeddings", lambda _: {})
+    monkeypatch.setattr(SkillVocabularyService, "match_key", lambda skill: skill)
+    return calls
+
+
+def test_only_uncertain_pairs_use_the_transformer(encoded):
+    matrix, word_vector_pairs = SimilarityService.similarity_matrix_with_tiers(
+        ["a"], ["x", "y", "z"], threshold=0.5
+    )
+
+    assert word_vector_pairs.tolist() == [[True, False, True]]
+    np.testing.assert_allclose(matrix, [[1.0, 0.8, 0.0]], atol=1e-3)
+    assert encoded == [["a", "y"]]
+
+
+def test_without_a_threshold_every_pair_uses_the_transformer(encoded):
+    _, word_vector_pairs = SimilarityService.similarity_matrix_with_tiers(
+        ["a"], ["x", "y", "z"]
+    )
+
+    assert not word_vector_pairs.any()
+
+
+def test_pairs_near_a_new_threshold_are_rescored(encoded):
+    result = SimilarityService.semantic_matching_score({"a"}, {"z"}, threshold=0.5)
+    matrix, word_vector_pairs = result["similarity_matrix"], result["word_vector_pairs"]
+    assert result["missing_skills"] == ["a"]
+    encoded.clear()
+
+    # Far from the new threshold, the word-vector decision still holds
+    assert SimilarityService.rescore_pairs(
+        ["a"], ["z"], matrix, word_vector_pairs, 0.8
+    ) == 0
+    assert SimilarityService.rescore_pairs(
+        ["a"], ["z"], matrix, word_vector_pairs, 0.1
+    ) == 1
+
+    assert encoded == [["a", "z"]]
+    assert matrix[0, 0] == pytest.approx(0.7, abs=1e-3)
+    assert not word_vector_pairs.any()
+
+
+def test_rethreshold_keeps_the_rescored_pairs(encoded, tmp_path):
+    CacheService.set_backend(DiskCacheBackend(str(tmp_path / "cache"), 10**8))
+    try:
+        comparison = SimilarityService.semantic_matching_score(
+            {"a"}, {"z"}, threshold=0.5
+        )
+        course = {"course_name": "Course", "url": "", "description": ""}
+        analysis_id = AnalysisService.store(
+            AnalysisService.build(
+                comparison,
+                [np.array([0.4], np.float32)],
+                {"recommended_courses": [course]},
+            )
+        )
+        encoded.clear()
+
+        rescored = AnalysisService.rethreshold(analysis_id, 0.1)
+        again = AnalysisService.rethreshold(analysis_id, 0.1)
+    finally:
+        CacheService.set_backend(None)
+
+    assert rescored["score"] == again["score"] == 100.0
+    assert rescored["matching_details"][0]["similarity"] == pytest.approx(0.7, 1e-3)
+    assert rescored["recommended_courses"][0]["potential_score"] == 100.0
+    # The re-scored pair was stored, so the second call encodes nothing
+    assert encoded == [["a", "z"]]
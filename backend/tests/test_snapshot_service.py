@@ -0,0 +1,74 @@
+"""
+Tests for the TTL handling of cache snapshots.
+"""
+
+import pytest
+
+from app.services import snapshot_service
+from app.services.cache_backends import DiskCacheBackend
+from app.services.cache_service import CacheService
+from app.services.snapshot_service import SnapshotService
+
+VERSIONS = {"ner": "n", "embedding": "e", "index": "i", "llm": "l"}
+
+
+@pytest.fixture(autouse=True)
+def versions(monkeypatch):
+    monkeypatch.setattr(SnapshotService, "_versions", VERSIONS)
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    """Export a snapshot of a cache with a short- and a long-lived entry."""
+    source = DiskCacheBackend(str(tmp_path / "source"), 10**8)
+    CacheService.set_backend(source)
+    source.set("short", {"score": 1.0}, 600)
+    source.set("long", {"score": 2.0}, 7200)
+    source.set("forever", {"score": 3.0}, None)
+    path = str(tmp_path / "snapshot.pkl.gz")
+    SnapshotService.export_snapshot(path)
+
+    target = DiskCacheBackend(str(tmp_path / "target"), 10**8)
+    CacheService.set_backend(target)
+    yield path, target
+    CacheService.set_backend(None)
+
+
+def later(monkeypatch, seconds):
+    """Move the snapshot service's clock forward."""
+    now = snapshot_service.time.time() + seconds
+    monkeypatch.setattr(snapshot_service.time, "time", lambda: now)
+
+
+def test_import_keeps_the_remaining_ttl(snapshot):
+    path, target = snapshot
+
+    summary = SnapshotService.import_snapshot(path)
+
+    assert summary["imported"] == {"recommendations": 3}
+    assert 590 <= target.ttl("short") <= 600
+    assert target.ttl("forever") is None
+
+
+def test_time_since_export_counts_against_the_ttl(snapshot, monkeypatch):
+    path, target = snapshot
+    later(monkeypatch, 3600)
+
+    summary = SnapshotService.import_snapshot(path)
+
+    assert summary["imported"] == {"recommendations": 2}
+    assert summary["dropped"] == 1
+    assert target.get("short") is None
+    assert target.ttl("long") <= 3600
+    assert target.get("forever") == {"score": 3.0}
+
+
+def test_stale_versions_drop_their_namespace(snapshot, monkeypatch):
+    path, target = snapshot
+    monkeypatch.setattr(SnapshotService, "_versions", {**VERSIONS, "llm": "new"})
+
+    summary = SnapshotService.import_snapshot(path)
+
+    assert summary["imported"] == {}
+    assert summary["stale"] == ["recommendations"]
+    assert target.get("long") is None
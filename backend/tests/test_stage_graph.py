@@ -0,0 +1,107 @@
+"""
+Tests for running pipeline stages with `StageGraph`.
+"""
+
+import threading
+
+import pytest
+
+from app.utils.stage_graph import StageGraph, map_cpu
+
+
+def test_stages_get_their_dependencies_results_in_order():
+    graph = StageGraph()
+    graph.add("a", lambda: 2)
+    graph.add("b", lambda: 3, kind="io")
+    graph.add("c", lambda b, a: b - a, deps=("b", "a"))
+
+    assert graph.run() == {"a": 2, "b": 3, "c": 1}
+
+
+def test_independent_stages_run_concurrently():
+    # Each stage only gets past the barrier if the other one runs meanwhile
+    barrier = threading.Barrier(2, timeout=5)
+    graph = StageGraph()
+    graph.add("a", barrier.wait, kind="io")
+    graph.add("b", barrier.wait, kind="io")
+
+    assert set(graph.run()) == {"a", "b"}
+
+
+def test_a_failing_stage_skips_its_dependents():
+    ran = []
+
+    def fail():
+        raise ValueError("boom")
+
+    graph = StageGraph()
+    graph.add("a", fail)
+    graph.add("b", lambda _: ran.append("b"), deps=("a",))
+
+    with pytest.raises(ValueError, match="boom"):
+        graph.run()
+    assert ran == []
+
+
+def test_a_failure_waits_for_the_stages_already_running():
+    finished = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        finished.set()
+
+    def fail():
+        release.set()
+        raise ValueError("boom")
+
+    graph = StageGraph()
+    graph.add("slow", slow, kind="io")
+    graph.add("fail", fail, kind="io")
+
+    with pytest.raises(ValueError):
+        graph.run()
+    assert finished.is_set()
+
+
+def test_stop_when_skips_stages_not_started_yet():
+    graph = StageGraph()
+    graph.add("a", lambda: "hit")
+    graph.add("b", lambda _: "computed", deps=("a",))
+
+    results = graph.run(stop_when=lambda name, result: result == "hit")
+
+    assert results == {"a": "hit"}
+
+
+def test_stage_starts_and_timings_are_reported():
+    timings = {}
+    started = []
+    graph = StageGraph(timings)
+    graph.add("a", lambda: 1)
+    graph.add("b", lambda a: a + 1, deps=("a",))
+
+    graph.run(on_stage=started.append)
+
+    assert started == ["a", "b"]
+    assert set(timings) == {"a", "b"}
+    assert graph.timings is timings
+
+
+@pytest.mark.parametrize(
+    "name, deps, kind, message",
+    [
+        ("a", (), "cpu", "Duplicate stage"),
+        ("b", ("missing",), "cpu", "unknown stages"),
+        ("b", (), "gpu", "Unknown stage kind"),
+    ],
+)
+def test_invalid_stages_are_rejected(name, deps, kind, message):
+    graph = StageGraph().add("a", lambda: None)
+
+    with pytest.raises(ValueError, match=message):
+        graph.add(name, lambda *args: None, deps=deps, kind=kind)
+
+
+def test_map_cpu_keeps_the_item_order():
+    assert map_cpu(lambda x: x * x, range(10)) == [x * x for x in range(10)]
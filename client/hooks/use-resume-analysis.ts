@@ -1,6 +1,7 @@
 import { useState, useCallback, useEffect, useRef } from 'react'
 import {
   getSkillBridgeData,
+  rethresholdAnalysis,
   extractSkillComparisonData,
   SkillBridgeResponse,
   SkillComparisonData,
@@ -536,6 +537,51 @@ export function useResumeAnalysis(): UseResumeAnalysisResult {
     }
   }, [resumeText, jobDescriptionText, threshold, resetResults, simulateProcessing, toast])
 
+  // Re-score the current results when the threshold changes, without re-running
+  // the analysis. Slider moves are debounced, and only the latest answer is kept
+  const rethresholdTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null)
+  const rethresholdRequestRef = useRef(0)
+
+  const updateThreshold = useCallback(
+    (newThreshold: number) => {
+      setThreshold(newThreshold)
+
+      const analysisId = recommendationData?.analysis_id
+      if (!analysisId || isProcessing) return
+
+      if (rethresholdTimerRef.current) {
+        clearTimeout(rethresholdTimerRef.current)
+      }
+      rethresholdTimerRef.current = setTimeout(async () => {
+        const requestId = ++rethresholdRequestRef.current
+        const response = await rethresholdAnalysis(analysisId, newThreshold)
+        if (requestId !== rethresholdRequestRef.current) return
+
+        if (response) {
+          setSkillData({
+            score: response.score ?? 0,
+            matched_skills: response.matched_skills ?? [],
+            missing_skills: response.missing_skills ?? [],
+            matching_details: response.matching_details,
+          })
+          setRecommendationData(response)
+        } else {
+          // The analysis expired; the new threshold applies to the next analysis
+          setProcessingStatus('Analyze again to apply the new threshold.')
+        }
+      }, 300)
+    },
+    [recommendationData, isProcessing],
+  )
+
+  useEffect(() => {
+    return () => {
+      if (rethresholdTimerRef.current) {
+        clearTimeout(rethresholdTimerRef.current)
+      }
+    }
+  }, [])
+
   // Demo and Interactive Controls
   const startDemo = useCallback(() => {
     // Reset pause state
@@ -704,7 +750,7 @@ export function useResumeAnalysis(): UseResumeAnalysisResult {
     showProcessingModal,
     setResumeText,
     setJobDescriptionText,
-    setThreshold,
+    setThreshold: updateThreshold,
     analyzeResume,
     resetResults,
     closeProcessingModal,
@@ -204,13 +204,27 @@ export interface CourseRecommendation {
   score_improvement: number
 }
 
+export interface InputTruncation {
+  chars: number
+  processed_chars: number
+  chunks: number
+  truncated: boolean
+  skill_limit_reached: boolean
+}
+
 export interface SkillBridgeResponse {
   recommended_courses: CourseRecommendation[]
   skill_gap: string[]
   job_skills: string[]
   user_skills: string[]
   recommendations_text: string | null
+  recommendation_mode?: 'llm' | 'deterministic'
+  score?: number
+  matched_skills?: string[]
+  missing_skills?: string[]
   matching_details: MatchDetail[]
+  analysis_id?: string | null
+  truncation?: Partial<Record<'resume' | 'job_description', InputTruncation>> | null
 }
 
 // Get course recommendations and skill comparison data from a single endpoint
@@ -244,6 +258,33 @@ export const getSkillBridgeData = async (
   }
 }
 
+// Re-score a previous analysis at a new threshold without re-running the pipeline.
+// Returns null if the analysis expired or could not be re-scored, in which case
+// getSkillBridgeData should be called again.
+export const rethresholdAnalysis = async (
+  analysisId: string,
+  threshold: number,
+): Promise<SkillBridgeResponse | null> => {
+  try {
+    const response = await fetchWithFallback(`${API_PREFIX}/recommend-courses/${analysisId}/threshold`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ threshold }),
+    })
+
+    if (!response.ok) {
+      return null
+    }
+
+    return (await response.json()) as SkillBridgeResponse
+  } catch (error) {
+    console.warn('Re-thresholding failed, a full analysis is needed:', error)
+    return null
+  }
+}
+
 // Helper function to convert course recommendation response to skill comparison data format
 export const extractSkillComparisonData = (response: SkillBridgeResponse): SkillComparisonData => {
   // Calculate a score based on matched vs total job skills